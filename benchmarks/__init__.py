@@ -0,0 +1,8 @@
+"""
+Benchmark Package
+Contains headless benchmarks for model training and inference.
+"""
+
+from .synthetic_data import SyntheticDataRepository
+
+__all__ = ['SyntheticDataRepository']
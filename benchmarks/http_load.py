@@ -0,0 +1,96 @@
+"""
+Benchmarks: HTTP load generator
+================================
+Sends /predict requests to a running serve.py over concurrent keep-alive
+connections and reports client-side latency percentiles, throughput and
+the server-reported (X-Response-Time-Ms) latency.
+
+From the project root, with the server running:
+    python -m benchmarks.http_load --connections 64 --requests 200
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from .run_benchmarks import latency_summary
+
+DEFAULT_TEXTS = ["hello", "what is your name", "tell me a joke", "bye", "how are you"]
+
+
+async def _client(host, port, texts, n_requests, latencies, server_latencies):
+    """One keep-alive connection sending requests back to back"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for i in range(n_requests):
+            body = json.dumps({"text": texts[i % len(texts)]}).encode("utf-8")
+            start = time.perf_counter()
+            writer.write(
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\n"
+                "Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+
+            status = await reader.readline()
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            await reader.readexactly(int(headers["content-length"]))
+            latencies.append(time.perf_counter() - start)
+
+            if b" 200 " not in status:
+                raise RuntimeError(f"Unexpected response: {status!r}")
+            server_latencies.append(float(headers["x-response-time-ms"]) / 1000.0)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections, requests_per_connection, texts=DEFAULT_TEXTS):
+    """
+    Run the load test
+
+    Returns:
+        dict: Client and server latency summaries and overall throughput
+    """
+    latencies = []
+    server_latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, texts, requests_per_connection, latencies, server_latencies)
+        for _ in range(connections)
+    ))
+    seconds = time.perf_counter() - start
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "seconds": seconds,
+        "throughput_per_second": len(latencies) / seconds,
+        "client": latency_summary(latencies),
+        "server": latency_summary(server_latencies),
+    }
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Load test the chatbot HTTP server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=100,
+                        help="requests per connection")
+    args = parser.parse_args(argv)
+
+    print(f"Sending {args.connections} x {args.requests} requests...", file=sys.stderr)
+    result = asyncio.run(run_load(args.host, args.port, args.connections, args.requests))
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
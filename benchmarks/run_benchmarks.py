@@ -0,0 +1,288 @@
+"""
+Benchmarks: Training and inference benchmark suite
+===================================================
+Measures ChatbotMLModel training time and peak memory, preprocessing
+throughput, single-message prediction latency percentiles and throughput,
+held-out accuracy, vectorizer/artifact size and the compiled NumPy engine's
+latency and agreement with the model on synthetic corpora, and writes the
+results as JSON so runs can be compared over time.
+
+Runs headless (no Tk). From the project root:
+    python -m benchmarks.run_benchmarks --sizes 10x200 100x5000 --output bench.json
+    python -m benchmarks.run_benchmarks --backends mlp nearest_neighbour
+    python -m benchmarks.run_benchmarks --vectorizers tfidf hashing
+"""
+
+import argparse
+import json
+import pickle
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import sklearn
+
+from models import NLPPreprocessor, ChatbotMLModel, CompiledInferenceEngine
+from models.backends import CLASSIFIER_BACKENDS
+from models.vectorizers import VECTORIZER_MODES
+from .synthetic_data import SyntheticDataRepository
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def parse_size(text):
+    """Parse an 'INTENTSxPATTERNS' size such as '100x5000'"""
+    try:
+        n_intents, n_patterns = (int(part) for part in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"size must look like INTENTSxPATTERNS, got {text!r}"
+        )
+    return n_intents, n_patterns
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process so far, if available"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def build_model(repository, backend="mlp", max_iter=None, vectorizer="tfidf"):
+    """Create an untrained model over the repository"""
+    model = ChatbotMLModel(repository, NLPPreprocessor())
+    model.backend = backend
+    model.vectorizer_mode = vectorizer
+    if max_iter is not None:
+        model.hyperparameters["max_iter"] = max_iter
+    return model
+
+
+def benchmark_training(repository, backend="mlp", max_iter=None, measure_memory=True,
+                       vectorizer="tfidf"):
+    """
+    Time ChatbotMLModel.train() and optionally measure its peak memory
+
+    Returns:
+        tuple: (trained model, result dict)
+    """
+    model = build_model(repository, backend, max_iter, vectorizer)
+    start = time.perf_counter()
+    accuracy = model.train()
+    train_seconds = time.perf_counter() - start
+
+    result = {
+        "train_seconds": train_seconds,
+        "train_accuracy": accuracy,
+    }
+
+    if measure_memory:
+        # A separate traced run so tracing overhead does not skew the timing
+        traced = build_model(repository, backend, max_iter, vectorizer)
+        tracemalloc.start()
+        try:
+            traced.train()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        result["train_peak_traced_bytes"] = peak
+
+    result["max_rss_bytes"] = max_rss_bytes()
+    return model, result
+
+
+def latency_summary(latencies):
+    """Summarize per-call latencies given in seconds"""
+    latencies_ms = np.asarray(latencies) * 1000.0
+    p50, p95, p99 = np.percentile(latencies_ms, [50, 95, 99])
+    return {
+        "calls": len(latencies_ms),
+        "mean_ms": float(latencies_ms.mean()),
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies_ms.max()),
+        "throughput_per_second": len(latencies_ms) / (latencies_ms.sum() / 1000.0),
+    }
+
+
+def benchmark_prediction(model, queries, warmup=50):
+    """
+    Measure predict() latency percentiles and predict_batch() throughput
+
+    Returns:
+        dict: Single-call and batch results
+    """
+    for text in queries[:warmup]:
+        model.predict(text)
+
+    latencies = []
+    for text in queries:
+        start = time.perf_counter()
+        model.predict(text)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict_batch(queries)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "predict": latency_summary(latencies),
+        "predict_batch": {
+            "texts": len(queries),
+            "seconds": batch_seconds,
+            "throughput_per_second": len(queries) / batch_seconds,
+        },
+    }
+
+
+def benchmark_features(model, queries, expected):
+    """
+    Measure held-out accuracy and the size of the fitted feature pipeline
+
+    Returns:
+        dict: Accuracy on unseen queries, feature count and sizes in bytes
+    """
+    intents, _, _ = model.predict_batch(queries)
+    components = model._get_components()
+    return {
+        "vectorizer": model.vectorizer_mode,
+        "n_features": model.vectorizer.transform([""]).shape[1],
+        "heldout_accuracy": float(np.mean(intents == np.asarray(expected, dtype=object))),
+        "vectorizer_bytes": len(pickle.dumps(model.vectorizer, pickle.HIGHEST_PROTOCOL)),
+        "artifact_bytes": len(pickle.dumps(components, pickle.HIGHEST_PROTOCOL)),
+    }
+
+
+def benchmark_compiled(model, queries, warmup=50):
+    """
+    Compare the compiled NumPy engine with the model's own scoring path
+
+    Returns:
+        dict: Largest probability difference per dtype, and single-call
+            latency of the model's classifier and of the float32 engine
+    """
+    preprocess = model.preprocessor.preprocess
+
+    def sklearn_proba(texts):
+        features = model.vectorizer.transform([preprocess(text) for text in texts])
+        return model.classifier.predict_proba(features)
+
+    reference = sklearn_proba(queries)
+    result = {"max_abs_diff": {}}
+    for dtype in (np.float64, np.float32):
+        engine = CompiledInferenceEngine.from_model(model, dtype=dtype)
+        result["max_abs_diff"][np.dtype(dtype).name] = float(
+            np.abs(engine.predict_proba(queries) - reference).max()
+        )
+
+    # engine is the float32 one
+    for name, score in (("sklearn", sklearn_proba), ("compiled", engine.predict_proba)):
+        for text in queries[:warmup]:
+            score([text])
+        latencies = []
+        for text in queries:
+            start = time.perf_counter()
+            score([text])
+            latencies.append(time.perf_counter() - start)
+        result[name] = latency_summary(latencies)
+    return result
+
+
+def run_size(n_intents, n_patterns, n_queries, backend, vectorizer, max_iter,
+             measure_memory, seed):
+    """Run all benchmarks for one corpus size, classifier backend and vectorizer"""
+    repository = SyntheticDataRepository(n_intents, n_patterns, seed=seed)
+    queries, expected = repository.sample_labelled_queries(n_queries, seed=seed + 1)
+
+    model, training = benchmark_training(repository, backend, max_iter, measure_memory,
+                                         vectorizer)
+    prediction = benchmark_prediction(model, queries)
+    features = benchmark_features(model, queries, expected)
+    compiled = None
+    if backend == "mlp" and vectorizer == "tfidf":
+        compiled = benchmark_compiled(model, queries)
+
+    # Preprocessing throughput over the training corpus
+    for _ in model.preprocessor.preprocess_batch(repository.training_texts):
+        pass
+
+    return {
+        "backend": backend,
+        "n_intents": n_intents,
+        "n_patterns": n_patterns,
+        "features": features,
+        "preprocess": model.preprocessor.last_batch_stats,
+        "training": training,
+        "inference": prediction,
+        "compiled": compiled,
+    }
+
+
+def environment_info():
+    """Describe the machine and library versions for the result file"""
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "numpy": np.__version__,
+        "sklearn": sklearn.__version__,
+    }
+
+
+def main(argv=None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Chatbot model benchmarks")
+    parser.add_argument("--sizes", nargs="+", type=parse_size,
+                        default=[(10, 200), (50, 2000), (200, 20000)],
+                        help="corpus sizes as INTENTSxPATTERNS")
+    parser.add_argument("--queries", type=int, default=1000,
+                        help="number of prediction queries per size")
+    parser.add_argument("--backends", nargs="+", default=["mlp"],
+                        choices=sorted(CLASSIFIER_BACKENDS),
+                        help="classifier backends to compare")
+    parser.add_argument("--vectorizers", nargs="+", default=["tfidf"],
+                        choices=VECTORIZER_MODES,
+                        help="feature extraction modes to compare")
+    parser.add_argument("--max-iter", type=int, default=None,
+                        help="override the classifier's max_iter")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the traced training run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None,
+                        help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    # Convergence warnings are expected with small max_iter overrides
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    results = []
+    for n_intents, n_patterns in args.sizes:
+        for backend in args.backends:
+            for vectorizer in args.vectorizers:
+                print(f"Benchmarking {backend}/{vectorizer}: "
+                      f"{n_intents} intents x {n_patterns} patterns...", file=sys.stderr)
+                results.append(run_size(n_intents, n_patterns, args.queries, backend,
+                                        vectorizer, args.max_iter, not args.no_memory,
+                                        args.seed))
+
+    report = {"environment": environment_info(), "results": results}
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmarks: Synthetic intent corpora
+=====================================
+This module contains the SyntheticDataRepository class which generates
+intent corpora of configurable size in the ChatbotDataRepository shape.
+"""
+
+import random
+import string
+
+from data import ChatbotDataRepository
+
+
+class SyntheticDataRepository(ChatbotDataRepository):
+    """
+    Benchmarks: Deterministic synthetic training data and responses.
+    Each intent owns a set of keywords; patterns mix a few keywords of
+    their intent with filler words shared by all intents.
+    """
+
+    def __init__(self, n_intents=10, n_patterns=200, keywords_per_intent=8,
+                 n_filler_words=200, seed=0):
+        """
+        Generate the corpus
+
+        Args:
+            n_intents (int): Number of distinct intents
+            n_patterns (int): Total number of training patterns
+            keywords_per_intent (int): Vocabulary owned by each intent
+            n_filler_words (int): Shared vocabulary used by every intent
+            seed (int): Random seed, so runs are comparable
+        """
+        if n_patterns < n_intents:
+            raise ValueError("n_patterns must be at least n_intents")
+
+        rng = random.Random(seed)
+        words = self._make_words(rng, n_intents * keywords_per_intent + n_filler_words)
+        filler = words[n_intents * keywords_per_intent:]
+
+        intents = [f"intent_{i}" for i in range(n_intents)]
+        self.intent_keywords = {
+            intent: words[i * keywords_per_intent:(i + 1) * keywords_per_intent]
+            for i, intent in enumerate(intents)
+        }
+
+        self.training_texts = []
+        self.training_labels = []
+        for i in range(n_patterns):
+            # Round-robin keeps every intent represented
+            intent = intents[i % n_intents]
+            self.training_texts.append(self.make_query(rng, intent, filler))
+            self.training_labels.append(intent)
+
+        self._filler = filler
+        self.intent_responses = {
+            intent: [f"Response {k} for {intent}." for k in range(3)]
+            for intent in intents
+        }
+
+    def make_query(self, rng, intent, filler=None):
+        """
+        Build one text for an intent from its keywords and filler words
+
+        Args:
+            rng (random.Random): Random source
+            intent (str): Intent the text should express
+            filler (list, optional): Shared words (defaults to the corpus filler)
+
+        Returns:
+            str: Generated text
+        """
+        filler = filler if filler is not None else self._filler
+        keywords = rng.sample(self.intent_keywords[intent], k=rng.randint(1, 3))
+        extra = rng.sample(filler, k=rng.randint(1, 3))
+        tokens = keywords + extra
+        rng.shuffle(tokens)
+        return " ".join(tokens)
+
+    def sample_queries(self, n_queries, seed=1):
+        """
+        Generate unseen queries drawn from the same distribution
+
+        Args:
+            n_queries (int): Number of queries
+            seed (int): Random seed
+
+        Returns:
+            list: Query texts
+        """
+        return self.sample_labelled_queries(n_queries, seed)[0]
+
+    def sample_labelled_queries(self, n_queries, seed=1):
+        """
+        Generate unseen queries together with the intent each expresses
+
+        Args:
+            n_queries (int): Number of queries
+            seed (int): Random seed
+
+        Returns:
+            tuple: (query texts, intents)
+        """
+        rng = random.Random(seed)
+        intents = list(self.intent_keywords)
+        labels = [rng.choice(intents) for _ in range(n_queries)]
+        return [self.make_query(rng, intent) for intent in labels], labels
+
+    @staticmethod
+    def _make_words(rng, count):
+        """Generate distinct pseudo-words"""
+        words = set()
+        while len(words) < count:
+            length = rng.randint(3, 9)
+            words.add("".join(rng.choice(string.ascii_lowercase) for _ in range(length)))
+        return sorted(words)
@@ -1,8 +1,10 @@
 """
 Controller Layer Package
-Contains the application controller that connects view and model.
+Contains the application controller that connects view and model, and the
+GUI-independent multi-session conversation engine.
 """
 
 from .chatbot_controller import ChatbotController
+from .conversation_engine import ConversationEngine
 
-__all__ = ['ChatbotController']
+__all__ = ['ChatbotController', 'ConversationEngine']
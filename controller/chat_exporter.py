@@ -0,0 +1,90 @@
+"""
+Controller Layer: Chat history export
+======================================
+This module contains the ChatExporter class which streams a chat history
+to plain text, JSON lines or gzip-compressed JSON lines files.
+"""
+
+import gzip
+import json
+
+
+class ChatExporter:
+    """
+    Controller Layer: Streams chat history to a file in large chunks.
+    Has no UI dependencies so it can run on a background thread.
+    """
+
+    FORMATS = ("txt", "jsonl", "jsonl.gz")
+
+    # Entries formatted and written per write() call
+    CHUNK_SIZE = 5000
+
+    # Size of the underlying file buffer
+    BUFFER_SIZE = 1024 * 1024
+
+    @staticmethod
+    def detect_format(file_path):
+        """
+        Choose the export format from a file name
+
+        Args:
+            file_path (str): Destination path
+
+        Returns:
+            str: One of FORMATS (plain text unless the extension says otherwise)
+        """
+        lower = file_path.lower()
+        if lower.endswith(".jsonl.gz") or lower.endswith(".gz"):
+            return "jsonl.gz"
+        if lower.endswith(".jsonl"):
+            return "jsonl"
+        return "txt"
+
+    def export(self, chat_log, file_path, export_format=None, progress_callback=None):
+        """
+        Write the chat history to a file
+
+        Args:
+            chat_log (ChatLog): History to export (anything with len()
+                and iter_chunks())
+            file_path (str): Destination path
+            export_format (str, optional): One of FORMATS; detected from
+                the file name when omitted
+            progress_callback (callable, optional): Called as
+                progress_callback(written, total) after each chunk
+
+        Returns:
+            int: Number of entries written
+        """
+        export_format = export_format or self.detect_format(file_path)
+        if export_format not in self.FORMATS:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        total = len(chat_log)
+        written = 0
+
+        with self._open(file_path, export_format) as f:
+            for chunk in chat_log.iter_chunks(self.CHUNK_SIZE):
+                f.write(self._format_chunk(chunk, export_format))
+                written += len(chunk)
+                if progress_callback:
+                    progress_callback(written, total)
+
+        return written
+
+    def _open(self, file_path, export_format):
+        """Open the destination file for text writing"""
+        if export_format == "jsonl.gz":
+            return gzip.open(file_path, "wt", encoding="utf-8")
+        return open(file_path, "w", encoding="utf-8", buffering=self.BUFFER_SIZE)
+
+    @staticmethod
+    def _format_chunk(chunk, export_format):
+        """Render a chunk of (sender, message) entries as one string"""
+        if export_format == "txt":
+            return "".join(f"{sender}: {msg}\n" for sender, msg in chunk)
+        return "".join(
+            json.dumps({"sender": sender, "message": msg}, ensure_ascii=False) + "\n"
+            for sender, msg in chunk
+        )
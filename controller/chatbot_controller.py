@@ -5,23 +5,73 @@ This module contains the ChatbotController class which orchestrates
 interactions between the Model and View layers.
 """
 
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+
+from .chat_exporter import ChatExporter
+from .conversation_engine import ConversationEngine
+
 
 class ChatbotController:
     """
     Controller Layer: Orchestrates interactions between Model and View.
     Handles user events, coordinates model predictions, and updates the view.
+    The GUI is one session of a ConversationEngine. Predictions run on a
+    background worker pool; results are handed back to the Tk thread
+    through a queue that is polled with the view's scheduler, and shown in
+    the order the messages were sent even when they finish out of order.
     """
     
-    def __init__(self, view, model):
+    # How often the Tk thread checks for finished predictions
+    POLL_INTERVAL_MS = 20
+    
+    # Conversation engine session used by the desktop window
+    SESSION_ID = "gui"
+    
+    def __init__(self, view, model, max_workers=2, engine=None):
         """
         Initialize controller with view and model
         
         Args:
             view (ChatbotView): The UI view
-            model (ChatbotMLModel): The ML model
+            model (ChatbotMLModel or None): The ML model; None until
+                attach_model() is called (e.g. while it loads)
+            max_workers (int): Number of background inference threads
+            engine (ConversationEngine, optional): Shared engine to join;
+                a private one is created by default
         """
         self.view = view
         self.model = model
+        # ModelRegistry holding earlier versions for rollback (optional)
+        self.registry = None
+        self.engine = engine if engine is not None else ConversationEngine(model)
+        if model is not None:
+            self.engine.attach_model(model)
+        
+        # Background inference (Tk widgets are only touched on the Tk thread)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="chatbot-inference"
+        )
+        self._results = queue.Queue()
+        # Sequence numbers of sent messages, and finished results held back
+        # until every earlier message has been answered
+        self._next_sequence = 0
+        self._next_delivery = 0
+        self._held_results = {}
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._polling = False
+        
+        # Background chat export (progress is reported via a queue)
+        self._exporter = ChatExporter()
+        self._export_events = queue.Queue()
+        self._export_thread = None
         
         # Wire up event handlers
         self._setup_event_handlers()
@@ -34,6 +84,7 @@ class ChatbotController:
         self.view.on_export_chat = self.handle_export_chat
         self.view.on_show_about = self.handle_show_about
         self.view.on_example_selected = self.handle_example_selected
+        self.view.on_rollback_model = self.handle_rollback_model
     
     # ===== Event Handlers =====
     
@@ -41,7 +92,8 @@ class ChatbotController:
         """Handle user sending a message"""
         message = self.view.get_input_text()
 
-        if not message:
+        # Ignore sends (e.g. the Return key) while the model is loading
+        if not message or self.model is None:
             return
 
         # Display user message
@@ -50,25 +102,130 @@ class ChatbotController:
         # Clear input field
         self.view.clear_input_field()
 
-        # Show thinking indicator
+        # Show thinking indicator until the real result arrives
         thinking_frame = self.view.show_thinking_indicator()
 
-        # Schedule response after delay (simulate thinking)
-        self.view.schedule_callback(
-            800, 
-            lambda: self._process_and_respond(message, thinking_frame)
-        )
+        # Hand the prediction to the worker pool
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        with self._stats_lock:
+            self._queued += 1
+        self._executor.submit(self._predict_in_background, sequence, message, thinking_frame)
+        self._start_polling()
+    
+    def attach_model(self, model, version=None):
+        """
+        Start answering messages with a model that finished loading, or
+        switch to a new version. Conversations carry on; predictions that
+        already started finish on the previous model.
+        
+        Args:
+            model (ChatbotMLModel): The trained ML model
+            version (str, optional): Version label shown in the status bar
+        """
+        first_model = self.model is None
+        self.model = model
+        self.engine.attach_model(model)
+        if version is not None:
+            self.view.set_model_version(version)
+        if first_model:
+            self.view.set_model_ready(model.get_accuracy())
+        else:
+            self.view.add_bot_message(f"Switched to model {version or 'update'} "
+                                      f"(accuracy: {model.get_accuracy():.2f}%)")
+        self._update_rollback_state()
+    
+    def attach_registry(self, registry):
+        """
+        Let the user roll back to earlier model versions. The registry's
+        on_swap callback is expected to pass activated versions back to
+        attach_model() on the Tk thread.
+        
+        Args:
+            registry (ModelRegistry): Registry the models come from
+        """
+        self.registry = registry
+        self._update_rollback_state()
+    
+    def _update_rollback_state(self):
+        """Offer rollback only while an earlier version is kept"""
+        versions = self.registry.versions() if self.registry is not None else []
+        self.view.set_rollback_available(len(versions) > 1)
+    
+    def _predict_in_background(self, sequence, message, thinking_frame):
+        """Run the model on a worker thread and queue the outcome"""
+        with self._stats_lock:
+            self._queued -= 1
+            self._in_flight += 1
+        try:
+            outcome = self.engine.handle_message(self.SESSION_ID, message)
+        except Exception as e:
+            outcome = e
+
+        # Queue before updating counters so the poller never sees
+        # "nothing pending" while a result is still on its way
+        self._results.put((sequence, thinking_frame, outcome))
+        with self._stats_lock:
+            self._in_flight -= 1
+            self._completed += 1
+    
+    def _start_polling(self):
+        """Begin polling for results if not already doing so"""
+        if not self._polling:
+            self._polling = True
+            self.view.schedule_callback(self.POLL_INTERVAL_MS, self._poll_results)
+    
+    def _poll_results(self):
+        """Deliver finished predictions on the Tk thread, in send order"""
+        while True:
+            try:
+                sequence, thinking_frame, outcome = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._held_results[sequence] = (thinking_frame, outcome)
+
+        while self._next_delivery in self._held_results:
+            thinking_frame, outcome = self._held_results.pop(self._next_delivery)
+            self._next_delivery += 1
+            self._process_and_respond(thinking_frame, outcome)
+
+        # Keep polling only while work is outstanding
+        with self._stats_lock:
+            pending = self._queued + self._in_flight
+        if pending or self._held_results or not self._results.empty():
+            self.view.schedule_callback(self.POLL_INTERVAL_MS, self._poll_results)
+        else:
+            self._polling = False
     
-    def _process_and_respond(self, message, thinking_frame):
-        """Process message and show bot response"""
-        # Remove thinking indicator
-        self.view.remove_thinking_indicator(thinking_frame)
+    def _process_and_respond(self, thinking_frame, outcome):
+        """Remove the thinking indicator and show the bot response"""
+        with metrics.timer("process_and_respond"):
+            # Remove thinking indicator
+            self.view.remove_thinking_indicator(thinking_frame)
 
-        # Get response from model
-        response = self.model.predict(message)
+            if isinstance(outcome, Exception):
+                metrics.increment("prediction_errors")
+                self.view.add_bot_message(f"Sorry, something went wrong: {outcome}")
+                return
 
-        # Display bot response
-        self.view.add_bot_message(response)
+            # Display bot response
+            self.view.add_bot_message(outcome.response)
+    
+    def get_queue_stats(self):
+        """
+        Get background inference counters for monitoring
+        
+        Returns:
+            dict: Queued (waiting for a worker), in-flight, completed and
+                undelivered (finished but not yet shown) prediction counts
+        """
+        with self._stats_lock:
+            return {
+                "queued": self._queued,
+                "in_flight": self._in_flight,
+                "completed": self._completed,
+                "undelivered": self._results.qsize() + len(self._held_results),
+            }
     
     def handle_clear_input(self):
         """Handle clearing the input field"""
@@ -82,10 +239,15 @@ class ChatbotController:
         )
         if result:
             self.view.clear_all_messages()
+            self.engine.end_session(self.SESSION_ID)
             self.view.add_bot_message("Chat cleared! How can I help you?")
     
     def handle_export_chat(self):
         """Handle exporting chat history to file"""
+        if self._export_thread is not None:
+            self.view.show_warning("Export Chat", "An export is already in progress.")
+            return
+
         chat_log = self.view.get_chat_log()
         
         if not chat_log:
@@ -96,22 +258,95 @@ class ChatbotController:
         if not file_path:
             return
 
+        # Stream the export on a background thread so the window stays responsive
+        self._export_thread = threading.Thread(
+            target=self._export_in_background,
+            args=(chat_log, file_path),
+            name="chat-export",
+            daemon=True
+        )
+        self._export_thread.start()
+        self.view.set_status("Exporting chat history...")
+        self.view.schedule_callback(self.POLL_INTERVAL_MS, self._poll_export)
+    
+    def _export_in_background(self, chat_log, file_path):
+        """Write the chat log on the export thread and report progress"""
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                for sender, msg in chat_log:
-                    f.write(f"{sender}: {msg}\n")
-            self.view.show_info("Export Chat", "Chat history exported successfully!")
+            count = self._exporter.export(
+                chat_log,
+                file_path,
+                progress_callback=lambda done, total: self._export_events.put(
+                    ("progress", (done, total))
+                )
+            )
+            self._export_events.put(("done", count))
         except Exception as e:
-            self.view.show_error("Export Chat", f"Error saving file:\n{e}")
+            self._export_events.put(("error", e))
+    
+    def _poll_export(self):
+        """Show export progress and the final outcome on the Tk thread"""
+        finished = False
+        while True:
+            try:
+                kind, payload = self._export_events.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == "progress":
+                done, total = payload
+                percent = 100 * done // max(total, 1)
+                self.view.set_status(f"Exporting chat history... {done}/{total} ({percent}%)")
+            elif kind == "done":
+                finished = True
+                self.view.reset_status()
+                self.view.show_info("Export Chat",
+                                    f"Chat history exported successfully! ({payload} messages)")
+            else:
+                finished = True
+                self.view.reset_status()
+                self.view.show_error("Export Chat", f"Error saving file:\n{payload}")
+        
+        if finished:
+            self._export_thread = None
+        else:
+            self.view.schedule_callback(self.POLL_INTERVAL_MS, self._poll_export)
     
     def handle_show_about(self):
         """Handle showing about dialog"""
         self.view.show_about_dialog()
     
+    def handle_rollback_model(self):
+        """Handle rolling back to the previous model version"""
+        versions = self.registry.versions() if self.registry is not None else []
+        if len(versions) < 2:
+            self.view.show_warning("Roll Back Model", "No earlier model version is available.")
+            return
+        
+        active, previous = versions[-1], versions[-2]
+        result = self.view.ask_yes_no(
+            "Roll Back Model",
+            f"Replace model v{active['version']} ({active['source']}) with "
+            f"v{previous['version']} ({previous['source']})?"
+        )
+        if not result:
+            return
+        try:
+            # The swap reaches attach_model() through the registry's on_swap
+            self.registry.rollback()
+        except ValueError as e:
+            self.view.show_warning("Roll Back Model", str(e))
+    
     def handle_example_selected(self, example_text):
         """Handle user clicking an example query"""
         self.view.set_input_text(example_text)
     
     def run(self):
         """Start the application"""
-        self.view.run()
+        try:
+            self.view.run()
+        finally:
+            self.shutdown()
+    
+    def shutdown(self):
+        """Stop the background inference workers"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
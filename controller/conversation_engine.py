@@ -0,0 +1,219 @@
+"""
+Controller Layer: Multi-session conversation engine
+====================================================
+This module contains the ConversationEngine class which serves many
+independent conversations from one shared ChatbotMLModel. It is free of any
+GUI code; the Tk ChatbotController is one client of it.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+
+from metrics import metrics
+
+
+class ConversationSession:
+    """
+    Controller Layer: State of one conversation.
+    History is a ring buffer of (timestamp, user text, intent, response)
+    tuples, so a session's memory is bounded however long it runs.
+    """
+
+    __slots__ = ("session_id", "history", "last_intent", "created_at",
+                 "last_active", "message_count")
+
+    def __init__(self, session_id, history_size, now):
+        self.session_id = session_id
+        self.history = deque(maxlen=history_size)
+        self.last_intent = None
+        self.created_at = now
+        self.last_active = now
+        self.message_count = 0
+
+    def to_dict(self):
+        """Return a copy of the session state"""
+        return {
+            "session_id": self.session_id,
+            "history": list(self.history),
+            "last_intent": self.last_intent,
+            "created_at": self.created_at,
+            "last_active": self.last_active,
+            "message_count": self.message_count,
+        }
+
+
+class ConversationEngine:
+    """
+    Controller Layer: Session manager in front of a shared model.
+    Sessions are kept in least-recently-active order, so idle eviction only
+    looks at the oldest sessions and the capacity cap drops the least
+    recently active one. handle_message() may be called from any thread;
+    the model runs outside the session lock.
+    """
+
+    def __init__(self, model=None, max_sessions=50000, idle_timeout_seconds=1800,
+                 history_size=20, max_stored_chars=500, clock=time.time):
+        """
+        Initialize the engine
+
+        Args:
+            model (ChatbotMLModel or None): Shared model; None until
+                attach_model() is called
+            max_sessions (int): Most sessions kept; the least recently
+                active one is evicted beyond this
+            idle_timeout_seconds (float or None): Sessions inactive for
+                longer are evicted; None keeps them until the cap is hit
+            history_size (int): Exchanges kept per session
+            max_stored_chars (int): Longest user text or response stored in
+                history (longer ones are truncated)
+            clock (callable): Time source in seconds
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions must be at least 1")
+        if history_size < 0:
+            raise ValueError("history_size must not be negative")
+
+        self.model = model
+        self.max_sessions = max_sessions
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.history_size = history_size
+        self.max_stored_chars = max_stored_chars
+        self._clock = clock
+
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._evicted_idle = 0
+        self._evicted_capacity = 0
+        self._messages = 0
+
+    def attach_model(self, model):
+        """
+        Serve all sessions with a (new) model
+
+        Args:
+            model (ChatbotMLModel): The trained ML model
+        """
+        self.model = model
+
+    def handle_message(self, session_id, text):
+        """
+        Answer a message in the context of a session, creating the session
+        if needed
+
+        Args:
+            session_id (hashable): Conversation identifier
+            text (str): User input text
+
+        Returns:
+            PredictionResult: Intent, confidence, alternatives and response
+        """
+        model = self.model
+        if model is None:
+            raise RuntimeError("No model is attached to the conversation engine")
+
+        with self._lock:
+            session = self._touch(session_id)
+
+        result = model.predict_intent(text)
+
+        limit = self.max_stored_chars
+        with self._lock:
+            session.history.append((self._clock(), text[:limit], result.intent,
+                                    result.response[:limit]))
+            session.last_intent = result.intent
+            session.message_count += 1
+            self._messages += 1
+        return result
+
+    def _touch(self, session_id):
+        """Get or create a session and mark it active (lock held)"""
+        now = self._clock()
+        self._evict_idle(now)
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = ConversationSession(session_id, self.history_size, now)
+            self._sessions[session_id] = session
+            self._created += 1
+            metrics.increment("sessions_created")
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._evicted_capacity += 1
+        else:
+            session.last_active = now
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def _evict_idle(self, now):
+        """Drop sessions idle past the timeout, oldest first (lock held)"""
+        if self.idle_timeout_seconds is None:
+            return 0
+        deadline = now - self.idle_timeout_seconds
+        evicted = 0
+        while self._sessions:
+            oldest = next(iter(self._sessions.values()))
+            if oldest.last_active >= deadline:
+                break
+            self._sessions.popitem(last=False)
+            evicted += 1
+        self._evicted_idle += evicted
+        return evicted
+
+    def evict_idle(self):
+        """
+        Evict idle sessions now (also done on every message)
+
+        Returns:
+            int: Number of sessions evicted
+        """
+        with self._lock:
+            return self._evict_idle(self._clock())
+
+    def get_session(self, session_id):
+        """
+        Get a copy of a session's state
+
+        Args:
+            session_id (hashable): Conversation identifier
+
+        Returns:
+            dict or None: Session state, or None if unknown or evicted
+        """
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return None if session is None else session.to_dict()
+
+    def end_session(self, session_id):
+        """
+        Forget a session
+
+        Args:
+            session_id (hashable): Conversation identifier
+
+        Returns:
+            bool: True if the session existed
+        """
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def get_stats(self):
+        """
+        Get session counters for monitoring
+
+        Returns:
+            dict: Active, created and evicted session counts and messages
+        """
+        with self._lock:
+            return {
+                "active_sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "created": self._created,
+                "evicted_idle": self._evicted_idle,
+                "evicted_capacity": self._evicted_capacity,
+                "messages": self._messages,
+            }
+
+    def __len__(self):
+        return len(self._sessions)
@@ -4,5 +4,6 @@ Contains data repositories for training data, intents, and responses.
 """
 
 from .intents_data import ChatbotDataRepository
+from .file_repository import FileIntentRepository
 
-__all__ = ['ChatbotDataRepository']
+__all__ = ['ChatbotDataRepository', 'FileIntentRepository']
@@ -0,0 +1,467 @@
+"""
+Data Layer: File-backed intent repository
+==========================================
+This module contains the FileIntentRepository class which reads training
+patterns and response templates from JSON, JSON Lines and CSV files, for
+knowledge bases too large to keep in code.
+
+Supported layouts:
+    .json   {"intents": [{"tag": "greet", "patterns": [...], "responses": [...]}]}
+            (or the bare list of intent objects; "intent" may replace "tag")
+    .jsonl  one intent object per line, or one example per line:
+            {"intent": "greet", "text": "hello"}
+    .csv    header with "intent" and "pattern" (or "text") columns and an
+            optional "response" column; every non-empty cell is used
+"""
+
+import csv
+import glob
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+
+from .intents_data import ChatbotDataRepository
+
+SUPPORTED_EXTENSIONS = (".json", ".jsonl", ".csv")
+
+# Validated examples per pickled chunk in a parsed-file cache entry
+CACHE_CHUNK_SIZE = 10000
+
+# Validation messages kept in load_report
+MAX_REPORTED_ERRORS = 20
+
+
+class FileIntentRepository(ChatbotDataRepository):
+    """
+    Data Layer: Training data and responses loaded from intent files.
+    Files are read lazily on first use. Records are validated (non-empty
+    string intent and text) and deduplicated while loading: a pattern that
+    repeats an earlier one (ignoring case and spacing) is dropped, and so is
+    one that contradicts it with another intent. Each file's validated
+    records can be cached on disk, keyed by its size and modification time
+    and backed by a content hash, so unchanged files load without parsing.
+    """
+
+    CACHE_FORMAT_VERSION = 1
+
+    def __init__(self, paths, cache_dir=None,
+                 fallback_response="Sorry, I didn't understand your question."):
+        """
+        Initialize the repository (nothing is read yet)
+
+        Args:
+            paths (str or list of str): Intent files, or directories whose
+                supported files are read in name order
+            cache_dir (str, optional): Where parsed files are cached; None
+                disables the cache
+            fallback_response (str): Reply for low confidence predictions
+        """
+        self.paths = [paths] if isinstance(paths, str) else list(paths)
+        self.cache_dir = cache_dir
+        self.fallback_response = fallback_response
+
+        self._texts = None
+        self._labels = None
+        self._responses = None
+        self._signature = None
+        self.load_report = None
+
+    # ===== ChatbotDataRepository interface =====
+
+    @property
+    def training_texts(self):
+        self._ensure_loaded()
+        return self._texts
+
+    @property
+    def training_labels(self):
+        self._ensure_loaded()
+        return self._labels
+
+    @property
+    def intent_responses(self):
+        if self._responses is None:
+            self._ensure_loaded()
+        return self._responses
+
+    def iter_training_data(self):
+        """
+        Stream the training data one example at a time. Before load() the
+        files are read as they are consumed, so the corpus is never held in
+        memory at once.
+
+        Yields:
+            tuple: (text, label)
+        """
+        if self._texts is not None:
+            yield from zip(self._texts, self._labels)
+        else:
+            yield from self._scan()
+
+    def get_fallback_response(self):
+        """Get fallback response for low confidence predictions"""
+        return self.fallback_response
+
+    # ===== Loading =====
+
+    def load(self):
+        """
+        Read (or re-read) all files into memory
+
+        Returns:
+            dict: The load report
+        """
+        texts, labels = [], []
+        for text, label in self._scan():
+            texts.append(text)
+            labels.append(label)
+        self._texts, self._labels = texts, labels
+        return self.load_report
+
+    def reload(self):
+        """
+        Re-read the files if any were added, removed or modified.
+        Patterns added with add_patterns() are discarded by a reload.
+
+        Returns:
+            bool: True if the data was reloaded
+        """
+        if self._texts is not None and self.get_source_signature() == self._signature:
+            return False
+        self.load()
+        return True
+
+    def _ensure_loaded(self):
+        if self._texts is None:
+            self.load()
+
+    def source_files(self):
+        """
+        List the files read, in load order
+
+        Returns:
+            list of str: File paths
+        """
+        files = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files.extend(sorted(
+                    name for name in glob.glob(os.path.join(path, "*"))
+                    if name.lower().endswith(SUPPORTED_EXTENSIONS)
+                ))
+            else:
+                files.append(path)
+        return files
+
+    def get_source_signature(self):
+        """
+        Cheap fingerprint of the source files (paths, sizes and
+        modification times) that changes when the data does
+
+        Returns:
+            tuple: Comparable signature
+        """
+        signature = []
+        for path in self.source_files():
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            signature.append((os.path.abspath(path), stat.st_size, stat.st_mtime_ns))
+        return tuple(signature)
+
+    def _scan(self):
+        """Yield validated, deduplicated examples from every file"""
+        start = time.perf_counter()
+        signature = self.get_source_signature()
+        report = {
+            "files": 0,
+            "cached_files": 0,
+            "patterns": 0,
+            "duplicates": 0,
+            "conflicts": 0,
+            "invalid": 0,
+            "errors": [],
+        }
+        responses = {}
+        seen = {}
+
+        for path in self.source_files():
+            report["files"] += 1
+            for text, intent in self._iter_file(path, report, responses):
+                key = " ".join(text.lower().split())
+                previous = seen.get(key)
+                if previous is None:
+                    seen[key] = intent
+                    report["patterns"] += 1
+                    yield text, intent
+                elif previous == intent:
+                    report["duplicates"] += 1
+                else:
+                    report["conflicts"] += 1
+                    self._report_error(report, f"{path}: {text!r} is already a pattern "
+                                               f"of {previous!r}, skipped for {intent!r}")
+
+        trained_intents = set(seen.values())
+        report["intents"] = len(trained_intents)
+        report["intents_without_responses"] = sorted(trained_intents - set(responses))
+        report["seconds"] = time.perf_counter() - start
+        self.load_report = report
+        self._responses = responses
+        self._signature = signature
+
+    def load_summary(self):
+        """
+        Describe the last load for the user (the caller decides where to
+        show it; details are in load_report)
+
+        Returns:
+            list of str: Summary line, then warnings; empty before any load
+        """
+        report = self.load_report
+        if report is None:
+            return []
+        lines = [f"Loaded {report['patterns']} patterns for {report['intents']} intents "
+                 f"from {report['files']} files ({report['cached_files']} cached) in "
+                 f"{report['seconds']:.2f}s; skipped {report['duplicates']} duplicates, "
+                 f"{report['conflicts']} conflicts and {report['invalid']} invalid records"]
+        if report["intents_without_responses"]:
+            lines.append(f"Warning: intents without responses: "
+                         f"{', '.join(report['intents_without_responses'])}")
+        return lines
+
+    @staticmethod
+    def _report_error(report, message):
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append(message)
+
+    # ===== Files and the parsed cache =====
+
+    def _iter_file(self, path, report, responses):
+        """Yield one file's validated examples, from the cache if possible"""
+        cache_path = self._cache_path(path)
+        entry = self._open_cache(path, cache_path) if cache_path else None
+        if entry is not None:
+            report["cached_files"] += 1
+            yield from self._read_cache(entry, report, responses)
+            return
+
+        file_responses = {}
+        file_stats = {"invalid": 0, "errors": []}
+        records = self._parse(path, file_responses, file_stats)
+        if cache_path:
+            records = self._write_cache(path, cache_path, records, file_responses, file_stats)
+        yield from records
+        self._merge_file_results(report, responses, file_responses, file_stats)
+
+    def _cache_path(self, path):
+        if self.cache_dir is None:
+            return None
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest + ".pkl")
+
+    @staticmethod
+    def _file_hash(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def _open_cache(self, path, cache_path):
+        """
+        Open a valid cache entry for the file
+
+        Returns:
+            file or None: Cache file positioned after its header, or None
+                when missing or stale
+        """
+        try:
+            f = open(cache_path, "rb")
+        except FileNotFoundError:
+            return None
+        try:
+            header = pickle.load(f)
+            if header.get("format_version") != self.CACHE_FORMAT_VERSION:
+                raise ValueError("old cache format")
+            stat = os.stat(path)
+            if (header["size"], header["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                # Touched but possibly unchanged: fall back to the content hash
+                if header["size"] != stat.st_size or header["sha256"] != self._file_hash(path):
+                    raise ValueError("file changed")
+            return f
+        except Exception:
+            f.close()
+            return None
+
+    @staticmethod
+    def _read_cache(f, report, responses):
+        """Yield the cached examples, then merge the cached responses"""
+        with f:
+            while True:
+                chunk = pickle.load(f)
+                if isinstance(chunk, dict):
+                    break
+                yield from chunk
+        FileIntentRepository._merge_file_results(report, responses, chunk["responses"], chunk)
+
+    def _write_cache(self, path, cache_path, records, file_responses, file_stats):
+        """Pass records through while writing them to a new cache entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        stat = os.stat(path)
+        header = {
+            "format_version": self.CACHE_FORMAT_VERSION,
+            "path": os.path.abspath(path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": self._file_hash(path),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        completed = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(header, f, protocol=pickle.HIGHEST_PROTOCOL)
+                chunk = []
+                for record in records:
+                    chunk.append(record)
+                    if len(chunk) >= CACHE_CHUNK_SIZE:
+                        pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                        chunk = []
+                    yield record
+                if chunk:
+                    pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(dict(file_stats, responses=file_responses), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+            completed = True
+        finally:
+            # Also reached when the caller stops iterating early
+            if not completed and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @staticmethod
+    def _merge_file_results(report, responses, file_responses, file_stats):
+        for intent, templates in file_responses.items():
+            merged = responses.setdefault(intent, [])
+            merged.extend(t for t in templates if t not in merged)
+        report["invalid"] += file_stats["invalid"]
+        for message in file_stats["errors"]:
+            FileIntentRepository._report_error(report, message)
+
+    # ===== Parsing =====
+
+    def _parse(self, path, responses, stats):
+        """
+        Yield validated (text, intent) examples of one file, collecting its
+        response templates and invalid-record counts
+        """
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".json":
+            records = self._parse_json(path)
+        elif extension == ".jsonl":
+            records = self._parse_jsonl(path)
+        elif extension == ".csv":
+            records = self._parse_csv(path)
+        else:
+            raise ValueError(f"Unsupported intent file type: {path}")
+
+        # Records are (location, kind, intent, text); "error" records carry
+        # the problem as their text
+        for location, kind, intent, text in records:
+            if kind == "error":
+                problem = text
+            elif not isinstance(intent, str) or not intent.strip():
+                problem = "missing intent"
+            elif not isinstance(text, str) or not text.strip():
+                problem = f"empty or non-text {kind}"
+            else:
+                intent, text = intent.strip(), text.strip()
+                if kind == "pattern":
+                    yield text, intent
+                else:
+                    templates = responses.setdefault(intent, [])
+                    if text not in templates:
+                        templates.append(text)
+                continue
+            stats["invalid"] += 1
+            if len(stats["errors"]) < MAX_REPORTED_ERRORS:
+                stats["errors"].append(f"{path}:{location}: {problem}")
+
+    @staticmethod
+    def _intent_records(location, obj):
+        """Records of one intent object or single example"""
+        if not isinstance(obj, dict):
+            yield location, "error", None, "expected a JSON object"
+            return
+        intent = obj.get("tag", obj.get("intent"))
+        if "patterns" in obj or "responses" in obj:
+            for key, kind in (("patterns", "pattern"), ("responses", "response")):
+                values = obj.get(key, [])
+                if not isinstance(values, list):
+                    yield location, "error", None, f'"{key}" must be a list'
+                    continue
+                for value in values:
+                    yield location, kind, intent, value
+        elif "text" in obj or "pattern" in obj:
+            yield location, "pattern", intent, obj.get("text", obj.get("pattern"))
+        elif "response" in obj:
+            yield location, "response", intent, obj["response"]
+        else:
+            yield location, "error", None, "no patterns, text or responses"
+
+    def _parse_json(self, path):
+        # The json module has no incremental parser; JSON files are read
+        # whole, JSON Lines and CSV files a line at a time
+        with open(path, encoding="utf-8") as f:
+            try:
+                document = json.load(f)
+            except ValueError as e:
+                yield 1, "error", None, f"invalid JSON ({e})"
+                return
+        intents = document.get("intents") if isinstance(document, dict) else document
+        if not isinstance(intents, list):
+            yield 1, "error", None, 'expected a list of intents or an "intents" list'
+            return
+        for index, obj in enumerate(intents):
+            yield from self._intent_records(f"intent {index}", obj)
+
+    def _parse_jsonl(self, path):
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    obj = json.loads(line)
+                except ValueError:
+                    yield line_number, "error", None, "invalid JSON"
+                    continue
+                yield from self._intent_records(line_number, obj)
+
+    @staticmethod
+    def _parse_csv(path):
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+            intent_field = fields.get("intent", fields.get("tag"))
+            pattern_field = fields.get("pattern", fields.get("text"))
+            response_field = fields.get("response")
+            if intent_field is None or (pattern_field is None and response_field is None):
+                yield 1, "error", None, ('needs an "intent" column and a "pattern" '
+                                         'or "response" column')
+                return
+
+            # Line 1 is the header
+            for line_number, row in enumerate(reader, 2):
+                intent = row.get(intent_field)
+                pattern = row.get(pattern_field) if pattern_field else None
+                response = row.get(response_field) if response_field else None
+                if not (pattern or "").strip() and not (response or "").strip():
+                    yield line_number, "error", None, "row has no pattern or response"
+                    continue
+                if (pattern or "").strip():
+                    yield line_number, "pattern", intent, pattern
+                if (response or "").strip():
+                    yield line_number, "response", intent, response
@@ -104,6 +104,34 @@ class ChatbotDataRepository:
     def get_training_data(self):
         """Return training texts and labels"""
         return self.training_texts, self.training_labels
+
+    def iter_training_data(self):
+        """
+        Stream the training data one example at a time
+
+        Yields:
+            tuple: (text, label)
+        """
+        yield from zip(self.training_texts, self.training_labels)
+
+    def add_patterns(self, intent, patterns, responses=None):
+        """
+        Append training patterns for an intent (new or existing).
+        A trained model picks them up with ChatbotMLModel.update().
+        
+        Args:
+            intent (str): Intent label
+            patterns (list of str): Example user inputs
+            responses (list of str, optional): Response templates; required
+                for a new intent, replaces the existing ones otherwise
+        """
+        if responses is None and intent not in self.intent_responses:
+            raise ValueError(f"New intent {intent!r} needs responses")
+        
+        self.training_texts.extend(patterns)
+        self.training_labels.extend([intent] * len(patterns))
+        if responses is not None:
+            self.intent_responses[intent] = list(responses)
     
     def get_response_for_intent(self, intent):
         """Get a random response for the given intent"""
@@ -12,49 +12,268 @@ Architecture: Clean layered architecture (Data, Model, View, Controller)
 To run the application:
     python main.py
 
+Set CHATBOT_DATA_PATH to train on JSON/JSONL/CSV intent files (or
+directories of them) instead of the built-in data. The model is rebuilt
+and swapped in without a restart when those files change.
+
+Set CHATBOT_STREAMING_CHUNK_SIZE to train out of core in chunks (hashing
+features); progress is shown in the status bar.
+
+Set CHATBOT_METRICS_FILE to collect per-stage latency metrics and append a
+snapshot to that file every CHATBOT_METRICS_INTERVAL seconds (default 60).
+
 Author: The 5 Warriors
 Project: NLP Chatbot
 """
 
+import os
+import queue
+import threading
+import time
+import traceback
+
+# Reference point for startup timings (taken before the GUI imports)
+_PROCESS_START = time.perf_counter()
+
 import tkinter as tk
-from data import ChatbotDataRepository
-from models import NLPPreprocessor, ChatbotMLModel
 from view import ChatbotView
 from controller import ChatbotController
+from metrics import metrics
+
+# Trained model artifact, reused across launches while data and config are unchanged
+MODEL_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   ".model_cache", "chatbot_model.pkl")
+
+# Model configuration chosen by select_model.py (optional)
+MODEL_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "model_config.json")
+
+# How often the Tk thread checks whether the model finished loading
+MODEL_POLL_INTERVAL_MS = 50
+
+# Optional intent files or directories (os.pathsep-separated) used instead of
+# the built-in training data, and where their parsed contents are cached
+DATA_PATHS = os.environ.get("CHATBOT_DATA_PATH")
+INTENT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".model_cache", "intents")
+
+# Train out of core in chunks of this many examples (hashing features) when
+# set, with CHATBOT_STREAMING_EPOCHS passes over the data
+STREAMING_CHUNK_SIZE = int(os.environ.get("CHATBOT_STREAMING_CHUNK_SIZE", "0"))
+STREAMING_EPOCHS = int(os.environ.get("CHATBOT_STREAMING_EPOCHS", "5"))
+
+# How often the data files are checked for changes (with CHATBOT_DATA_PATH),
+# and how many model versions are kept for rollback
+DATA_WATCH_INTERVAL_SECONDS = float(os.environ.get("CHATBOT_DATA_WATCH_INTERVAL", "5"))
+MODEL_VERSIONS_KEPT = 2
+
+# Optional metrics snapshot file (JSON Lines) and dump interval in seconds
+METRICS_FILE = os.environ.get("CHATBOT_METRICS_FILE")
+METRICS_INTERVAL_SECONDS = float(os.environ.get("CHATBOT_METRICS_INTERVAL", "60"))
+
+
+class StartupTimer:
+    """
+    Records how long each startup phase takes so cold-start regressions
+    are visible in the console output.
+    """
+    
+    def __init__(self):
+        self.phases = {}
+        self._lock = threading.Lock()
+    
+    def record(self, phase, start):
+        """Log a phase that began at the given perf_counter() time"""
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.phases[phase] = elapsed
+        print(f"[startup] {phase}: {elapsed:.3f}s "
+              f"(t+{time.perf_counter() - _PROCESS_START:.3f}s)")
+
+
+def build_model(results, timer=None):
+    """
+    Load data and load or train a model. Runs on a background thread at
+    startup and for every reload.
+    
+    Args:
+        results (queue.Queue): Receives ("progress", dict) while training
+            in streaming mode
+        timer (StartupTimer, optional): Records the startup phases
+    
+    Returns:
+        ChatbotMLModel: The trained model
+    """
+    # 1. Import the heavy model layer (scikit-learn); cached after startup
+    start = time.perf_counter()
+    from models import (NLPPreprocessor, ChatbotMLModel, ModelArtifactStore,
+                        PredictionCache)
+    from models.model_selection import load_model_config
+    if timer is not None:
+        timer.record("import", start)
+    
+    # 2. Initialize Data Layer
+    start = time.perf_counter()
+    from data import ChatbotDataRepository, FileIntentRepository
+    if DATA_PATHS:
+        data_repository = FileIntentRepository(DATA_PATHS.split(os.pathsep),
+                                               cache_dir=INTENT_CACHE_DIR)
+        data_repository.load()
+        for line in data_repository.load_summary():
+            print(line)
+    else:
+        data_repository = ChatbotDataRepository()
+    if timer is not None:
+        timer.record("data load", start)
+    
+    # 3. Initialize Model Layer and load or train the model
+    start = time.perf_counter()
+    preprocessor = NLPPreprocessor()
+    artifact_store = ModelArtifactStore(MODEL_ARTIFACT_PATH)
+    prediction_cache = PredictionCache(max_entries=1024, ttl_seconds=3600)
+    ml_model = ChatbotMLModel(data_repository, preprocessor, artifact_store,
+                              prediction_cache)
+    saved = load_model_config(MODEL_CONFIG_PATH)
+    if saved is not None:
+        ml_model.configure(saved["config"])
+        cv_accuracy = saved.get("cross_validation", {}).get("accuracy")
+        if cv_accuracy is not None:
+            print(f"Using {MODEL_CONFIG_PATH} "
+                  f"(cross-validated accuracy {cv_accuracy * 100:.2f}%)")
+    streaming = None
+    if STREAMING_CHUNK_SIZE > 0:
+        ml_model.vectorizer_mode = "hashing"
+        streaming = {
+            "chunk_size": STREAMING_CHUNK_SIZE,
+            "epochs": STREAMING_EPOCHS,
+            "progress_callback": lambda progress: results.put(("progress", progress)),
+        }
+    model_accuracy = ml_model.load_or_train(streaming)
+    if timer is not None:
+        timer.record("fit", start)
+    print(f"Model ready! Training accuracy: {model_accuracy:.2f}%")
+    return ml_model
+
+
+def load_model_in_background(timer, results):
+    """
+    Import the model layer and build the first model version, then watch
+    the data files (if any) and build a new version when they change.
+    Runs on a worker thread; outcomes are put on the results queue.
+    
+    Args:
+        timer (StartupTimer): Startup phase timings
+        results (queue.Queue): Receives ("registry", ModelRegistry) once
+            it exists, ("progress", dict) while training in streaming mode,
+            ("ready", ModelVersion) for every activated version and
+            ("error", exc) for failed builds
+    """
+    try:
+        from models import ModelRegistry
+        
+        # 1. Build the first version off the Tk thread; reloads reuse the
+        # same factory
+        registry = ModelRegistry(
+            lambda: build_model(results),
+            max_versions=MODEL_VERSIONS_KEPT,
+            on_swap=lambda version: results.put(("ready", version)),
+            on_error=lambda e: results.put(("error", e)),
+        )
+        # Handed to the controller for rollback
+        results.put(("registry", registry))
+        start = time.perf_counter()
+        model = build_model(results, timer)
+        # There is nothing to fall back to, so a model failing its smoke
+        # test is still activated (with a warning)
+        registry.promote(model, "startup", time.perf_counter() - start, strict=False)
+        
+        # 2. Rebuild when the data files change
+        if DATA_PATHS:
+            from data import FileIntentRepository
+            watched = FileIntentRepository(DATA_PATHS.split(os.pathsep))
+            registry.start_watching(watched.get_source_signature, DATA_WATCH_INTERVAL_SECONDS)
+    except Exception as e:
+        traceback.print_exc()
+        results.put(("error", e))
 
 
 def create_and_run_application():
     """
     Application Factory: Creates and wires up all layers, then runs the app.
     This is the main entry point that orchestrates the entire application.
+    The window appears first; the model loads or trains in the background
+    and the controller starts answering once it is ready.
     """
-    # 1. Initialize Data Layer
-    print("Initializing Data Layer...")
-    data_repository = ChatbotDataRepository()
+    timer = StartupTimer()
     
-    # 2. Initialize Model Layer
-    print("Initializing Model Layer...")
-    preprocessor = NLPPreprocessor()
-    ml_model = ChatbotMLModel(data_repository, preprocessor)
+    if METRICS_FILE:
+        print(f"Writing metrics to {METRICS_FILE}")
+        metrics.enable()
+        metrics.start_periodic_dump(METRICS_FILE, METRICS_INTERVAL_SECONDS)
     
-    # 3. Train the model
-    print("Training ML Model...")
-    model_accuracy = ml_model.train()
-    print(f"Model trained successfully! Accuracy: {model_accuracy:.2f}%")
-    
-    # 4. Initialize View Layer
+    # 1. Initialize View Layer in its loading state
     print("Initializing GUI...")
+    start = time.perf_counter()
     root = tk.Tk()
-    view = ChatbotView(root, model_accuracy)
+    view = ChatbotView(root)
     
-    # 5. Initialize Controller Layer (wires everything together)
+    # 2. Initialize Controller Layer (the model is attached when ready)
     print("Initializing Controller...")
-    controller = ChatbotController(view, ml_model)
+    controller = ChatbotController(view, None)
+    timer.record("GUI ready", start)
+    
+    # 3. Load or train the model on a background thread
+    print("Loading or training ML Model in the background...")
+    results = queue.Queue()
+    threading.Thread(
+        target=load_model_in_background,
+        args=(timer, results),
+        name="model-loader",
+        daemon=True
+    ).start()
+    
+    def poll_model():
+        # Drain the queue so training progress never delays a result, and
+        # keep polling for versions built later by the data watcher
+        while True:
+            try:
+                kind, payload = results.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "registry":
+                controller.attach_registry(payload)
+            elif kind == "progress":
+                view.set_status(f"Training epoch {payload['epoch']}/{payload['epochs']}: "
+                                f"{payload['samples_per_second']:,.0f} samples/s, "
+                                f"loss {payload['loss']:.3f}")
+                if payload["epoch_complete"]:
+                    print(f"[training] epoch {payload['epoch']}/{payload['epochs']}: "
+                          f"{payload['samples']} samples, "
+                          f"{payload['samples_per_second']:,.0f} samples/s, "
+                          f"loss {payload['loss']:.4f}")
+            elif kind == "ready":
+                first_model = controller.model is None
+                controller.attach_model(payload.model, payload.label)
+                if first_model:
+                    print(f"[startup] total: {time.perf_counter() - _PROCESS_START:.3f}s")
+            elif controller.model is None:
+                view.set_status("Model failed to load")
+                view.show_error("Model", f"Could not load the model:\n{payload}")
+            else:
+                view.set_status(f"Model reload failed, still using "
+                                f"{view.model_version}: {payload}")
+        root.after(MODEL_POLL_INTERVAL_MS, poll_model)
+    
+    root.after(MODEL_POLL_INTERVAL_MS, poll_model)
     
-    # 6. Run the application
+    # 4. Run the application
     print("Starting application...")
     print("-" * 50)
-    controller.run()
+    try:
+        controller.run()
+    finally:
+        # Writes a final snapshot when metrics are being dumped
+        metrics.stop_periodic_dump()
 
 
 if __name__ == "__main__":
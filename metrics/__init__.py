@@ -0,0 +1,10 @@
+"""
+Metrics Package
+Contains latency histograms and the process-wide metrics registry used to
+instrument the hot paths of the model, controller and view.
+"""
+
+from .histogram import LatencyHistogram
+from .registry import MetricsRegistry, metrics
+
+__all__ = ['LatencyHistogram', 'MetricsRegistry', 'metrics']
@@ -0,0 +1,123 @@
+"""
+Metrics: Latency histogram
+===========================
+This module contains the LatencyHistogram class, an HDR-style log-linear
+histogram with bounded relative error and constant-time recording.
+"""
+
+
+class LatencyHistogram:
+    """
+    Metrics: Records latencies in log-linear buckets (HDR histogram layout).
+    Values are whole microseconds. Every power-of-two range is split into
+    2**(precision_bits - 1) linear sub-buckets, so a reported percentile is
+    within about 2**-(precision_bits - 1) of the true value (1.6% by
+    default) while memory grows only with the log of the range recorded.
+    """
+
+    def __init__(self, precision_bits=7):
+        """
+        Initialize an empty histogram
+
+        Args:
+            precision_bits (int): Bits of each value kept exactly
+        """
+        if precision_bits < 2:
+            raise ValueError("precision_bits must be at least 2")
+
+        self.precision_bits = precision_bits
+        self._half = 1 << (precision_bits - 1)
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index(self, value):
+        """Bucket index of a value"""
+        shift = value.bit_length() - self.precision_bits
+        if shift <= 0:
+            return value
+        return self._half * shift + (value >> shift)
+
+    def _lower_bound(self, index):
+        """Smallest value falling in a bucket"""
+        if index < 2 * self._half:
+            return index
+        shift = index // self._half - 1
+        return (index - self._half * shift) << shift
+
+    def record(self, microseconds):
+        """
+        Record one latency
+
+        Args:
+            microseconds (int): Latency in microseconds
+        """
+        value = max(int(microseconds), 0)
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def percentile(self, percent):
+        """
+        Estimate a percentile
+
+        Args:
+            percent (float): Percentile in [0, 100]
+
+        Returns:
+            int or None: Latency in microseconds, None if empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                # Report the bucket's lower bound, clamped to what was seen
+                return min(max(self._lower_bound(index), self.min), self.max)
+        return self.max
+
+    def merge(self, other):
+        """Add the recordings of another histogram with the same precision"""
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms with different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def summary(self):
+        """
+        Summarize the histogram in milliseconds
+
+        Returns:
+            dict: Count, mean, min, p50/p90/p99/p999 and max
+        """
+        if not self.count:
+            return {"count": 0}
+
+        def ms(microseconds):
+            return microseconds / 1000.0
+
+        return {
+            "count": self.count,
+            "mean_ms": ms(self.total / self.count),
+            "min_ms": ms(self.min),
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p99_ms": ms(self.percentile(99)),
+            "p999_ms": ms(self.percentile(99.9)),
+            "max_ms": ms(self.max),
+        }
@@ -0,0 +1,201 @@
+"""
+Metrics: Registry
+==================
+This module contains the MetricsRegistry class which collects per-stage
+latency histograms and event counters, and the process-wide `metrics`
+instance the application is instrumented with. Collection is disabled by
+default; a disabled registry hands out a shared no-op timer so the
+instrumented hot paths pay only an attribute check.
+"""
+
+import json
+import threading
+import time
+
+from .histogram import LatencyHistogram
+
+
+class _NullTimer:
+    """Context manager that does nothing (used while metrics are disabled)"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _StageTimer:
+    """Context manager recording the time spent in its block"""
+
+    __slots__ = ("registry", "stage", "start")
+
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed_ns = time.perf_counter_ns() - self.start
+        self.registry.record(self.stage, elapsed_ns // 1000)
+        return False
+
+
+class MetricsRegistry:
+    """
+    Metrics: Thread-safe store of stage latencies and counters.
+    Stages are timed with `with registry.timer("stage"):` and counted
+    events with registry.increment("name").
+    """
+
+    def __init__(self, enabled=False):
+        """
+        Initialize the registry
+
+        Args:
+            enabled (bool): Start collecting immediately
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._counters = {}
+        self._started = time.time()
+
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def enable(self):
+        """Start collecting"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop collecting (recorded data is kept)"""
+        self.enabled = False
+
+    def timer(self, stage):
+        """
+        Time a block of code as one sample of a stage
+
+        Args:
+            stage (str): Stage name
+
+        Returns:
+            Context manager; a shared no-op one while disabled
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, stage)
+
+    def record(self, stage, microseconds):
+        """
+        Record one latency sample for a stage
+
+        Args:
+            stage (str): Stage name
+            microseconds (int): Latency in microseconds
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.record(microseconds)
+
+    def increment(self, name, amount=1):
+        """
+        Increase a counter
+
+        Args:
+            name (str): Counter name
+            amount (int): Increase
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def snapshot(self):
+        """
+        Return the current metrics
+
+        Returns:
+            dict: Timestamp, uptime, counters and a latency summary per stage
+        """
+        with self._lock:
+            stages = {name: histogram.summary()
+                      for name, histogram in sorted(self._histograms.items())}
+            counters = dict(sorted(self._counters.items()))
+        now = time.time()
+        return {
+            "timestamp": now,
+            "uptime_seconds": now - self._started,
+            "enabled": self.enabled,
+            "counters": counters,
+            "stages": stages,
+        }
+
+    def reset(self):
+        """Drop all recorded data"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+            self._started = time.time()
+
+    # ===== Periodic dump =====
+
+    def dump(self, file_path):
+        """Append the current snapshot to a JSON Lines file"""
+        line = json.dumps(self.snapshot())
+        with open(file_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def start_periodic_dump(self, file_path, interval_seconds=60.0):
+        """
+        Append a snapshot to a JSON Lines file every interval on a
+        background thread, and once more when stopped
+
+        Args:
+            file_path (str): Destination file
+            interval_seconds (float): Time between snapshots
+        """
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive")
+        self.stop_periodic_dump()
+        self._dump_stop.clear()
+
+        def run():
+            while not self._dump_stop.wait(interval_seconds):
+                self._dump_safely(file_path)
+            self._dump_safely(file_path)
+
+        self._dump_thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self):
+        """Stop the periodic dump thread, if running"""
+        if self._dump_thread is None:
+            return
+        self._dump_stop.set()
+        self._dump_thread.join()
+        self._dump_thread = None
+
+    def _dump_safely(self, file_path):
+        """Dump, logging instead of raising so the thread keeps running"""
+        try:
+            self.dump(file_path)
+        except OSError as e:
+            print(f"Error writing metrics to {file_path}: {e}")
+
+
+# Process-wide registry the application is instrumented with
+metrics = MetricsRegistry()
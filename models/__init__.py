@@ -1,8 +1,42 @@
 """
 Model Layer Package
 Contains NLP preprocessing and ML model components.
+
+Exports are imported lazily on first access, so importing this package does
+not pull in scikit-learn until a model class is actually used.
 """
 
-from .chatbot_model import NLPPreprocessor, ChatbotMLModel
+import importlib
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'NLPPreprocessor': '.preprocessing',
+    'ChatbotMLModel': '.chatbot_model',
+    'ModelArtifactStore': '.artifact_store',
+    'PredictionResult': '.prediction',
+    'PredictionCache': '.prediction_cache',
+    'ExactMatchIndex': '.exact_match_index',
+    'ClassifierBackend': '.backends',
+    'MLPBackend': '.backends',
+    'NearestNeighbourBackend': '.backends',
+    'CompiledInferenceEngine': '.compiled_engine',
+    'ModelSelector': '.model_selection',
+    'ModelRegistry': '.model_registry',
+    'ModelVersion': '.model_registry',
+    'ModelValidationError': '.model_registry',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
-__all__ = ['NLPPreprocessor', 'ChatbotMLModel']
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
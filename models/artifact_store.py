@@ -0,0 +1,154 @@
+"""
+Model Layer: Trained model persistence
+=======================================
+This module contains the ModelArtifactStore class which saves and loads
+fitted model components so the application can skip retraining at startup.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+
+
+class ModelArtifactStore:
+    """
+    Model Layer: Persists fitted model components to a versioned file.
+    Artifacts are keyed by a content hash of the training data and the
+    hyperparameters, so a stale artifact is never loaded.
+    """
+
+    # Bump whenever the layout of the saved payload changes
+    FORMAT_VERSION = 4
+
+    def __init__(self, artifact_path):
+        """
+        Initialize the store
+
+        Args:
+            artifact_path (str): File used to store the trained model
+        """
+        self.artifact_path = artifact_path
+
+    @classmethod
+    def compute_key(cls, texts, labels, hyperparameters):
+        """
+        Compute the content hash identifying a trained model
+
+        Args:
+            texts (list): Training texts
+            labels (list): Training labels
+            hyperparameters (dict): Settings that affect the fitted model
+
+        Returns:
+            str: Hex digest of the data, hyperparameters and format version
+        """
+        return cls.compute_stream_key(zip(texts, labels), hyperparameters)
+
+    @classmethod
+    def compute_stream_key(cls, examples, hyperparameters):
+        """
+        Compute the same key as compute_key() from a stream of examples,
+        without holding the training data in memory
+
+        Args:
+            examples (iterable of tuple): (text, label) pairs
+            hyperparameters (dict): Settings that affect the fitted model
+
+        Returns:
+            str: Hex digest of the data, hyperparameters and format version
+        """
+        return cls.extend_key(cls.start_key(hyperparameters), examples).hexdigest()
+
+    @classmethod
+    def start_key(cls, hyperparameters):
+        """
+        Start the hash behind compute_stream_key(), before any example
+
+        Args:
+            hyperparameters (dict): Settings that affect the fitted model
+
+        Returns:
+            hashlib object: Hash of the hyperparameters and format version,
+                to be passed to extend_key()
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format={cls.FORMAT_VERSION}\n".encode("utf-8"))
+        for name in sorted(hyperparameters):
+            digest.update(f"{name}={hyperparameters[name]!r}\n".encode("utf-8"))
+        return digest
+
+    @staticmethod
+    def extend_key(digest, examples):
+        """
+        Add examples to a hash started by start_key(). Extending the hash
+        with only the examples appended since its last hexdigest() gives
+        the key of the whole corpus without rehashing it.
+
+        Args:
+            digest (hashlib object): Hash to update in place
+            examples (iterable of tuple): (text, label) pairs
+
+        Returns:
+            hashlib object: digest
+        """
+        for text, label in examples:
+            # Separators keep ("ab", "c") and ("a", "bc") distinct
+            digest.update(f"{len(text)}:{text}\t{label}\n".encode("utf-8"))
+        return digest
+
+    def load(self, key):
+        """
+        Load the stored components if they were produced for the given key
+
+        Args:
+            key (str): Expected content hash
+
+        Returns:
+            dict or None: Stored components, or None if missing or stale
+        """
+        if not os.path.exists(self.artifact_path):
+            return None
+
+        try:
+            with open(self.artifact_path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception:
+            # A corrupt or incompatible artifact is treated as missing
+            return None
+
+        if not isinstance(payload, dict):
+            return None
+        if payload.get("format_version") != self.FORMAT_VERSION:
+            return None
+        if payload.get("key") != key:
+            return None
+        return payload["components"]
+
+    def save(self, key, components):
+        """
+        Save fitted components under the given key.
+        The file is written atomically so a crash never leaves a partial artifact.
+
+        Args:
+            key (str): Content hash of the data and hyperparameters
+            components (dict): Fitted components to store
+        """
+        payload = {
+            "format_version": self.FORMAT_VERSION,
+            "key": key,
+            "components": components,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.artifact_path))
+        os.makedirs(directory, exist_ok=True)
+
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.artifact_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
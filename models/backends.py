@@ -0,0 +1,376 @@
+"""
+Model Layer: Classifier backends
+=================================
+This module contains the interchangeable intent classifiers used by
+ChatbotMLModel on top of its TF-IDF features: the MLP neural network and a
+retraining-free cosine nearest-neighbour engine.
+"""
+
+import copy
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import LabelBinarizer, normalize
+
+
+class ClassifierBackend:
+    """
+    Model Layer: Interface for intent classifiers over sparse features.
+    Backends are fitted on encoded labels and expose classes_ (the encoded
+    label of each score column) and predict_proba().
+    """
+
+    # Name used to select the backend in configuration
+    name = None
+
+    # True when fitting stores every row, so partial_fit() must only be
+    # given rows the backend has not seen (replaying earlier ones would
+    # store them again)
+    stores_rows = False
+
+    def fit(self, X, y):
+        """
+        Fit the backend
+
+        Args:
+            X (scipy.sparse.csr_matrix): Feature matrix (one row per pattern)
+            y (numpy.ndarray): Encoded intent labels
+
+        Returns:
+            ClassifierBackend: self
+        """
+        raise NotImplementedError
+
+    def predict_proba(self, X):
+        """
+        Score every intent for each row of X
+
+        Args:
+            X (scipy.sparse.csr_matrix): Feature matrix
+
+        Returns:
+            numpy.ndarray: (n_rows, n_classes) scores in [0, 1]
+        """
+        raise NotImplementedError
+
+    def score(self, X, y):
+        """Return the mean accuracy of the top-scored intent on X"""
+        predicted = self.classes_[self.predict_proba(X).argmax(axis=1)]
+        return float(np.mean(predicted == y))
+    
+    # ===== Incremental updates =====
+    
+    def remap_classes(self, old_to_new, n_classes):
+        """
+        Renumber the encoded labels after new intents were added to the
+        label encoder (new intents get scores once trained on)
+        
+        Args:
+            old_to_new (numpy.ndarray): New code of each old encoded label
+            n_classes (int): Number of encoded labels after the change
+        """
+        raise NotImplementedError
+    
+    def add_features(self, n_features):
+        """
+        Widen the input to n_features columns (new trailing columns are
+        vocabulary terms the backend has not seen yet)
+        
+        Args:
+            n_features (int): New number of feature columns
+        """
+        raise NotImplementedError
+    
+    def partial_fit(self, X, y, epochs=1, classes=None):
+        """
+        Continue fitting from the current state on new (and replayed) rows
+        
+        Args:
+            X (scipy.sparse.csr_matrix): Feature matrix
+            y (numpy.ndarray): Encoded intent labels
+            epochs (int): Passes over X
+            classes (numpy.ndarray, optional): Every encoded label; needed
+                when an unfitted backend is trained in chunks
+        
+        Returns:
+            ClassifierBackend: self
+        """
+        raise NotImplementedError
+    
+    def snapshot(self):
+        """
+        Capture the state that partial_fit(), remap_classes() and
+        add_features() change, so an update can be undone
+        
+        Returns:
+            object: State for restore()
+        """
+        return copy.deepcopy(self.__dict__)
+    
+    def restore(self, state):
+        """Return to a state captured by snapshot()"""
+        self.__dict__.update(state)
+
+
+class MLPBackend(ClassifierBackend):
+    """
+    Model Layer: Multi-layer perceptron (scikit-learn MLPClassifier).
+    Scores are class probabilities.
+    """
+
+    name = "mlp"
+
+    def __init__(self, **params):
+        """
+        Initialize the backend
+
+        Args:
+            **params: MLPClassifier hyperparameters
+        """
+        self.estimator = MLPClassifier(**params)
+
+    @property
+    def classes_(self):
+        return self.estimator.classes_
+
+    def fit(self, X, y):
+        self.estimator.fit(X, y)
+        return self
+
+    def predict_proba(self, X):
+        return self.estimator.predict_proba(X)
+    
+    def remap_classes(self, old_to_new, n_classes):
+        estimator = self.estimator
+        coef, bias = estimator.coefs_[-1], estimator.intercepts_[-1]
+        if estimator.out_activation_ == "logistic":
+            # A binary model has one logistic unit; softmax over (0, z)
+            # gives the same probabilities, so make it two softmax units
+            coef = np.hstack([np.zeros_like(coef), coef])
+            bias = np.concatenate([np.zeros_like(bias), bias])
+        
+        # New output units start like a fresh fit (Glorot uniform)
+        rng = np.random.default_rng(estimator.random_state)
+        bound = np.sqrt(6.0 / (coef.shape[0] + n_classes))
+        new_coef = rng.uniform(-bound, bound, (coef.shape[0], n_classes)).astype(coef.dtype)
+        new_bias = rng.uniform(-bound, bound, n_classes).astype(bias.dtype)
+        new_coef[:, old_to_new] = coef
+        new_bias[old_to_new] = bias
+        
+        estimator.coefs_[-1] = new_coef
+        estimator.intercepts_[-1] = new_bias
+        estimator.out_activation_ = "softmax"
+        estimator.n_outputs_ = n_classes
+        estimator.classes_ = np.arange(n_classes)
+        estimator._label_binarizer = LabelBinarizer().fit(estimator.classes_)
+        self._reset_optimizer()
+    
+    def add_features(self, n_features):
+        estimator = self.estimator
+        coef = estimator.coefs_[0]
+        # Zero weights: unseen terms change nothing until trained on
+        padding = np.zeros((n_features - coef.shape[0], coef.shape[1]), dtype=coef.dtype)
+        estimator.coefs_[0] = np.vstack([coef, padding])
+        estimator.n_features_in_ = n_features
+        self._reset_optimizer()
+    
+    def partial_fit(self, X, y, epochs=1, classes=None):
+        for _ in range(epochs):
+            self.estimator.partial_fit(X, y, classes=classes)
+        return self
+    
+    @property
+    def loss_(self):
+        """Training loss of the last fit or partial_fit() pass"""
+        return self.estimator.loss_
+    
+    def _reset_optimizer(self):
+        """Drop optimizer state whose shapes no longer match the weights"""
+        if hasattr(self.estimator, "_optimizer"):
+            del self.estimator._optimizer
+
+
+class NearestNeighbourBackend(ClassifierBackend):
+    """
+    Model Layer: Cosine nearest-neighbour retrieval over stored patterns.
+    Fitting only stores the L2-normalized pattern matrix, so no training
+    run is needed when data changes. A query's score for an intent is its
+    highest cosine similarity among the intent's patterns in the top-k
+    neighbours, so scores do not sum to one.
+    Patterns are stored in segments: partial_fit() appends a segment and
+    merges it into the one before while it is at least half that size, so
+    there are O(log n) segments and adding rows never re-indexes them all.
+    """
+
+    name = "nearest_neighbour"
+    stores_rows = True
+
+    # predict_proba() scores at most MAX_QUERY_BLOCK queries at a time, and
+    # fewer when the block could hold more than MAX_BLOCK_SIMILARITIES
+    # query-pattern similarities
+    MAX_QUERY_BLOCK = 1024
+    MAX_BLOCK_SIMILARITIES = 2 ** 22
+
+    def __init__(self, top_k=5, use_inverted_index=True):
+        """
+        Initialize the backend
+
+        Args:
+            top_k (int): Neighbours considered per query
+            use_inverted_index (bool): Score only patterns that share at
+                least one term with the query, found through a
+                term -> patterns index
+        """
+        if top_k < 1:
+            raise ValueError("top_k must be at least 1")
+
+        self.top_k = top_k
+        self.use_inverted_index = use_inverted_index
+        self.classes_ = None
+        # (patterns CSR, postings CSC or None) per segment, in row order
+        self._segments = []
+        # Score column of every stored pattern; the buffer grows by doubling
+        # and only its first n_patterns entries are used
+        self._label_buffer = np.empty(0, dtype=np.intp)
+        self.n_patterns = 0
+
+    @property
+    def _labels(self):
+        return self._label_buffer[:self.n_patterns]
+
+    def fit(self, X, y):
+        self.classes_ = np.unique(y)
+        self._label_buffer = np.searchsorted(self.classes_, y)
+        self.n_patterns = len(y)
+        self._segments = [self._make_segment(normalize(X.tocsr(), norm="l2", copy=True))]
+        return self
+
+    def _make_segment(self, patterns):
+        """Pair normalized patterns with their term -> patterns index"""
+        # CSC columns are the posting lists: rows containing each term
+        postings = patterns.tocsc() if self.use_inverted_index else None
+        return patterns, postings
+
+    def predict_proba(self, X):
+        queries = normalize(X.tocsr(), norm="l2", copy=True)
+        scores = np.zeros((queries.shape[0], len(self.classes_)))
+
+        if self.use_inverted_index:
+            # The transposed CSC postings are a CSR term -> patterns matrix,
+            # so a product only reads the posting lists of the query terms
+            terms_to_patterns = [postings.T for _, postings in self._segments]
+        else:
+            terms_to_patterns = [patterns.T.tocsr() for patterns, _ in self._segments]
+
+        # Queries are scored in blocks so a large batch (e.g. scoring the
+        # training set) never builds a queries x patterns product
+        block_size = max(1, min(self.MAX_QUERY_BLOCK,
+                                self.MAX_BLOCK_SIMILARITIES // max(self.n_patterns, 1)))
+        labels = self._labels
+        for start in range(0, queries.shape[0], block_size):
+            block = queries[start:start + block_size]
+            # Segment columns follow each other, so columns are pattern rows
+            similarities = sp.hstack([block @ matrix for matrix in terms_to_patterns],
+                                     format="csr")
+            for offset in range(similarities.shape[0]):
+                begin, end = similarities.indptr[offset], similarities.indptr[offset + 1]
+                self._accumulate(scores[start + offset], labels,
+                                 similarities.indices[begin:end],
+                                 similarities.data[begin:end])
+
+        return scores
+
+    def remap_classes(self, old_to_new, n_classes):
+        # Labels index classes_, whose order the remap keeps
+        self.classes_ = old_to_new[self.classes_]
+    
+    def add_features(self, n_features):
+        # New trailing columns are empty: reshape without copying entries
+        segments = []
+        for patterns, postings in self._segments:
+            patterns = sp.csr_matrix((patterns.data, patterns.indices, patterns.indptr),
+                                     shape=(patterns.shape[0], n_features))
+            if postings is not None:
+                extra = n_features - postings.shape[1]
+                indptr = np.concatenate([postings.indptr,
+                                         np.full(extra, postings.indptr[-1],
+                                                 dtype=postings.indptr.dtype)])
+                postings = sp.csc_matrix((postings.data, postings.indices, indptr),
+                                         shape=(postings.shape[0], n_features))
+            segments.append((patterns, postings))
+        self._segments = segments
+    
+    def partial_fit(self, X, y, epochs=1, classes=None):
+        # Storing the rows is the whole fit, so epochs does not matter.
+        # New intents get columns after the existing ones, so the labels
+        # already stored stay valid
+        new_classes = np.setdiff1d(y, self.classes_)
+        if len(new_classes):
+            self.classes_ = np.concatenate([self.classes_, new_classes])
+        order = np.argsort(self.classes_)
+        self._append_labels(order[np.searchsorted(self.classes_[order], y)])
+
+        segments = self._segments + [self._make_segment(normalize(X.tocsr(), norm="l2", copy=True))]
+        while len(segments) > 1 and 2 * segments[-1][0].shape[0] >= segments[-2][0].shape[0]:
+            last = segments.pop()
+            previous = segments.pop()
+            segments.append(self._make_segment(sp.vstack([previous[0], last[0]], format="csr")))
+        self._segments = segments
+        return self
+
+    def _append_labels(self, labels):
+        """Store the score columns of new rows, growing the buffer by doubling"""
+        needed = self.n_patterns + len(labels)
+        if needed > len(self._label_buffer):
+            buffer = np.empty(max(needed, 2 * len(self._label_buffer)), dtype=np.intp)
+            buffer[:self.n_patterns] = self._labels
+            self._label_buffer = buffer
+        self._label_buffer[self.n_patterns:needed] = labels
+        self.n_patterns = needed
+
+    def snapshot(self):
+        # Segments are replaced, never modified, and the labels of stored
+        # rows are never overwritten, so references are enough
+        return self._segments, self.classes_, self._label_buffer, self.n_patterns
+
+    def restore(self, state):
+        self._segments, self.classes_, self._label_buffer, self.n_patterns = state
+
+    def __getstate__(self):
+        # Drop the unused part of the label buffer
+        state = self.__dict__.copy()
+        state["_label_buffer"] = self._labels.copy()
+        return state
+
+    def _accumulate(self, class_scores, labels, rows, similarities):
+        """Fold the top-k neighbours into per-intent scores (max per intent)"""
+        if len(similarities) > self.top_k:
+            top = np.argpartition(similarities, -self.top_k)[-self.top_k:]
+            rows, similarities = rows[top], similarities[top]
+        np.maximum.at(class_scores, labels[rows], similarities)
+
+
+# Backend name -> class, used to select a backend by configuration
+CLASSIFIER_BACKENDS = {
+    MLPBackend.name: MLPBackend,
+    NearestNeighbourBackend.name: NearestNeighbourBackend,
+}
+
+
+def create_backend(name, params):
+    """
+    Create a classifier backend by name
+
+    Args:
+        name (str): Key of CLASSIFIER_BACKENDS
+        params (dict): Keyword arguments for the backend
+
+    Returns:
+        ClassifierBackend: Unfitted backend
+    """
+    try:
+        backend_class = CLASSIFIER_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown classifier backend: {name}")
+    return backend_class(**params)
@@ -1,62 +1,191 @@
 """
 Model Layer: NLP preprocessing and ML model
 ============================================
-This module contains the NLP preprocessing logic and the machine learning
-model for intent classification and response generation.
+This module contains the machine learning model for intent classification
+and response generation. NLP preprocessing lives in models.preprocessing and
+is re-exported here.
 """
 
-import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.neural_network import MLPClassifier
+import hashlib
+import inspect
+import pickle
+import threading
+import time
+import tracemalloc
+from itertools import islice
+
+import numpy as np
+from sklearn.base import clone
 from sklearn.preprocessing import LabelEncoder
 
+from metrics import metrics
+from .artifact_store import ModelArtifactStore
+from .backends import CLASSIFIER_BACKENDS, create_backend
+from .exact_match_index import ExactMatchIndex
+from .prediction import PredictionResult
+from .preprocessing import NLPPreprocessor
+from .vectorizers import create_vectorizer
 
-class NLPPreprocessor:
-    """
-    Model Layer: Handles text preprocessing for NLP tasks.
-    Responsible for cleaning and normalizing input text.
-    """
-    
-    @staticmethod
-    def preprocess(text):
-        """
-        Basic text preprocessing: lowercase + remove extra chars
-        
-        Args:
-            text (str): Raw input text
-            
-        Returns:
-            str: Cleaned and normalized text
-        """
-        text = text.lower().strip()
-        text = re.sub(r"[^a-z0-9\s]", "", text)  # remove punctuation
-        return text
+# Streaming training defaults: one partial_fit() pass makes one optimizer
+# step per minibatch, so each chunk is fitted until it has given at least
+# STREAMING_MIN_STEPS steps (and STREAMING_MIN_PASSES passes), with a higher
+# learning rate than the MLP default (0.001) unless one is configured
+STREAMING_MIN_PASSES = 2
+STREAMING_MIN_STEPS = 8
+STREAMING_LEARNING_RATE = 0.01
+
+# Training patterns scored for the training accuracy of backends that store
+# every row (they look each pattern up among all of them)
+STORED_ROWS_SCORE_SAMPLE = 2000
 
 
 class ChatbotMLModel:
     """
     Model Layer: Manages ML model training and prediction.
-    Encapsulates TF-IDF vectorization, label encoding, and neural network.
+    Encapsulates TF-IDF vectorization, label encoding, and the intent
+    classifier backend (the MLP neural network by default).
     """
     
-    def __init__(self, data_repository, preprocessor):
+    def __init__(self, data_repository, preprocessor, artifact_store=None,
+                 prediction_cache=None, exact_match_index=None):
         """
         Initialize the ML model with data and preprocessor
         
         Args:
             data_repository (ChatbotDataRepository): Data source
             preprocessor (NLPPreprocessor): Text preprocessor
+            artifact_store (ModelArtifactStore, optional): Where the trained
+                model is persisted between runs
+            prediction_cache (PredictionCache, optional): Cache of intent
+                decisions keyed on preprocessed text
+            exact_match_index (ExactMatchIndex, optional): Fast path for
+                queries matching a training pattern; defaults to an
+                "exact" index
         """
         self.data_repository = data_repository
         self.preprocessor = preprocessor
+        self.artifact_store = artifact_store
+        self.prediction_cache = prediction_cache
+        self.exact_match_index = (exact_match_index if exact_match_index is not None
+                                  else ExactMatchIndex())
         
-        # ML components
-        self.vectorizer = TfidfVectorizer()
+        # ML components (the vectorizer is created by train())
+        self.vectorizer = None
         self.label_encoder = LabelEncoder()
         self.classifier = None
+        self._intent_lookup = None
         self.model_accuracy = 0.0
         self.confidence_threshold = 0.5
         
+        # Repository examples the model has been fitted on (see update()) and
+        # the TF-IDF document frequencies needed to extend the vocabulary
+        self._trained_count = 0
+        self._document_frequency = None
+        
+        # Artifact key hash of the fitted examples, extended by update() so
+        # the corpus is not rehashed, and the artifact save update() runs in
+        # the background
+        self._key_digest = None
+        self._save_thread = None
+        self._save_error = None
+        
+        # Worker processes for batch preprocessing (None = in-process)
+        self.preprocess_processes = None
+        
+        # Feature extraction: "tfidf" (vocabulary) or "hashing" (fixed width)
+        self.vectorizer_mode = "tfidf"
+        self.hashing_parameters = {
+            "n_features": 2 ** 14,
+            "use_idf": True,
+        }
+        # TfidfVectorizer settings for the "tfidf" mode (defaults when empty)
+        self.tfidf_parameters = {}
+        
+        # Classifier backend: "mlp" or "nearest_neighbour" (see models.backends)
+        self.backend = "mlp"
+        
+        # Neural network hyperparameters (part of the artifact key)
+        self.hyperparameters = {
+            "hidden_layer_sizes": (16, 8),
+            "activation": "relu",
+            "solver": "adam",
+            "max_iter": 500,
+            "random_state": 42,
+        }
+        
+        # Nearest-neighbour settings (part of the artifact key)
+        self.neighbour_parameters = {
+            "top_k": 5,
+            "use_inverted_index": True,
+        }
+
+    def configure(self, config):
+        """
+        Apply tunable settings, e.g. the configuration chosen by
+        models.model_selection. Call before train() or load_or_train();
+        settings missing from config keep their current values.
+
+        Args:
+            config (dict): Any of hidden_layer_sizes, alpha, max_iter,
+                confidence_threshold, vectorizer (a dict with "mode"
+                plus TF-IDF or hashing settings), backend (a key of
+                CLASSIFIER_BACKENDS) and neighbour_parameters
+        """
+        if "backend" in config:
+            if config["backend"] not in CLASSIFIER_BACKENDS:
+                raise ValueError(f"Unknown classifier backend: {config['backend']}")
+            self.backend = config["backend"]
+
+        if "neighbour_parameters" in config:
+            unknown = set(config["neighbour_parameters"]) - set(self.neighbour_parameters)
+            if unknown:
+                raise ValueError(f"Unknown neighbour parameters: {', '.join(sorted(unknown))}")
+            self.neighbour_parameters.update(config["neighbour_parameters"])
+
+        for name in ("hidden_layer_sizes", "alpha", "max_iter"):
+            if name in config:
+                value = config[name]
+                # JSON has no tuples; the artifact key needs a stable type
+                self.hyperparameters[name] = tuple(value) if isinstance(value, list) else value
+
+        if "confidence_threshold" in config:
+            self.confidence_threshold = float(config["confidence_threshold"])
+
+        if "vectorizer" in config:
+            settings = dict(config["vectorizer"])
+            mode = settings.pop("mode", self.vectorizer_mode)
+            if "ngram_range" in settings:
+                settings["ngram_range"] = tuple(settings["ngram_range"])
+            self.vectorizer_mode = mode
+            if mode == "hashing":
+                self.hashing_parameters.update(settings)
+            else:
+                self.tfidf_parameters = settings
+
+    def get_config(self):
+        """
+        Get the tunable settings in the form accepted by configure()
+
+        Returns:
+            dict: JSON-serializable configuration
+        """
+        vectorizer = {"mode": self.vectorizer_mode}
+        if self.vectorizer_mode == "hashing":
+            vectorizer.update(self.hashing_parameters)
+        else:
+            vectorizer.update(self.tfidf_parameters)
+        if "ngram_range" in vectorizer:
+            vectorizer["ngram_range"] = list(vectorizer["ngram_range"])
+        return {
+            "hidden_layer_sizes": list(self.hyperparameters["hidden_layer_sizes"]),
+            "alpha": self.hyperparameters.get("alpha", 0.0001),
+            "max_iter": self.hyperparameters["max_iter"],
+            "confidence_threshold": self.confidence_threshold,
+            "vectorizer": vectorizer,
+            "backend": self.backend,
+            "neighbour_parameters": dict(self.neighbour_parameters),
+        }
+
     def train(self):
         """
         Train the chatbot model using data from repository.
@@ -65,33 +194,611 @@ class ChatbotMLModel:
         Returns:
             float: Training accuracy percentage
         """
+        self.wait_for_save()
+        self._key_digest = None
+        with metrics.timer("train"):
+            return self._train()
+    
+    def _train(self):
+        """Body of train(), timed as a whole and per step"""
         # Get training data
         X, y = self.data_repository.get_training_data()
         
         # Preprocess training texts
-        X_clean = [self.preprocessor.preprocess(text) for text in X]
+        with metrics.timer("train_preprocess"):
+            X_clean = list(self.preprocessor.preprocess_batch(
+                X, processes=self.preprocess_processes
+            ))
         
-        # TF-IDF vectorization
-        X_vectorized = self.vectorizer.fit_transform(X_clean).toarray()
+        # TF-IDF vectorization (kept as a sparse CSR matrix; the
+        # classifier accepts it directly)
+        self.vectorizer = create_vectorizer(self.vectorizer_mode, self.hashing_parameters,
+                                            self.tfidf_parameters)
+        with metrics.timer("train_vectorize"):
+            X_vectorized = self.vectorizer.fit_transform(X_clean).tocsr()
         
         # Encode labels
         y_encoded = self.label_encoder.fit_transform(y)
         
-        # Initialize and train MLPClassifier (Neural Network)
-        self.classifier = MLPClassifier(
-            hidden_layer_sizes=(16, 8),
-            activation='relu',
-            solver='adam',
-            max_iter=500,
-            random_state=42
-        )
-        self.classifier.fit(X_vectorized, y_encoded)
+        # Initialize and train the classifier backend
+        self.classifier = self._create_classifier()
+        with metrics.timer("train_fit"):
+            self.classifier.fit(X_vectorized, y_encoded)
+        self._build_intent_lookup()
+        self._invalidate_cache()
+        
+        # Index the training patterns for the exact-match fast path
+        self.exact_match_index.build(X_clean, y)
         
-        # Calculate training accuracy
+        # Remember what was fitted so update() can add to it
+        self._trained_count = len(X)
+        self._document_frequency = self._count_documents(X_vectorized)
+        
+        # Calculate training accuracy (on a sample for storing backends,
+        # where it costs a lookup among all patterns per pattern)
+        if self.classifier.stores_rows and len(y_encoded) > STORED_ROWS_SCORE_SAMPLE:
+            rng = np.random.default_rng(self.hyperparameters.get("random_state"))
+            sample = rng.choice(len(y_encoded), STORED_ROWS_SCORE_SAMPLE, replace=False)
+            X_vectorized, y_encoded = X_vectorized[sample], y_encoded[sample]
         self.model_accuracy = self.classifier.score(X_vectorized, y_encoded) * 100
         
         return self.model_accuracy
     
+    def load_or_train(self, streaming=None):
+        """
+        Load the persisted model if it matches the current data and
+        hyperparameters, otherwise train and persist a fresh one.
+        
+        Args:
+            streaming (dict, optional): train_streaming() options; when
+                given the model is trained out of core and the data is
+                hashed as a stream instead of being loaded into memory
+        
+        Returns:
+            float: Training accuracy percentage (progressive accuracy for
+                streaming training)
+        """
+        # An earlier update() must not overwrite the artifact afterwards
+        self.wait_for_save()
+        if streaming is None:
+            fit = self.train
+        else:
+            fit = lambda: self.train_streaming(**streaming)
+        if self.artifact_store is None:
+            return fit()
+        
+        settings = self._artifact_hyperparameters()
+        if streaming is not None:
+            # Every train_streaming() option, defaults included, so changing
+            # e.g. chunk_size or epochs retrains
+            options = inspect.signature(type(self).train_streaming).bind(self, **streaming)
+            options.apply_defaults()
+            options = dict(options.arguments)
+            del options["self"], options["progress_callback"]
+            vectorizer = options.pop("vectorizer")
+            settings.update(("streaming_" + name, value) for name, value in options.items())
+            if vectorizer is not None:
+                # A fitted vectorizer's repr leaves out what it learned
+                settings["streaming_vectorizer"] = hashlib.sha256(
+                    pickle.dumps(vectorizer, protocol=pickle.HIGHEST_PROTOCOL)
+                ).hexdigest()
+            settings["streaming_defaults"] = (STREAMING_MIN_PASSES, STREAMING_MIN_STEPS,
+                                              STREAMING_LEARNING_RATE)
+        count = [0]
+        
+        def counted(examples):
+            for example in examples:
+                count[0] += 1
+                yield example
+        
+        digest = ModelArtifactStore.extend_key(ModelArtifactStore.start_key(settings),
+                                               counted(self._iter_training_examples()))
+        key = digest.hexdigest()
+        
+        components = self.artifact_store.load(key)
+        if components is not None:
+            self._set_components(components)
+            self._trained_count = count[0]
+            self._document_frequency = None  # recounted if update() needs it
+            accuracy = self.model_accuracy
+        else:
+            accuracy = fit()
+            self.artifact_store.save(key, self._get_components())
+        self._key_digest = digest
+        return accuracy
+    
+    def _create_classifier(self):
+        """Create an unfitted classifier for the configured backend"""
+        if self.backend == "mlp":
+            return create_backend("mlp", self.hyperparameters)
+        return create_backend(self.backend, self.neighbour_parameters)
+    
+    def _artifact_hyperparameters(self):
+        """Settings that change the fitted model and so invalidate artifacts"""
+        settings = dict(self.hyperparameters)
+        settings["backend"] = self.backend
+        settings["neighbour_parameters"] = sorted(self.neighbour_parameters.items())
+        vectorizer = create_vectorizer(self.vectorizer_mode, self.hashing_parameters,
+                                       self.tfidf_parameters)
+        settings["vectorizer"] = sorted(vectorizer.get_params().items())
+        settings["preprocessor"] = self.preprocessor.get_config()
+        settings["exact_match"] = self.exact_match_index.mode
+        return settings
+    
+    def _get_components(self):
+        """Collect the fitted components for persistence"""
+        return {
+            "vectorizer": self.vectorizer,
+            "label_encoder": self.label_encoder,
+            "classifier": self.classifier,
+            "model_accuracy": self.model_accuracy,
+            "exact_match_index": self.exact_match_index,
+        }
+    
+    def _set_components(self, components):
+        """Restore fitted components loaded from an artifact"""
+        self.vectorizer = components["vectorizer"]
+        self.label_encoder = components["label_encoder"]
+        self.classifier = components["classifier"]
+        self.model_accuracy = components["model_accuracy"]
+        self.exact_match_index = components["exact_match_index"]
+        self._build_intent_lookup()
+        self._invalidate_cache()
+    
+    def _build_intent_lookup(self):
+        """Precompute intent names indexed by probability column"""
+        self._intent_lookup = self.label_encoder.classes_[
+            self.classifier.classes_
+        ].astype(object)
+    
+    def _invalidate_cache(self):
+        """Drop cached decisions made by a previous model"""
+        if self.prediction_cache is not None:
+            self.prediction_cache.clear()
+    
+    # ===== Out-of-core training =====
+    
+    def train_streaming(self, chunk_size=10000, epochs=5, shuffle_buffer=None,
+                        vectorizer=None, progress_callback=None, passes_per_chunk=None):
+        """
+        Train from the repository's example stream in chunks, so neither the
+        corpus nor its feature matrix is ever held in memory at once. Each
+        chunk is preprocessed, vectorized and passed to the classifier's
+        partial_fit() for several passes; every epoch re-reads the stream.
+        Unless hyperparameters sets learning_rate_init, the MLP learns at
+        STREAMING_LEARNING_RATE to make up for taking far fewer optimizer
+        steps than train(). Corpora of a few dozen patterns are better
+        served by train().
+        
+        Features come from the stateless hashing vectorizer (its IDF
+        weights, if enabled, are counted in a first pass) or from a given
+        pre-fitted vectorizer. Examples are shuffled within a bounded buffer,
+        so data sorted by intent needs a buffer spanning several intents.
+        The exact-match index still grows with the number of patterns.
+        
+        Args:
+            chunk_size (int): Examples per partial_fit() call
+            epochs (int): Passes over the data
+            shuffle_buffer (int, optional): Examples held for shuffling;
+                defaults to four chunks
+            vectorizer (optional): Fitted vectorizer to use instead of the
+                hashing vectorizer (required for vectorizer_mode "tfidf")
+            progress_callback (callable, optional): Called after every
+                chunk with a dict of epoch, epochs, samples,
+                samples_per_second, loss and epoch_complete
+            passes_per_chunk (int, optional): partial_fit() passes over
+                each chunk; by default enough for STREAMING_MIN_STEPS
+                minibatch steps, and at least STREAMING_MIN_PASSES
+        
+        Returns:
+            float: Progressive accuracy percentage of the last epoch (each
+                chunk is scored before the model trains on it)
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        if epochs < 1:
+            raise ValueError("epochs must be at least 1")
+        if passes_per_chunk is not None and passes_per_chunk < 1:
+            raise ValueError("passes_per_chunk must be at least 1")
+        if self.backend != "mlp":
+            raise ValueError("Streaming training needs the mlp backend")
+        if vectorizer is None and self.vectorizer_mode != "hashing":
+            raise ValueError("Streaming training needs vectorizer_mode 'hashing' "
+                             "or a pre-fitted vectorizer")
+        
+        self.wait_for_save()
+        self._key_digest = None
+        with metrics.timer("train_streaming"):
+            return self._train_streaming(chunk_size, epochs, shuffle_buffer or 4 * chunk_size,
+                                         vectorizer, progress_callback, passes_per_chunk)
+    
+    def _train_streaming(self, chunk_size, epochs, shuffle_buffer, vectorizer, progress_callback,
+                         passes_per_chunk):
+        """Body of train_streaming()"""
+        rng = np.random.default_rng(self.hyperparameters.get("random_state"))
+        idf_stage = None
+        if vectorizer is None:
+            vectorizer = create_vectorizer("hashing", self.hashing_parameters)
+            if hasattr(vectorizer, "steps"):
+                # Hashing with IDF: the hasher is stateless, the IDF is counted
+                hasher, idf_stage = vectorizer.steps[0][1], vectorizer.steps[1][1]
+        
+        # First pass: the label set, the example count and document frequencies
+        labels = set()
+        n_examples = 0
+        df = None
+        for chunk_texts, chunk_labels in self._iter_chunks(chunk_size):
+            labels.update(chunk_labels)
+            n_examples += len(chunk_labels)
+            if idf_stage is not None:
+                X_hashed = hasher.transform(self._preprocess_chunk(chunk_texts))
+                counts = np.bincount(X_hashed.indices, minlength=X_hashed.shape[1])
+                df = counts if df is None else df + counts
+        if n_examples == 0:
+            raise ValueError("The data repository has no training examples")
+        if idf_stage is not None:
+            # Same formula as TfidfTransformer.fit()
+            smooth = int(idf_stage.smooth_idf)
+            idf_stage.idf_ = np.log((n_examples + smooth) / (df + smooth)) + 1
+            idf_stage.n_features_in_ = len(df)
+        
+        self.vectorizer = vectorizer
+        self.label_encoder.fit(sorted(labels))
+        classes = np.arange(len(self.label_encoder.classes_))
+        parameters = dict(self.hyperparameters)
+        parameters.setdefault("learning_rate_init", STREAMING_LEARNING_RATE)
+        self.classifier = create_backend("mlp", parameters)
+        self.exact_match_index.build([], [])
+        
+        fitted = False
+        for epoch in range(1, epochs + 1):
+            start = time.perf_counter()
+            seen = 0
+            loss_sum = 0.0
+            scored = 0
+            correct = 0
+            for chunk_texts, chunk_labels in self._shuffled_chunks(chunk_size, shuffle_buffer, rng):
+                processed = self._preprocess_chunk(chunk_texts)
+                X_chunk = vectorizer.transform(processed)
+                y_chunk = self.label_encoder.transform(chunk_labels)
+                
+                if epoch == epochs and fitted:
+                    # Progressive validation: score before training on it
+                    best = self.classifier.predict_proba(X_chunk).argmax(axis=1)
+                    correct += int(np.sum(self.classifier.classes_[best] == y_chunk))
+                    scored += len(y_chunk)
+                
+                passes = passes_per_chunk or self._streaming_passes(len(y_chunk))
+                self.classifier.partial_fit(X_chunk, y_chunk, passes, classes=classes)
+                fitted = True
+                if epoch == 1:
+                    self.exact_match_index.add(processed, chunk_labels)
+                
+                seen += len(y_chunk)
+                loss_sum += self.classifier.loss_ * len(y_chunk)
+                if progress_callback is not None:
+                    progress_callback(self._streaming_progress(
+                        epoch, epochs, seen, start, loss_sum, False))
+            
+            if progress_callback is not None:
+                progress_callback(self._streaming_progress(epoch, epochs, seen, start,
+                                                           loss_sum, True))
+        
+        self._build_intent_lookup()
+        self._invalidate_cache()
+        self._trained_count = n_examples
+        self._document_frequency = None  # recounted if update() needs it
+        self.model_accuracy = correct / scored * 100 if scored else 0.0
+        return self.model_accuracy
+    
+    def _streaming_passes(self, n_rows):
+        """Default partial_fit() passes over a chunk of n_rows examples"""
+        # MLPClassifier's "auto" batch size is min(200, n_samples)
+        batch_size = self.hyperparameters.get("batch_size", "auto")
+        batch_size = min(200 if batch_size == "auto" else batch_size, n_rows)
+        steps_per_pass = -(-n_rows // batch_size)
+        return max(STREAMING_MIN_PASSES, -(-STREAMING_MIN_STEPS // steps_per_pass))
+    
+    @staticmethod
+    def _streaming_progress(epoch, epochs, seen, start, loss_sum, epoch_complete):
+        """Progress report passed to train_streaming() callbacks"""
+        elapsed = time.perf_counter() - start
+        return {
+            "epoch": epoch,
+            "epochs": epochs,
+            "samples": seen,
+            "samples_per_second": seen / elapsed if elapsed else 0.0,
+            "loss": float(loss_sum / seen) if seen else 0.0,
+            "epoch_complete": epoch_complete,
+        }
+    
+    def _iter_training_examples(self):
+        """(text, label) pairs from the repository, streamed when supported"""
+        iter_training_data = getattr(self.data_repository, "iter_training_data", None)
+        if iter_training_data is not None:
+            return iter_training_data()
+        return zip(*self.data_repository.get_training_data())
+    
+    def _iter_chunks(self, chunk_size):
+        """Yield (texts, labels) lists of up to chunk_size examples"""
+        examples = self._iter_training_examples()
+        while True:
+            chunk = list(islice(examples, chunk_size))
+            if not chunk:
+                return
+            texts, labels = zip(*chunk)
+            yield list(texts), list(labels)
+    
+    def _shuffled_chunks(self, chunk_size, buffer_size, rng):
+        """Yield (texts, labels) chunks shuffled through a bounded buffer"""
+        buffer = []
+        buffer_size = max(buffer_size, chunk_size)
+        for example in self._iter_training_examples():
+            buffer.append(example)
+            if len(buffer) >= buffer_size:
+                rng.shuffle(buffer)
+                chunk, buffer = buffer[:chunk_size], buffer[chunk_size:]
+                texts, labels = zip(*chunk)
+                yield list(texts), list(labels)
+        rng.shuffle(buffer)
+        for start in range(0, len(buffer), chunk_size):
+            texts, labels = zip(*buffer[start:start + chunk_size])
+            yield list(texts), list(labels)
+    
+    def _preprocess_chunk(self, texts):
+        return list(self.preprocessor.preprocess_batch(texts, processes=self.preprocess_processes))
+    
+    # ===== Incremental updates =====
+    
+    def update(self, epochs=30, replay_size=None, validation_size=200, max_regression=0.02):
+        """
+        Fit patterns appended to the data repository since the last train()
+        or update() without retraining from scratch.
+        The classifier continues from its current weights on the new
+        patterns plus a replayed sample of earlier ones, so the cost follows
+        the size of the change. New vocabulary terms widen the input layer
+        and new intents widen the output layer. A validation sample of
+        earlier patterns is scored before and after; if accuracy drops by
+        more than max_regression the update is rolled back.
+        Edited or removed patterns still need train().
+        
+        Args:
+            epochs (int): Passes over the new and replayed patterns
+            replay_size (int, optional): Earlier patterns mixed in to avoid
+                forgetting; defaults to max(4 x new patterns, 64), and
+                ignored by backends that store every pattern
+            validation_size (int): Earlier patterns scored for regressions
+            max_regression (float): Largest accepted drop in validation
+                accuracy (0.02 = two percentage points)
+            
+        Returns:
+            dict: What changed, validation accuracies, elapsed seconds and
+                whether the update was rolled back
+        """
+        if self.classifier is None:
+            raise ValueError("train() the model before calling update()")
+        
+        self.wait_for_save()
+        with metrics.timer("update"):
+            return self._update(epochs, replay_size, validation_size, max_regression)
+    
+    def _update(self, epochs, replay_size, validation_size, max_regression):
+        """Body of update(), timed as a whole"""
+        start = time.perf_counter()
+        X, y = self.data_repository.get_training_data()
+        n_old = self._trained_count
+        if len(X) < n_old:
+            raise ValueError("Patterns were removed from the repository; call train()")
+        
+        new_texts, new_labels = list(X[n_old:]), list(y[n_old:])
+        report = {
+            "new_patterns": len(new_texts),
+            "new_intents": [],
+            "new_terms": 0,
+            "validation_accuracy_before": None,
+            "validation_accuracy_after": None,
+            "new_pattern_accuracy": None,
+            "rolled_back": False,
+        }
+        if not new_texts:
+            report["seconds"] = time.perf_counter() - start
+            return report
+        
+        # Samples of earlier patterns: replayed while fitting, and scored
+        rng = np.random.default_rng(self.hyperparameters.get("random_state"))
+        if self.classifier.stores_rows:
+            # Earlier patterns are already stored; replaying would duplicate them
+            replay_size = 0
+        elif replay_size is None:
+            replay_size = max(4 * len(new_texts), 64)
+        replay = rng.choice(n_old, size=min(replay_size, n_old), replace=False)
+        validation = rng.choice(n_old, size=min(validation_size, n_old), replace=False)
+        preprocess = self.preprocessor.preprocess_batch
+        replay_clean = list(preprocess(X[i] for i in replay))
+        replay_labels = [y[i] for i in replay]
+        validation_clean = list(preprocess(X[i] for i in validation))
+        validation_labels = [y[i] for i in validation]
+        new_clean = list(preprocess(new_texts))
+        
+        before = self._accuracy_on(validation_clean, validation_labels)
+        snapshot = self._snapshot()
+        try:
+            report["new_terms"] = self._extend_vocabulary(new_clean, islice(X, n_old))
+            report["new_intents"] = self._extend_labels(new_labels)
+            
+            X_update = self.vectorizer.transform(replay_clean + new_clean).tocsr()
+            y_update = self.label_encoder.transform(replay_labels + new_labels)
+            self.classifier.partial_fit(X_update, y_update, epochs)
+            self._build_intent_lookup()
+            
+            after = self._accuracy_on(validation_clean, validation_labels)
+        except BaseException:
+            self._restore(snapshot)
+            raise
+        
+        report["validation_accuracy_before"] = before
+        report["validation_accuracy_after"] = after
+        if before is not None and after < before - max_regression:
+            self._restore(snapshot)
+            report["rolled_back"] = True
+        else:
+            report["new_pattern_accuracy"] = self._accuracy_on(new_clean, new_labels)
+            self.exact_match_index.add(new_clean, new_labels)
+            self._trained_count = len(X)
+            self._invalidate_cache()
+            if self.artifact_store is not None:
+                if self._key_digest is None:
+                    # Not from load_or_train(): hash the earlier patterns once
+                    self._key_digest = ModelArtifactStore.extend_key(
+                        ModelArtifactStore.start_key(self._artifact_hyperparameters()),
+                        islice(zip(X, y), n_old)
+                    )
+                ModelArtifactStore.extend_key(self._key_digest, zip(new_texts, new_labels))
+                self._save_in_background(self._key_digest.hexdigest())
+        
+        report["seconds"] = time.perf_counter() - start
+        return report
+    
+    @staticmethod
+    def _count_documents(X_vectorized):
+        """(document frequency per feature, number of documents) of a CSR matrix"""
+        df = np.bincount(X_vectorized.indices, minlength=X_vectorized.shape[1])
+        return df, X_vectorized.shape[0]
+    
+    def _extend_vocabulary(self, new_clean, old_texts):
+        """
+        Add unseen terms of new patterns to the TF-IDF vocabulary, update
+        the IDF weights and widen the classifier input
+        
+        Returns:
+            int: Number of terms added
+        """
+        # Hashing features are fixed-width, and their IDF stays as trained
+        if self.vectorizer_mode != "tfidf":
+            return 0
+        
+        if self._document_frequency is None:
+            # Loaded from an artifact: count once over the fitted patterns
+            old_clean = self.preprocessor.preprocess_batch(old_texts)
+            self._document_frequency = self._count_documents(
+                self.vectorizer.transform(old_clean).tocsr()
+            )
+        df, n_documents = self._document_frequency
+        
+        vocabulary = dict(self.vectorizer.vocabulary_)
+        analyze = self.vectorizer.build_analyzer()
+        n_old_terms = len(vocabulary)
+        occurrences = []
+        for text in new_clean:
+            for term in set(analyze(text)):
+                index = vocabulary.get(term)
+                if index is None:
+                    index = vocabulary[term] = len(vocabulary)
+                occurrences.append(index)
+        added = len(vocabulary) - n_old_terms
+        
+        df = np.concatenate([df, np.zeros(added, dtype=df.dtype)])
+        np.add.at(df, occurrences, 1)
+        n_documents += len(new_clean)
+        self._document_frequency = (df, n_documents)
+        
+        if added:
+            # A fitted vectorizer cannot grow its vocabulary, so build one
+            # with the extended vocabulary fixed; fitting it only records
+            # that vocabulary (the IDF weights are set below)
+            vectorizer = clone(self.vectorizer).set_params(vocabulary=vocabulary)
+            vectorizer.fit([""])
+            self.vectorizer = vectorizer
+        if self.vectorizer.use_idf:
+            # Same formula as TfidfTransformer
+            smooth = int(self.vectorizer.smooth_idf)
+            self.vectorizer.idf_ = np.log((n_documents + smooth) / (df + smooth)) + 1
+        if added:
+            self.classifier.add_features(len(vocabulary))
+        return added
+    
+    def _extend_labels(self, new_labels):
+        """
+        Add unseen intents to the label encoder and the classifier output
+        
+        Returns:
+            list: Intents added
+        """
+        old_classes = self.label_encoder.classes_
+        added = np.setdiff1d(np.unique(new_labels), old_classes)
+        if not len(added):
+            return []
+        
+        # LabelEncoder keeps classes sorted, so existing codes may shift
+        classes = np.union1d(old_classes, added)
+        self.label_encoder.classes_ = classes
+        self.classifier.remap_classes(np.searchsorted(classes, old_classes), len(classes))
+        return added.tolist()
+    
+    def _accuracy_on(self, clean_texts, labels):
+        """Classifier accuracy on preprocessed texts (None when empty)"""
+        if not clean_texts:
+            return None
+        probabilities = self.classifier.predict_proba(self.vectorizer.transform(clean_texts))
+        predicted = self._intent_lookup[probabilities.argmax(axis=1)]
+        return float(np.mean(predicted == np.asarray(labels, dtype=object)))
+    
+    def _snapshot(self):
+        """
+        Capture the state update() changes, for rollback. update() replaces
+        the vectorizer, label classes and document frequencies instead of
+        modifying them, so only the classifier needs its own snapshot.
+        """
+        tfidf_idf = self.vectorizer_mode == "tfidf" and self.vectorizer.use_idf
+        return {
+            "vectorizer": self.vectorizer,
+            "idf": self.vectorizer.idf_ if tfidf_idf else None,
+            "classes": self.label_encoder.classes_,
+            "classifier": self.classifier.snapshot(),
+            "trained_count": self._trained_count,
+            "document_frequency": self._document_frequency,
+        }
+    
+    def _restore(self, snapshot):
+        """Return to a state saved by _snapshot()"""
+        self.vectorizer = snapshot["vectorizer"]
+        if snapshot["idf"] is not None:
+            self.vectorizer.idf_ = snapshot["idf"]
+        self.label_encoder.classes_ = snapshot["classes"]
+        self.classifier.restore(snapshot["classifier"])
+        self._build_intent_lookup()
+        self._trained_count = snapshot["trained_count"]
+        self._document_frequency = snapshot["document_frequency"]
+    
+    def _save_in_background(self, key):
+        """Write the artifact on a thread; wait_for_save() joins it"""
+        components = self._get_components()
+        
+        def save():
+            try:
+                self.artifact_store.save(key, components)
+            except Exception as e:
+                self._save_error = e
+        
+        # Not a daemon, so exiting the interpreter still finishes the file
+        self._save_thread = threading.Thread(target=save, name="model-artifact-save")
+        self._save_thread.start()
+    
+    def wait_for_save(self):
+        """
+        Wait for an artifact save started by update() to finish. train(),
+        train_streaming() and update() call this first.
+        
+        Raises:
+            Exception: The error of a failed background save
+        """
+        if self._save_thread is not None:
+            self._save_thread.join()
+            self._save_thread = None
+        if self._save_error is not None:
+            error, self._save_error = self._save_error, None
+            raise error
+    
     def predict(self, text):
         """
         Predict intent and generate response for input text.
@@ -103,26 +810,238 @@ class ChatbotMLModel:
         Returns:
             str: Bot response message
         """
+        return self.predict_intent(text).response
+    
+    def predict_intent(self, text, top_k=3):
+        """
+        Predict intent for input text with a single classifier pass.
+        Label and confidence are both taken from one probability vector.
+        
+        Args:
+            text (str): User input text
+            top_k (int): Number of alternatives to include in the result
+            
+        Returns:
+            PredictionResult: Intent, confidence, alternatives and response
+        """
+        with metrics.timer("predict"):
+            result = self._predict_intent(text, top_k)
+        if metrics.enabled:
+            metrics.increment("predictions")
+            if result.is_fallback:
+                metrics.increment("fallbacks")
+        return result
+    
+    def _predict_intent(self, text, top_k):
+        """Body of predict_intent(), timed as a whole and per stage"""
         # Preprocess input
         processed_text = self.preprocessor.preprocess(text)
         
+        # Fast path: the query repeats a training pattern
+        intent = self.exact_match_index.lookup(processed_text)
+        if intent is not None:
+            metrics.increment("exact_match_hits")
+            with metrics.timer("select_response"):
+                response = self.data_repository.get_response_for_intent(intent)
+            return PredictionResult(intent, 1.0, [(intent, 1.0)], response)
+        
+        # Reuse the decision for repeated phrasings when caching is enabled
+        cache_key = (processed_text, top_k)
+        decision = None
+        if self.prediction_cache is not None:
+            decision = self.prediction_cache.get(cache_key)
+        if decision is None:
+            decision = self._classify(processed_text, top_k)
+            if self.prediction_cache is not None:
+                metrics.increment("cache_misses")
+                self.prediction_cache.put(cache_key, decision)
+        else:
+            metrics.increment("cache_hits")
+        
+        intent, confidence, alternatives = decision
+        alternatives = list(alternatives)
+        
+        # Check confidence threshold, then get the response from the data repository
+        with metrics.timer("select_response"):
+            if confidence < self.confidence_threshold:
+                intent = None
+                response = self.data_repository.get_fallback_response()
+            else:
+                response = self.data_repository.get_response_for_intent(intent)
+        return PredictionResult(intent, confidence, alternatives, response)
+    
+    def _classify(self, processed_text, top_k):
+        """
+        Run the vectorizer and classifier on preprocessed text
+        
+        Returns:
+            tuple: (best intent, confidence, tuple of (intent, probability))
+        """
         # Vectorize input
-        X_test = self.vectorizer.transform([processed_text]).toarray()
+        with metrics.timer("vectorize"):
+            X_test = self.vectorizer.transform([processed_text])
+        
+        # One forward pass gives both the label and its confidence
+        with metrics.timer("classify"):
+            probabilities = self.classifier.predict_proba(X_test)[0]
+        
+        # Rank the top-k classes without sorting the whole vector
+        top_k = min(top_k, len(probabilities))
+        if top_k < len(probabilities):
+            candidates = np.argpartition(probabilities, -top_k)[-top_k:]
+        else:
+            candidates = np.arange(len(probabilities))
+        ranked = candidates[np.argsort(probabilities[candidates])[::-1]]
+        alternatives = tuple((self._intent_lookup[i], float(probabilities[i]))
+                             for i in ranked)
+        
+        best = int(probabilities.argmax())
+        return self._intent_lookup[best], float(probabilities[best]), alternatives
+    
+    def predict_batch(self, texts, chunk_size=1024, use_exact_match=True):
+        """
+        Predict intents and generate responses for many texts at once.
+        Each chunk is preprocessed, vectorized and classified in single
+        vectorized calls; chunking keeps memory bounded on large inputs.
+        
+        Args:
+            texts (iterable of str): User input texts
+            chunk_size (int): Maximum number of texts classified per call
+            use_exact_match (bool): Answer texts matching a training
+                pattern from the exact-match index; False sends every text
+                through the classifier (e.g. to validate it)
+            
+        Returns:
+            tuple: (intents, confidences, responses) as NumPy arrays aligned
+                with the input. Intents below the confidence threshold are
+                None and get the fallback response.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
         
-        # Get prediction probabilities
-        probabilities = self.classifier.predict_proba(X_test)[0]
-        confidence = max(probabilities)
+        with metrics.timer("predict_batch"):
+            results = self._predict_batch(texts, chunk_size, use_exact_match)
+        if metrics.enabled:
+            intents = results[0]
+            metrics.increment("predictions", len(intents))
+            metrics.increment("fallbacks", sum(1 for intent in intents if intent is None))
+        return results
+    
+    def _predict_batch(self, texts, chunk_size, use_exact_match):
+        """Body of predict_batch(), timed as a whole"""
+        texts = list(texts)
+        n_texts = len(texts)
+        intents = np.empty(n_texts, dtype=object)
+        confidences = np.empty(n_texts, dtype=np.float64)
+        responses = np.empty(n_texts, dtype=object)
         
-        # Check confidence threshold
-        if confidence < self.confidence_threshold:
-            return self.data_repository.get_fallback_response()
+        # Preprocessing streams over the whole input (optionally in a
+        # process pool) and is consumed one chunk at a time
+        processed_stream = self.preprocessor.preprocess_batch(
+            texts, processes=self.preprocess_processes
+        )
         
-        # Predict intent
-        prediction = self.classifier.predict(X_test)[0]
-        intent = self.label_encoder.inverse_transform([prediction])[0]
+        for start in range(0, n_texts, chunk_size):
+            processed = list(islice(processed_stream, chunk_size))
+            stop = start + len(processed)
+            
+            # Fast path: texts matching a training pattern skip the classifier
+            if use_exact_match:
+                chunk_intents = np.array(
+                    [self.exact_match_index.lookup(text) for text in processed],
+                    dtype=object
+                )
+            else:
+                chunk_intents = np.full(len(processed), None, dtype=object)
+            chunk_confidences = np.ones(len(processed))
+            misses = np.array([i for i, intent in enumerate(chunk_intents)
+                               if intent is None], dtype=np.intp)
+            
+            if len(misses):
+                # Vectorize the remaining texts together
+                X_chunk = self.vectorizer.transform([processed[i] for i in misses])
+                
+                # One classifier call for the chunk; label and confidence both
+                # come from the same probability matrix
+                probabilities = self.classifier.predict_proba(X_chunk)
+                best = probabilities.argmax(axis=1)
+                miss_confidences = probabilities[np.arange(len(misses)), best]
+                miss_intents = self._intent_lookup[best]
+                miss_intents[miss_confidences < self.confidence_threshold] = None
+                
+                chunk_intents[misses] = miss_intents
+                chunk_confidences[misses] = miss_confidences
+            
+            intents[start:stop] = chunk_intents
+            confidences[start:stop] = chunk_confidences
+        
+        # Responses are picked per text so replies still vary
+        for i, intent in enumerate(intents):
+            if intent is None:
+                responses[i] = self.data_repository.get_fallback_response()
+            else:
+                responses[i] = self.data_repository.get_response_for_intent(intent)
         
-        # Get response from data repository
-        return self.data_repository.get_response_for_intent(intent)
+        return intents, confidences, responses
+    
+    def memory_report(self):
+        """
+        Compare the memory cost of dense and sparse training features.
+        Peaks are measured with tracemalloc while vectorizing the training
+        data with and without densifying, as the pipeline used to do.
+        Requires a trained (fitted) vectorizer.
+        
+        Returns:
+            dict: Matrix shape, non-zeros, dense/sparse sizes and peaks, and
+                the pickled vectorizer size, in bytes
+        """
+        X, _ = self.data_repository.get_training_data()
+        X_clean = list(self.preprocessor.preprocess_batch(X))
+        
+        dense_peak = self._measure_peak(
+            lambda: self.vectorizer.transform(X_clean).toarray()
+        )
+        sparse_peak = self._measure_peak(
+            lambda: self.vectorizer.transform(X_clean).tocsr()
+        )
+        
+        X_sparse = self.vectorizer.transform(X_clean).tocsr()
+        n_samples, n_features = X_sparse.shape
+        vectorizer_bytes = len(pickle.dumps(self.vectorizer, protocol=pickle.HIGHEST_PROTOCOL))
+        dense_bytes = n_samples * n_features * X_sparse.dtype.itemsize
+        sparse_bytes = (X_sparse.data.nbytes + X_sparse.indices.nbytes
+                        + X_sparse.indptr.nbytes)
+        
+        return {
+            "n_samples": n_samples,
+            "n_features": n_features,
+            "nnz": X_sparse.nnz,
+            "density": X_sparse.nnz / max(n_samples * n_features, 1),
+            "dense_bytes": dense_bytes,
+            "sparse_bytes": sparse_bytes,
+            "dense_peak_bytes": dense_peak,
+            "sparse_peak_bytes": sparse_peak,
+            "peak_saving_ratio": dense_peak / max(sparse_peak, 1),
+            "vectorizer_mode": self.vectorizer_mode,
+            "vectorizer_bytes": vectorizer_bytes,
+        }
+    
+    @staticmethod
+    def _measure_peak(build):
+        """Return the peak bytes allocated while calling build()"""
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        try:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            result = build()
+            _, peak = tracemalloc.get_traced_memory()
+            del result
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+        return peak - baseline
     
     def get_accuracy(self):
         """Return model training accuracy"""
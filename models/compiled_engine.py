@@ -0,0 +1,288 @@
+"""
+Model Layer: Compiled inference engine
+=======================================
+This module contains the CompiledInferenceEngine class, a dependency-free
+(NumPy only) forward pass for a trained TF-IDF + MLP ChatbotMLModel.
+Importing it does not import scikit-learn.
+"""
+
+import json
+import re
+from collections import Counter
+
+import numpy as np
+
+from .preprocessing import NLPPreprocessor
+
+_ACTIVATIONS = {
+    "relu": lambda z: np.maximum(z, 0, out=z),
+    "tanh": lambda z: np.tanh(z, out=z),
+    "logistic": lambda z: np.divide(1.0, 1.0 + np.exp(-z), out=z),
+    "identity": lambda z: z,
+}
+
+
+class CompiledInferenceEngine:
+    """
+    Model Layer: Frozen vectorizer and MLP weights as plain NumPy arrays.
+    Runs preprocess -> sparse TF-IDF -> matmul -> softmax in a few
+    vectorized operations, without scikit-learn's validation and dispatch.
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, vocabulary, idf, weights, biases, intents, config):
+        """
+        Initialize the engine from frozen arrays (see from_model() and load())
+
+        Args:
+            vocabulary (numpy.ndarray): Term of each feature column
+            idf (numpy.ndarray): IDF weight of each feature column
+            weights (list): Weight matrix of each layer
+            biases (list): Bias vector of each layer
+            intents (numpy.ndarray): Intent name of each output column
+            config (dict): Token pattern, activations, threshold and
+                preprocessor settings
+        """
+        self.vocabulary = vocabulary
+        self.idf = idf
+        self.weights = weights
+        self.biases = biases
+        self.intents = intents
+        self.config = config
+
+        self.dtype = weights[0].dtype
+        self.confidence_threshold = config["confidence_threshold"]
+        self.preprocessor = NLPPreprocessor(**config["preprocessor"])
+        self._token_pattern = re.compile(config["token_pattern"])
+        self._term_index = {term: i for i, term in enumerate(vocabulary.tolist())}
+        self._activation = _ACTIVATIONS[config["activation"]]
+
+    # ===== Export =====
+
+    @classmethod
+    def from_model(cls, model, dtype=np.float32):
+        """
+        Freeze a trained ChatbotMLModel
+
+        Args:
+            model (ChatbotMLModel): Trained model using the "tfidf"
+                vectorizer and the "mlp" backend
+            dtype: Floating point type of the frozen arrays
+
+        Returns:
+            CompiledInferenceEngine: Engine reproducing the model's scores
+        """
+        if model.vectorizer_mode != "tfidf" or model.backend != "mlp":
+            raise ValueError("Only the tfidf vectorizer with the mlp backend can be compiled")
+
+        vectorizer = model.vectorizer
+        params = vectorizer.get_params()
+        supported = (
+            params["analyzer"] == "word" and params["ngram_range"] == (1, 1)
+            and params["lowercase"] and not params["binary"]
+            and params["norm"] == "l2" and not params["sublinear_tf"]
+            and params["stop_words"] is None and params["strip_accents"] is None
+            and params["tokenizer"] is None and params["preprocessor"] is None
+        )
+        if not supported:
+            raise ValueError("Vectorizer settings are not supported by the compiled engine")
+
+        vocabulary = vectorizer.get_feature_names_out().astype(str)
+        if params["use_idf"]:
+            idf = vectorizer.idf_.astype(dtype)
+        else:
+            idf = np.ones(len(vocabulary), dtype=dtype)
+
+        mlp = model.classifier.estimator
+        config = {
+            "token_pattern": params["token_pattern"],
+            "activation": mlp.activation,
+            "out_activation": mlp.out_activation_,
+            "confidence_threshold": model.confidence_threshold,
+            "preprocessor": model.preprocessor.get_config(),
+        }
+        return cls(
+            vocabulary,
+            idf,
+            [coef.astype(dtype) for coef in mlp.coefs_],
+            [bias.astype(dtype) for bias in mlp.intercepts_],
+            np.asarray(model._intent_lookup, dtype=str),
+            config,
+        )
+
+    def to_arrays(self):
+        """
+        Return every frozen array by name, with the configuration as a JSON
+        string array (the layout used by save() and from_arrays())
+
+        Returns:
+            dict: Name -> numpy.ndarray
+        """
+        arrays = {
+            "vocabulary": self.vocabulary,
+            "idf": self.idf,
+            "intents": self.intents,
+            "config": np.array(json.dumps(dict(self.config, format_version=self.FORMAT_VERSION))),
+        }
+        for i, (weight, bias) in enumerate(zip(self.weights, self.biases)):
+            arrays[f"weight_{i}"] = weight
+            arrays[f"bias_{i}"] = bias
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        """
+        Build an engine over arrays laid out by to_arrays(). The arrays are
+        used as they are (not copied), so they may live in shared memory.
+
+        Args:
+            arrays (mapping): Name -> numpy.ndarray
+
+        Returns:
+            CompiledInferenceEngine: Engine using the given arrays
+        """
+        config = json.loads(arrays["config"].item())
+        if config.pop("format_version") != cls.FORMAT_VERSION:
+            raise ValueError("Unsupported compiled engine format")
+        n_layers = sum(1 for name in arrays if name.startswith("weight_"))
+        return cls(
+            arrays["vocabulary"],
+            arrays["idf"],
+            [arrays[f"weight_{i}"] for i in range(n_layers)],
+            [arrays[f"bias_{i}"] for i in range(n_layers)],
+            arrays["intents"],
+            config,
+        )
+
+    def save(self, path):
+        """
+        Write the engine to a NumPy .npz file (no pickled objects)
+
+        Args:
+            path (str): Destination file
+        """
+        with open(path, "wb") as f:
+            np.savez(f, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an engine written by save()
+
+        Args:
+            path (str): Source file
+
+        Returns:
+            CompiledInferenceEngine: Loaded engine
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
+
+    # ===== Inference =====
+
+    def vectorize(self, processed_texts):
+        """
+        Build the L2-normalized TF-IDF rows of preprocessed texts in CSR form
+
+        Returns:
+            tuple: (data, indices, indptr) arrays
+        """
+        term_index = self._term_index
+        findall = self._token_pattern.findall
+        indices = []
+        counts = []
+        indptr = [0]
+        for text in processed_texts:
+            tokens = findall(text.lower())
+            term_counts = Counter(i for i in map(term_index.get, tokens) if i is not None)
+            indices.extend(term_counts.keys())
+            counts.extend(term_counts.values())
+            indptr.append(len(indices))
+
+        indices = np.asarray(indices, dtype=np.intp)
+        indptr = np.asarray(indptr, dtype=np.intp)
+        data = np.asarray(counts, dtype=self.dtype) * self.idf[indices]
+
+        # L2-normalize each row (rows without known terms stay empty)
+        row_ids = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+        norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=len(indptr) - 1))
+        norms[norms == 0] = 1
+        data /= norms[row_ids].astype(self.dtype)
+        return data, indices, indptr
+
+    def predict_proba(self, texts):
+        """
+        Score every intent for each text
+
+        Args:
+            texts (list of str): Raw user input texts
+
+        Returns:
+            numpy.ndarray: (n_texts, n_intents) probabilities
+        """
+        return self._forward(self.vectorize(
+            [self.preprocessor.preprocess(text) for text in texts]
+        ))
+
+    def _forward(self, rows):
+        """Run the network on (data, indices, indptr) TF-IDF rows"""
+        data, indices, indptr = rows
+
+        # Sparse rows times the first weight matrix: gather, scale, segment-sum
+        n_rows = len(indptr) - 1
+        contributions = self.weights[0][indices] * data[:, None]
+        hidden = np.tile(self.biases[0], (n_rows, 1))
+        row_ids = np.repeat(np.arange(n_rows), np.diff(indptr))
+        np.add.at(hidden, row_ids, contributions)
+
+        for weight, bias in zip(self.weights[1:], self.biases[1:]):
+            hidden = self._activation(hidden)
+            hidden = hidden @ weight
+            hidden += bias
+
+        if self.config["out_activation"] == "softmax":
+            hidden -= hidden.max(axis=1, keepdims=True)
+            np.exp(hidden, out=hidden)
+            hidden /= hidden.sum(axis=1, keepdims=True)
+            return hidden
+
+        # Binary output: a single logistic unit for the second class
+        positive = 1.0 / (1.0 + np.exp(-hidden[:, 0]))
+        return np.column_stack([1.0 - positive, positive])
+
+    def classify(self, texts, exact_match_index=None):
+        """
+        Predict the intent of each text
+
+        Args:
+            texts (list of str): Raw user input texts
+            exact_match_index (ExactMatchIndex, optional): Answer texts
+                repeating a training pattern with confidence 1.0, as
+                ChatbotMLModel does
+
+        Returns:
+            tuple: (intents, confidences) arrays; intents below the
+                confidence threshold are None
+        """
+        processed = [self.preprocessor.preprocess(text) for text in texts]
+        intents = np.empty(len(processed), dtype=object)
+        confidences = np.ones(len(processed), dtype=self.dtype)
+
+        if exact_match_index is None:
+            misses = np.arange(len(processed))
+        else:
+            intents[:] = [exact_match_index.lookup(text) for text in processed]
+            misses = np.array([i for i, intent in enumerate(intents) if intent is None],
+                              dtype=np.intp)
+        if not len(misses):
+            return intents, confidences
+
+        probabilities = self._forward(self.vectorize([processed[i] for i in misses]))
+        best = probabilities.argmax(axis=1)
+        miss_confidences = probabilities[np.arange(len(best)), best]
+        miss_intents = self.intents.astype(object)[best]
+        miss_intents[miss_confidences < self.confidence_threshold] = None
+        intents[misses] = miss_intents
+        confidences[misses] = miss_confidences
+        return intents, confidences
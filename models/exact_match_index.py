@@ -0,0 +1,157 @@
+"""
+Model Layer: Exact-match fast path
+===================================
+This module contains the ExactMatchIndex class, a hash index of normalized
+training patterns checked before the classifier.
+"""
+
+import threading
+
+
+class ExactMatchIndex:
+    """
+    Model Layer: Maps normalized training patterns to their intent.
+    Queries that repeat a pattern verbatim (or, in token_set mode, with the
+    same words in any order) are answered without running the classifier.
+    Keys shared by patterns of different intents are left out.
+    """
+    
+    MODES = ("exact", "token_set")
+    
+    def __init__(self, mode="exact"):
+        """
+        Initialize an empty index
+        
+        Args:
+            mode (str): "exact" matches whitespace-normalized text;
+                "token_set" also matches the sorted set of tokens
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown exact match mode: {mode}")
+        
+        self.mode = mode
+        self._exact = {}
+        self._token_set = {}
+        
+        # Keys left out because patterns of different intents share them
+        self._ambiguous = set()
+        
+        # Hit-rate counters
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.token_set_hits = 0
+    
+    @staticmethod
+    def _exact_key(processed_text):
+        return " ".join(processed_text.split())
+    
+    @staticmethod
+    def _token_set_key(processed_text):
+        return " ".join(sorted(set(processed_text.split())))
+    
+    def build(self, processed_texts, labels):
+        """
+        Rebuild the index from preprocessed training texts
+        
+        Args:
+            processed_texts (iterable of str): Preprocessed patterns
+            labels (iterable of str): Intent of each pattern
+        """
+        exact = {}
+        token_set = {}
+        for text, label in zip(processed_texts, labels):
+            self._add(exact, self._exact_key(text), label)
+            if self.mode == "token_set":
+                self._add(token_set, self._token_set_key(text), label)
+        
+        # Drop ambiguous keys (None marks a conflict) and the empty pattern
+        self._exact = {k: v for k, v in exact.items() if v is not None and k}
+        self._token_set = {k: v for k, v in token_set.items() if v is not None and k}
+        self._ambiguous = {("exact", k) for k, v in exact.items() if v is None}
+        self._ambiguous.update(("token_set", k) for k, v in token_set.items() if v is None)
+    
+    def add(self, processed_texts, labels):
+        """
+        Index more training patterns without rebuilding
+        
+        Args:
+            processed_texts (iterable of str): Preprocessed patterns
+            labels (iterable of str): Intent of each pattern
+        """
+        for text, label in zip(processed_texts, labels):
+            self._add_unique(self._exact, "exact", self._exact_key(text), label)
+            if self.mode == "token_set":
+                self._add_unique(self._token_set, "token_set", self._token_set_key(text), label)
+    
+    def _add_unique(self, index, kind, key, label):
+        """Insert a key into a built index, dropping it if intents disagree"""
+        if not key or (kind, key) in self._ambiguous:
+            return
+        if index.get(key, label) != label:
+            del index[key]
+            self._ambiguous.add((kind, key))
+        else:
+            index[key] = label
+    
+    @staticmethod
+    def _add(index, key, label):
+        """Insert a key, marking it ambiguous if intents disagree"""
+        if key in index and index[key] != label:
+            index[key] = None
+        else:
+            index[key] = label
+    
+    def lookup(self, processed_text):
+        """
+        Find the intent of a preprocessed query
+        
+        Args:
+            processed_text (str): Preprocessed user input
+            
+        Returns:
+            str or None: Matching intent, or None on a miss
+        """
+        intent = self._exact.get(self._exact_key(processed_text))
+        token_set_hit = False
+        if intent is None and self._token_set:
+            intent = self._token_set.get(self._token_set_key(processed_text))
+            token_set_hit = intent is not None
+        
+        with self._lock:
+            self.lookups += 1
+            if token_set_hit:
+                self.token_set_hits += 1
+            elif intent is not None:
+                self.exact_hits += 1
+        return intent
+    
+    def get_stats(self):
+        """
+        Get hit-rate counters for monitoring
+        
+        Returns:
+            dict: Lookups, hits by key type, overall hit rate and index size
+        """
+        with self._lock:
+            hits = self.exact_hits + self.token_set_hits
+            return {
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "token_set_hits": self.token_set_hits,
+                "hit_rate": hits / self.lookups if self.lookups else 0.0,
+                "size": len(self._exact) + len(self._token_set),
+            }
+    
+    def __getstate__(self):
+        # Locks cannot be pickled; counters restart with each process
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["lookups"] = state["exact_hits"] = state["token_set_hits"] = 0
+        return state
+    
+    def __setstate__(self, state):
+        # Indexes saved before add() existed did not track ambiguous keys
+        state.setdefault("_ambiguous", set())
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
@@ -0,0 +1,332 @@
+"""
+Model Layer: Versioned model registry with hot swapping
+========================================================
+This module contains the ModelRegistry class which builds new
+ChatbotMLModel versions in the background, validates them on a smoke set
+and swaps them in without a restart, keeping earlier versions for
+rollback. A watcher thread can rebuild the model when the data source
+changes.
+"""
+
+import threading
+import time
+
+from metrics import metrics
+
+
+class ModelValidationError(Exception):
+    """A new model failed its smoke test and was not activated"""
+
+
+class ModelVersion:
+    """
+    Model Layer: One registered model and how it was produced.
+    """
+
+    __slots__ = ("version", "model", "source", "created_at", "build_seconds",
+                 "smoke_accuracy")
+
+    def __init__(self, version, model, source, created_at, build_seconds, smoke_accuracy):
+        self.version = version
+        self.model = model
+        self.source = source
+        self.created_at = created_at
+        self.build_seconds = build_seconds
+        self.smoke_accuracy = smoke_accuracy
+
+    @property
+    def label(self):
+        """Short name shown to users, e.g. "v2" """
+        return f"v{self.version}"
+
+    def to_dict(self):
+        """Return the version's metadata (without the model)"""
+        return {
+            "version": self.version,
+            "source": self.source,
+            "created_at": self.created_at,
+            "build_seconds": self.build_seconds,
+            "smoke_accuracy": self.smoke_accuracy,
+            "training_accuracy": self.model.get_accuracy(),
+        }
+
+
+class ModelRegistry:
+    """
+    Model Layer: Holds the active model version and its predecessors.
+    Swapping only replaces the active reference, so callers that already
+    took the previous model (e.g. a ConversationEngine prediction in
+    flight) finish on it; at most one build runs at a time.
+    """
+
+    def __init__(self, model_factory, smoke_set=None, smoke_size=50, min_smoke_accuracy=0.9,
+                 max_versions=3, on_swap=None, on_error=None, clock=time.time):
+        """
+        Initialize the registry (no model is built yet)
+
+        Args:
+            model_factory (callable): Returns a new trained ChatbotMLModel
+                (loading or training it); called on a background thread
+                by build_in_background()
+            smoke_set (list of tuple, optional): (text, expected intent)
+                pairs every new model must answer; defaults to a sample of
+                the new model's training patterns with their word order,
+                case and punctuation changed, which catches broken models
+                but not accuracy regressions
+            smoke_size (int): Size of the default smoke set
+            min_smoke_accuracy (float): Fraction of the smoke set a model
+                must get right to be activated
+            max_versions (int): Versions kept, the active one included;
+                older ones can no longer be rolled back to
+            on_swap (callable, optional): Called with the new active
+                ModelVersion after every swap or rollback
+            on_error (callable, optional): Called with the exception when
+                a background build fails or is rejected
+            clock (callable): Time source in seconds
+        """
+        if max_versions < 1:
+            raise ValueError("max_versions must be at least 1")
+
+        self.model_factory = model_factory
+        self.smoke_set = smoke_set
+        self.smoke_size = smoke_size
+        self.min_smoke_accuracy = min_smoke_accuracy
+        self.max_versions = max_versions
+        self.on_swap = on_swap
+        self.on_error = on_error
+        self._clock = clock
+
+        self._versions = []
+        self._next_version = 1
+        self._lock = threading.Lock()
+        self._building = threading.Lock()
+        self.last_error = None
+
+        self._watch_thread = None
+        self._watch_stop = threading.Event()
+
+    # ===== Active version =====
+
+    @property
+    def active(self):
+        """The active ModelVersion, or None before the first build"""
+        with self._lock:
+            return self._versions[-1] if self._versions else None
+
+    @property
+    def active_model(self):
+        """The active ChatbotMLModel, or None before the first build"""
+        active = self.active
+        return None if active is None else active.model
+
+    def versions(self):
+        """
+        List the kept versions, oldest first
+
+        Returns:
+            list of dict: Version metadata; the last entry is active
+        """
+        with self._lock:
+            versions = list(self._versions)
+        return [version.to_dict() for version in versions]
+
+    # ===== Building and swapping =====
+
+    def build(self, source="reload"):
+        """
+        Build, validate and activate a new model on the calling thread
+
+        Args:
+            source (str): Why the model was built (kept in its metadata)
+
+        Returns:
+            ModelVersion: The new active version
+
+        Raises:
+            ModelValidationError: If the model failed its smoke test
+        """
+        with self._building:
+            start = time.perf_counter()
+            model = self.model_factory()
+            return self.promote(model, source, time.perf_counter() - start)
+
+    def build_in_background(self, source="reload"):
+        """
+        Start build() on a background thread unless one is running.
+        Failures leave the active version in place and are reported to
+        on_error.
+
+        Args:
+            source (str): Why the model was built
+
+        Returns:
+            bool: True if a build was started
+        """
+        if self._building.locked():
+            return False
+        threading.Thread(target=self._build_safely, args=(source,),
+                         name="model-builder", daemon=True).start()
+        return True
+
+    def _build_safely(self, source):
+        try:
+            self.build(source)
+        except Exception as e:
+            self.last_error = e
+            metrics.increment("model_builds_failed")
+            print(f"Model {source} failed, keeping the active version: {e}")
+            if self.on_error is not None:
+                self.on_error(e)
+
+    def promote(self, model, source="manual", build_seconds=0.0, strict=True):
+        """
+        Validate a trained model and make it the active version
+
+        Args:
+            model (ChatbotMLModel): Trained model
+            source (str): Where the model came from
+            build_seconds (float): Time it took to build
+            strict (bool): Reject a model that fails its smoke test; when
+                False it is activated with a warning (e.g. the first model,
+                where rejecting would leave no model at all)
+
+        Returns:
+            ModelVersion: The new active version
+
+        Raises:
+            ModelValidationError: If strict and the model failed its smoke
+                test
+        """
+        try:
+            smoke_accuracy = self.validate(model)
+        except ModelValidationError as e:
+            if strict:
+                metrics.increment("model_builds_rejected")
+                raise
+            print(f"Warning: activating model ({source}) despite its smoke test: {e}")
+            smoke_accuracy = None
+        with self._lock:
+            version = ModelVersion(self._next_version, model, source, self._clock(),
+                                   build_seconds, smoke_accuracy)
+            self._next_version += 1
+            self._versions.append(version)
+            del self._versions[:-self.max_versions]
+        metrics.increment("model_swaps")
+        smoke = "failed" if smoke_accuracy is None else f"{smoke_accuracy * 100:.0f}%"
+        print(f"Activated model {version.label} ({source}, smoke accuracy {smoke}, "
+              f"built in {build_seconds:.2f}s)")
+        if self.on_swap is not None:
+            self.on_swap(version)
+        return version
+
+    def validate(self, model):
+        """
+        Run a model's classifier on the smoke set (the exact-match index
+        is bypassed, so a broken classifier cannot hide behind it)
+
+        Args:
+            model (ChatbotMLModel): Trained model
+
+        Returns:
+            float: Fraction of the smoke set answered with the expected
+                intent
+
+        Raises:
+            ModelValidationError: If it is below min_smoke_accuracy or the
+                model fails to predict
+        """
+        smoke_set = self.smoke_set if self.smoke_set is not None else self._default_smoke_set(model)
+        if not smoke_set:
+            return 1.0
+        texts, expected = zip(*smoke_set)
+        try:
+            intents, _, _ = model.predict_batch(texts, use_exact_match=False)
+        except Exception as e:
+            raise ModelValidationError(f"Model failed on the smoke set: {e}") from e
+
+        accuracy = sum(intent == label for intent, label in zip(intents, expected)) / len(expected)
+        if accuracy < self.min_smoke_accuracy:
+            raise ModelValidationError(
+                f"Smoke accuracy {accuracy * 100:.0f}% is below "
+                f"{self.min_smoke_accuracy * 100:.0f}%"
+            )
+        return accuracy
+
+    def _default_smoke_set(self, model):
+        """
+        Evenly spaced training patterns of the model's repository, reworded
+        (words reversed, upper case, question mark) so they are not the
+        verbatim patterns
+        """
+        texts, labels = model.data_repository.get_training_data()
+        step = max(1, len(texts) // self.smoke_size)
+        return [(" ".join(reversed(text.split())).upper() + "?", label)
+                for text, label in zip(texts[::step], labels[::step])][:self.smoke_size]
+
+    def rollback(self):
+        """
+        Reactivate the previous version, discarding the active one
+
+        Returns:
+            ModelVersion: The version now active
+
+        Raises:
+            ValueError: If there is no earlier version
+        """
+        with self._lock:
+            if len(self._versions) < 2:
+                raise ValueError("No earlier model version to roll back to")
+            discarded = self._versions.pop()
+            version = self._versions[-1]
+        metrics.increment("model_rollbacks")
+        print(f"Rolled back from model {discarded.label} to {version.label}")
+        if self.on_swap is not None:
+            self.on_swap(version)
+        return version
+
+    # ===== Data source watcher =====
+
+    def start_watching(self, signature, interval_seconds=5.0, source="data changed"):
+        """
+        Rebuild the model in the background whenever the data changes.
+        A change must hold for one interval before a build starts, so
+        files still being written are not picked up half-way.
+
+        Args:
+            signature (callable): Returns a comparable fingerprint of the
+                data, e.g. FileIntentRepository.get_source_signature
+            interval_seconds (float): Seconds between checks
+            source (str): Source recorded for versions built on a change
+        """
+        self.stop_watching()
+        self._watch_stop.clear()
+        self._watch_thread = threading.Thread(
+            target=self._watch, args=(signature, interval_seconds, source),
+            name="model-watcher", daemon=True
+        )
+        self._watch_thread.start()
+
+    def stop_watching(self):
+        """Stop the watcher thread, if running"""
+        if self._watch_thread is None:
+            return
+        self._watch_stop.set()
+        self._watch_thread.join()
+        self._watch_thread = None
+
+    def _watch(self, signature, interval_seconds, source):
+        current = signature()
+        pending = None
+        while not self._watch_stop.wait(interval_seconds):
+            try:
+                latest = signature()
+            except Exception as e:
+                print(f"Could not check the data source: {e}")
+                continue
+            if latest == current:
+                pending = None
+            elif latest != pending:
+                # Changed since the last check: wait for it to settle
+                pending = latest
+            elif self.build_in_background(source):
+                current, pending = latest, None
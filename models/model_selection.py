@@ -0,0 +1,324 @@
+"""
+Model Layer: Cross-validated model selection
+=============================================
+This module contains the ModelSelector class which scores ChatbotMLModel
+configurations (hidden layer sizes, regularization, vectorizer settings and
+confidence thresholds) with stratified k-fold cross-validation, fanned out
+across a process pool, and helpers to persist the chosen configuration.
+
+Every fold trains a real ChatbotMLModel on the other folds and predicts the
+held-out patterns, so the reported accuracy reflects unseen phrasings
+instead of the training accuracy returned by train().
+"""
+
+import itertools
+import json
+import os
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+from sklearn.model_selection import StratifiedKFold
+
+from .chatbot_model import ChatbotMLModel
+from .preprocessing import NLPPreprocessor
+
+# Settings searched by default. Thresholds are applied to the predictions of
+# each fitted model, so they do not multiply the number of trainings.
+DEFAULT_GRID = {
+    "hidden_layer_sizes": [(16, 8), (32,), (64, 32)],
+    "alpha": [0.0001, 0.001, 0.01],
+    "max_iter": [500],
+    "vectorizer": [
+        {"mode": "tfidf"},
+        {"mode": "tfidf", "ngram_range": (1, 2), "sublinear_tf": True},
+        {"mode": "hashing", "n_features": 2 ** 14},
+    ],
+    "backend": ["mlp"],
+    "confidence_threshold": [0.3, 0.4, 0.5, 0.6, 0.7],
+}
+
+# Settings of the MLP network, ignored by the other backends
+MLP_SETTINGS = ("hidden_layer_sizes", "alpha", "max_iter")
+
+# Held-out patterns timed one message at a time per fold
+SINGLE_PREDICTION_SAMPLE = 20
+
+# Per-process state of a worker, set by _init_worker()
+_worker_texts = None
+_worker_labels = None
+_worker_preprocessor = None
+
+
+class _FoldRepository:
+    """Training split of one fold in the ChatbotDataRepository shape"""
+
+    def __init__(self, texts, labels):
+        self.texts = texts
+        self.labels = labels
+
+    def get_training_data(self):
+        return self.texts, self.labels
+
+    def get_response_for_intent(self, intent):
+        return ""
+
+    def get_fallback_response(self):
+        return ""
+
+
+def _init_worker(texts, labels, preprocessor):
+    """Keep the corpus in the worker so tasks only carry fold indices"""
+    global _worker_texts, _worker_labels, _worker_preprocessor
+    _worker_texts = texts
+    _worker_labels = labels
+    _worker_preprocessor = preprocessor
+
+
+def _evaluate_fold(config, train_index, test_index):
+    """
+    Train on one fold's training split and predict its held-out patterns
+    (runs in worker processes)
+
+    Returns:
+        dict: Per-pattern correctness and confidence plus timings
+    """
+    repository = _FoldRepository([_worker_texts[i] for i in train_index],
+                                 [_worker_labels[i] for i in train_index])
+    model = ChatbotMLModel(repository, _worker_preprocessor)
+    model.configure(config)
+    # Keep every prediction; thresholds are applied afterwards
+    model.confidence_threshold = 0.0
+
+    with warnings.catch_warnings():
+        # Small folds rarely converge fully; that is part of what is scored
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        start = time.perf_counter()
+        model.train()
+        train_seconds = time.perf_counter() - start
+
+    test_texts = [_worker_texts[i] for i in test_index]
+    start = time.perf_counter()
+    intents, confidences, _ = model.predict_batch(test_texts)
+    batch_seconds = time.perf_counter() - start
+
+    sample = test_texts[:SINGLE_PREDICTION_SAMPLE]
+    start = time.perf_counter()
+    for text in sample:
+        model.predict_intent(text)
+    single_seconds = time.perf_counter() - start
+
+    correct = [intent == _worker_labels[i] for intent, i in zip(intents, test_index)]
+    return {
+        "correct": correct,
+        "confidences": confidences.tolist(),
+        "train_seconds": train_seconds,
+        "batch_predict_us": batch_seconds / len(test_texts) * 1e6,
+        "predict_ms": single_seconds / len(sample) * 1000.0,
+    }
+
+
+class ModelSelector:
+    """
+    Model Layer: Grid search scored by stratified k-fold cross-validation.
+    A configuration's score is its held-out accuracy minus error_cost times
+    its rate of confident wrong answers; fallbacks cost nothing beyond the
+    lost correct answer. With error_cost 0 the lowest threshold always wins,
+    higher values favour falling back over guessing.
+    """
+
+    def __init__(self, data_repository, preprocessor=None, grid=None, n_splits=5,
+                 processes=None, error_cost=1.0, random_state=42):
+        """
+        Initialize the selector
+
+        Args:
+            data_repository (ChatbotDataRepository): Training data source
+            preprocessor (NLPPreprocessor, optional): Text preprocessor;
+                defaults to NLPPreprocessor()
+            grid (dict, optional): Lists of values per setting (see
+                DEFAULT_GRID); missing settings use DEFAULT_GRID
+            n_splits (int): Folds; lowered to the size of the smallest
+                intent when needed
+            processes (int, optional): Worker processes; defaults to the
+                number of CPUs, 1 runs in this process
+            error_cost (float): Weight of a wrong answer relative to a
+                correct one in the score
+            random_state (int): Seed of the fold shuffle
+        """
+        if n_splits < 2:
+            raise ValueError("n_splits must be at least 2")
+
+        self.data_repository = data_repository
+        self.preprocessor = preprocessor if preprocessor is not None else NLPPreprocessor()
+        self.grid = dict(DEFAULT_GRID)
+        self.grid.update(grid or {})
+        self.n_splits = n_splits
+        self.processes = processes or os.cpu_count() or 1
+        self.error_cost = error_cost
+        self.random_state = random_state
+
+    def configurations(self):
+        """
+        List the configurations that need their own training
+
+        Returns:
+            list of dict: configure() settings without a threshold
+        """
+        names = [name for name in self.grid if name != "confidence_threshold"]
+        configurations = []
+        for values in itertools.product(*(self.grid[name] for name in names)):
+            config = dict(zip(names, values))
+            if config.get("backend", "mlp") != "mlp":
+                # Network settings do not apply, so train each other
+                # combination once
+                for name in MLP_SETTINGS:
+                    config.pop(name, None)
+            if config not in configurations:
+                configurations.append(config)
+        return configurations
+
+    def _folds(self, labels):
+        """Stratified (train, test) index pairs"""
+        _, counts = np.unique(labels, return_counts=True)
+        n_splits = max(2, min(self.n_splits, int(counts.min())))
+        if counts.min() < n_splits:
+            print(f"Warning: some intents have fewer than {n_splits} patterns "
+                  "and are missing from some training folds")
+        splitter = StratifiedKFold(n_splits=n_splits, shuffle=True,
+                                   random_state=self.random_state)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)
+            return [(train.tolist(), test.tolist())
+                    for train, test in splitter.split(np.zeros(len(labels)), labels)]
+
+    def run(self, progress_callback=None):
+        """
+        Cross-validate every configuration and threshold
+
+        Args:
+            progress_callback (callable, optional): Called with (finished,
+                total) fold trainings
+
+        Returns:
+            dict: Report with "results" (best first, one row per
+                configuration and threshold) and "best"
+        """
+        start = time.perf_counter()
+        texts, labels = self.data_repository.get_training_data()
+        texts, labels = list(texts), list(labels)
+        folds = self._folds(labels)
+        configurations = self.configurations()
+        tasks = [(c, f) for c in range(len(configurations)) for f in range(len(folds))]
+        outcomes = {}
+
+        def finished(task, outcome):
+            outcomes[task] = outcome
+            if progress_callback is not None:
+                progress_callback(len(outcomes), len(tasks))
+
+        if self.processes <= 1:
+            _init_worker(texts, labels, self.preprocessor)
+            for c, f in tasks:
+                finished((c, f), _evaluate_fold(configurations[c], *folds[f]))
+        else:
+            with ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                     initargs=(texts, labels, self.preprocessor)) as pool:
+                futures = {pool.submit(_evaluate_fold, configurations[c], *folds[f]): (c, f)
+                           for c, f in tasks}
+                for future in as_completed(futures):
+                    finished(futures[future], future.result())
+
+        results = []
+        for c, config in enumerate(configurations):
+            fold_outcomes = [outcomes[(c, f)] for f in range(len(folds))]
+            for threshold in self.grid["confidence_threshold"]:
+                row = self._score(fold_outcomes, threshold)
+                row["config"] = dict(config, confidence_threshold=threshold)
+                results.append(row)
+        results.sort(key=lambda row: (-row["score"], -row["accuracy"], row["train_seconds"]))
+
+        return {
+            "n_examples": len(texts),
+            "n_intents": len(set(labels)),
+            "n_splits": len(folds),
+            "n_trainings": len(tasks),
+            "processes": self.processes,
+            "error_cost": self.error_cost,
+            "seconds": time.perf_counter() - start,
+            "results": results,
+            "best": results[0],
+        }
+
+    def _score(self, fold_outcomes, threshold):
+        """Aggregate one configuration's folds at one threshold"""
+        fold_accuracy, fallback, error = [], [], []
+        for outcome in fold_outcomes:
+            correct = np.asarray(outcome["correct"], dtype=bool)
+            answered = np.asarray(outcome["confidences"]) >= threshold
+            fold_accuracy.append(np.mean(correct & answered))
+            fallback.append(np.mean(~answered))
+            error.append(np.mean(answered & ~correct))
+
+        accuracy = float(np.mean(fold_accuracy))
+        fallback_rate = float(np.mean(fallback))
+        error_rate = float(np.mean(error))
+        return {
+            "score": accuracy - self.error_cost * error_rate,
+            "accuracy": accuracy,
+            "accuracy_std": float(np.std(fold_accuracy)),
+            "fallback_rate": fallback_rate,
+            "error_rate": error_rate,
+            "answered_accuracy": accuracy / (1.0 - fallback_rate) if fallback_rate < 1.0 else 0.0,
+            "train_seconds": float(np.mean([o["train_seconds"] for o in fold_outcomes])),
+            "predict_ms": float(np.mean([o["predict_ms"] for o in fold_outcomes])),
+            "batch_predict_us": float(np.mean([o["batch_predict_us"] for o in fold_outcomes])),
+        }
+
+
+def save_model_config(path, config, report=None):
+    """
+    Persist a configuration as JSON (written atomically)
+
+    Args:
+        path (str): Destination file
+        config (dict): configure() settings
+        report (dict, optional): The winning result row, stored alongside
+            for reference
+    """
+    payload = {"config": config}
+    if report is not None:
+        payload["cross_validation"] = {key: value for key, value in report.items()
+                                       if key != "config"}
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_model_config(path):
+    """
+    Load a configuration saved by save_model_config()
+
+    Args:
+        path (str): Configuration file
+
+    Returns:
+        dict or None: {"config": ..., "cross_validation": ...}, or None if
+            the file does not exist
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,41 @@
+"""
+Model Layer: Prediction results
+================================
+This module contains the PredictionResult class returned by the model's
+structured prediction API.
+"""
+
+
+class PredictionResult:
+    """
+    Model Layer: Lightweight record of a single intent prediction.
+    Holds the chosen intent, its confidence, the top-k alternatives and the
+    response text selected for the user.
+    """
+    
+    __slots__ = ("intent", "confidence", "alternatives", "response")
+    
+    def __init__(self, intent, confidence, alternatives, response):
+        """
+        Initialize the prediction result
+        
+        Args:
+            intent (str or None): Predicted intent, None if below threshold
+            confidence (float): Probability of the top intent
+            alternatives (list): (intent, probability) pairs, best first
+            response (str): Bot response message
+        """
+        self.intent = intent
+        self.confidence = confidence
+        self.alternatives = alternatives
+        self.response = response
+    
+    @property
+    def is_fallback(self):
+        """True when confidence was too low and the fallback was used"""
+        return self.intent is None
+    
+    def __repr__(self):
+        return (f"PredictionResult(intent={self.intent!r}, "
+                f"confidence={self.confidence:.3f}, "
+                f"alternatives={self.alternatives!r})")
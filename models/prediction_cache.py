@@ -0,0 +1,106 @@
+"""
+Model Layer: Prediction cache
+==============================
+This module contains the PredictionCache class, a bounded LRU cache of
+intent decisions keyed on normalized input text.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PredictionCache:
+    """
+    Model Layer: Bounded, thread-safe LRU cache with optional TTL.
+    Stores intent decisions (not response text) so replies still vary.
+    """
+    
+    def __init__(self, max_entries=1024, ttl_seconds=None):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries (int): Maximum number of cached decisions
+            ttl_seconds (float, optional): Entry lifetime; None never expires
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        
+        # Monitoring counters
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """
+        Look up a cached value and mark it as recently used
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            The cached value, or None on a miss or an expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key, value):
+        """
+        Store a value, evicting the least recently used entry when full
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        expires_at = None
+        if self.ttl_seconds is not None:
+            expires_at = time.monotonic() + self.ttl_seconds
+        
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached entries (counters are kept)"""
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self):
+        """
+        Get cache counters for monitoring
+        
+        Returns:
+            dict: Hits, misses, hit rate, current size and capacity
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+    
+    def __len__(self):
+        return len(self._entries)
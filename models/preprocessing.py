@@ -0,0 +1,184 @@
+"""
+Model Layer: NLP preprocessing
+===============================
+This module contains the NLPPreprocessor class which cleans and normalizes
+text for the model, one string at a time or as a stream of batches.
+"""
+
+import re
+import time
+import unicodedata
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, update_wrapper
+from itertools import islice
+
+from metrics import metrics
+
+
+@lru_cache(maxsize=1)
+def _combining_marks_table():
+    """str.translate table deleting every Unicode combining mark (built once)"""
+    return {
+        code_point: None
+        for code_point in range(0x110000)
+        if unicodedata.combining(chr(code_point))
+    }
+
+
+class _default_instance_method:
+    """
+    Method that can also be called on the class, where it runs on a
+    default-constructed instance (keeps NLPPreprocessor.preprocess(text),
+    once a staticmethod, working with the original ASCII behaviour)
+    """
+
+    def __init__(self, func):
+        self.func = func
+        update_wrapper(self, func)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner._default()
+        return self.func.__get__(instance, owner)
+
+
+def _preprocess_chunk(preprocessor, chunk):
+    """Preprocess a list of strings (runs in pool worker processes)"""
+    return [preprocessor._clean(text) for text in chunk]
+
+
+class NLPPreprocessor:
+    """
+    Model Layer: Handles text preprocessing for NLP tasks.
+    Responsible for cleaning and normalizing input text.
+    """
+
+    NORMALIZATION_FORMS = ("NFC", "NFKC", "NFD", "NFKD")
+
+    # Legacy ASCII mode keeps only lowercase letters, digits and whitespace
+    _ASCII_STRIP = re.compile(r"[^a-z0-9\s]")
+
+    # Unicode mode keeps word characters of any script (minus underscore)
+    _UNICODE_STRIP = re.compile(r"[^\w\s]|_")
+
+    def __init__(self, unicode_normalization=None, fold_accents=False):
+        """
+        Initialize the preprocessor
+
+        Args:
+            unicode_normalization (str, optional): One of NORMALIZATION_FORMS
+                to keep non-ASCII text; None keeps the original ASCII-only
+                behaviour
+            fold_accents (bool): Strip accents (e.g. "café" -> "cafe");
+                only used with unicode_normalization
+        """
+        if (unicode_normalization is not None
+                and unicode_normalization not in self.NORMALIZATION_FORMS):
+            raise ValueError(f"Unknown normalization form: {unicode_normalization}")
+
+        self.unicode_normalization = unicode_normalization
+        self.fold_accents = fold_accents
+
+        # Throughput of the most recent preprocess_batch() run
+        self.last_batch_stats = None
+
+    @classmethod
+    def _default(cls):
+        """Shared instance with the default (ASCII) settings"""
+        if cls.__dict__.get("_default_preprocessor") is None:
+            cls._default_preprocessor = cls()
+        return cls._default_preprocessor
+
+    @_default_instance_method
+    def preprocess(self, text):
+        """
+        Basic text preprocessing: lowercase + remove extra chars.
+        Also callable on the class (NLPPreprocessor.preprocess(text)),
+        which uses the default ASCII-only settings.
+
+        Args:
+            text (str): Raw input text
+
+        Returns:
+            str: Cleaned and normalized text
+        """
+        with metrics.timer("preprocess"):
+            return self._clean(text)
+
+    def _clean(self, text):
+        """preprocess() without instrumentation (used for batches)"""
+        if self.unicode_normalization is None:
+            text = text.lower().strip()
+            return self._ASCII_STRIP.sub("", text)  # remove punctuation
+
+        text = unicodedata.normalize(self.unicode_normalization, text)
+        if self.fold_accents:
+            # Decompose, then drop the combining marks
+            decomposed = "NFKD" if self.unicode_normalization.startswith("NFK") else "NFD"
+            text = unicodedata.normalize(decomposed, text).translate(_combining_marks_table())
+        text = text.casefold().strip()
+        return self._UNICODE_STRIP.sub("", text)
+
+    def preprocess_batch(self, texts, chunk_size=10000, processes=None):
+        """
+        Stream preprocessed text for an iterable of strings, in input order.
+        Throughput is recorded in last_batch_stats once the stream ends.
+
+        Args:
+            texts (iterable of str): Raw texts (may be a generator)
+            chunk_size (int): Strings handled per chunk
+            processes (int, optional): Worker processes for large corpora;
+                None or 1 preprocesses in this process
+
+        Yields:
+            str: Cleaned and normalized text
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+
+        iterator = iter(texts)
+        chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+        count = 0
+        busy_seconds = 0.0
+
+        if processes is None or processes <= 1:
+            preprocess = self._clean
+            for chunk in chunks:
+                start = time.perf_counter()
+                cleaned = [preprocess(text) for text in chunk]
+                busy_seconds += time.perf_counter() - start
+                count += len(cleaned)
+                yield from cleaned
+        else:
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                # Bound the chunks in flight so generators are not drained eagerly
+                pending = deque()
+                for chunk in chunks:
+                    pending.append(pool.submit(_preprocess_chunk, self, chunk))
+                    if len(pending) >= 2 * processes:
+                        cleaned = pending.popleft().result()
+                        count += len(cleaned)
+                        yield from cleaned
+                while pending:
+                    cleaned = pending.popleft().result()
+                    count += len(cleaned)
+                    yield from cleaned
+            busy_seconds = time.perf_counter() - start
+
+        self.last_batch_stats = {
+            "strings": count,
+            "seconds": busy_seconds,
+            "strings_per_second": count / busy_seconds if busy_seconds else 0.0,
+        }
+
+    def get_config(self):
+        """Return the settings that change preprocessing output"""
+        return {
+            "unicode_normalization": self.unicode_normalization,
+            "fold_accents": self.fold_accents,
+        }
@@ -0,0 +1,49 @@
+"""
+Model Layer: Text vectorizers
+==============================
+This module builds the text-to-feature vectorizers used by ChatbotMLModel:
+the vocabulary-based TF-IDF vectorizer and a bounded-memory hashing mode.
+"""
+
+from sklearn.feature_extraction.text import (HashingVectorizer, TfidfTransformer,
+                                             TfidfVectorizer)
+from sklearn.pipeline import make_pipeline
+
+VECTORIZER_MODES = ("tfidf", "hashing")
+
+
+def create_vectorizer(mode, hashing_parameters=None, tfidf_parameters=None):
+    """
+    Create an unfitted vectorizer
+
+    "tfidf" stores a vocabulary that grows with every distinct token.
+    "hashing" maps tokens into a fixed number of columns, so memory and
+    artifact size stay flat and unseen words need no refit; with use_idf
+    an IDF reweighting stage (one weight per column) is fitted on top.
+    n_features also sets the classifier's input width, so it trades hash
+    collisions against model size.
+
+    Args:
+        mode (str): One of VECTORIZER_MODES
+        hashing_parameters (dict, optional): n_features and use_idf for
+            the hashing mode
+        tfidf_parameters (dict, optional): TfidfVectorizer settings (e.g.
+            ngram_range, sublinear_tf) for the tfidf mode
+
+    Returns:
+        Vectorizer with fit_transform() and transform()
+    """
+    if mode == "tfidf":
+        return TfidfVectorizer(**(tfidf_parameters or {}))
+
+    if mode == "hashing":
+        params = hashing_parameters or {}
+        n_features = params.get("n_features", 2 ** 14)
+        if params.get("use_idf", True):
+            return make_pipeline(
+                HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None),
+                TfidfTransformer()
+            )
+        return HashingVectorizer(n_features=n_features, alternate_sign=False, norm="l2")
+
+    raise ValueError(f"Unknown vectorizer mode: {mode}")
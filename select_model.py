@@ -0,0 +1,131 @@
+"""
+Deep Learning Chatbot Model Selection
+======================================
+Headless entry point that cross-validates model configurations on the
+training data and saves the best one to model_config.json, which main.py
+and serve.py apply before loading or training the model.
+
+To run the search on 4 worker processes:
+    python select_model.py --folds 5 --processes 4
+
+To compare only thresholds and regularization:
+    python select_model.py --thresholds 0.4 0.6 --alphas 0.001 0.01
+
+To also try the nearest-neighbour backend:
+    python select_model.py --backends mlp nearest_neighbour
+
+To select on intent files instead of the built-in data (CHATBOT_DATA_PATH,
+as used by main.py, is the default):
+    python select_model.py --data knowledge_base/
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Configuration applied by main.py and serve.py when present
+MODEL_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "model_config.json")
+
+# Intent files or directories (os.pathsep-separated) main.py trains on, and
+# where their parsed contents are cached
+DATA_PATHS = os.environ.get("CHATBOT_DATA_PATH")
+INTENT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".model_cache", "intents")
+
+
+def parse_hidden_sizes(text):
+    """Parse hidden layer sizes such as '16,8' or '32'"""
+    try:
+        return tuple(int(part) for part in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"hidden sizes must look like 16,8, got {text!r}")
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Cross-validate chatbot model configurations")
+    parser.add_argument("--folds", type=int, default=5,
+                        help="stratified folds (lowered for intents with fewer patterns)")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes (default: number of CPUs)")
+    parser.add_argument("--hidden-sizes", type=parse_hidden_sizes, nargs="+", default=None,
+                        help="hidden layer sizes to try, e.g. 16,8 32")
+    parser.add_argument("--alphas", type=float, nargs="+", default=None,
+                        help="L2 regularization strengths to try")
+    parser.add_argument("--thresholds", type=float, nargs="+", default=None,
+                        help="confidence thresholds to try")
+    parser.add_argument("--backends", nargs="+", default=None,
+                        choices=["mlp", "nearest_neighbour"],
+                        help="classifier backends to try (default: mlp)")
+    parser.add_argument("--data", nargs="+",
+                        default=DATA_PATHS.split(os.pathsep) if DATA_PATHS else None,
+                        help="JSON/JSONL/CSV intent files or directories to select on "
+                             "(default: CHATBOT_DATA_PATH, else the built-in data)")
+    parser.add_argument("--error-cost", type=float, default=1.0,
+                        help="cost of a wrong answer relative to a correct one")
+    parser.add_argument("--output", default=MODEL_CONFIG_PATH,
+                        help="where the best configuration is saved")
+    parser.add_argument("--report", default=None,
+                        help="also write the full report as JSON to this file")
+    parser.add_argument("--top", type=int, default=10,
+                        help="result rows printed")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    args = parse_args(argv)
+
+    from data import ChatbotDataRepository, FileIntentRepository
+    from models.model_selection import ModelSelector, save_model_config
+
+    grid = {}
+    if args.hidden_sizes:
+        grid["hidden_layer_sizes"] = args.hidden_sizes
+    if args.alphas:
+        grid["alpha"] = args.alphas
+    if args.thresholds:
+        grid["confidence_threshold"] = args.thresholds
+    if args.backends:
+        grid["backend"] = args.backends
+
+    if args.data:
+        repository = FileIntentRepository(args.data, cache_dir=INTENT_CACHE_DIR)
+        repository.load()
+        for line in repository.load_summary():
+            print(line)
+    else:
+        repository = ChatbotDataRepository()
+
+    selector = ModelSelector(repository, grid=grid, n_splits=args.folds,
+                             processes=args.processes, error_cost=args.error_cost)
+
+    def progress(done, total):
+        print(f"\rTrained {done}/{total} folds", end="", file=sys.stderr, flush=True)
+
+    report = selector.run(progress)
+    print(file=sys.stderr)
+
+    print(f"{report['n_trainings']} trainings ({report['n_splits']} folds, "
+          f"{report['n_examples']} patterns) in {report['seconds']:.1f}s "
+          f"on {report['processes']} processes")
+    print(f"{'score':>6} {'acc':>6} {'fallbk':>6} {'error':>6} {'train s':>8} "
+          f"{'pred ms':>8}  config")
+    for row in report["results"][:args.top]:
+        print(f"{row['score']:6.3f} {row['accuracy']:6.3f} {row['fallback_rate']:6.3f} "
+              f"{row['error_rate']:6.3f} {row['train_seconds']:8.3f} "
+              f"{row['predict_ms']:8.3f}  {json.dumps(row['config'])}")
+
+    best = report["best"]
+    save_model_config(args.output, best["config"], best)
+    print(f"Saved the best configuration to {args.output}")
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+Deep Learning Chatbot HTTP Server
+==================================
+Headless entry point that serves the chatbot model over HTTP/JSON on
+localhost (no Tk required). Concurrent requests are micro-batched into
+single vectorized model calls.
+
+To run the server:
+    python serve.py --port 8000 --max-batch-size 32 --max-wait-ms 5
+
+To spread inference over 4 worker processes sharing one copy of the model:
+    python serve.py --workers 4
+
+Example request:
+    curl -X POST localhost:8000/predict -d '{"text": "hello"}'
+"""
+
+import argparse
+import os
+import time
+
+from metrics import metrics
+from server import ChatbotHTTPServer, InferenceWorkerPool
+
+# Same artifact as the desktop app, so a model trained by either is reused
+MODEL_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                   ".model_cache", "chatbot_model.pkl")
+
+# Model configuration chosen by select_model.py (optional)
+MODEL_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 "model_config.json")
+
+# Where parsed intent files (--data) are cached
+INTENT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".model_cache", "intents")
+
+
+def load_model(data_paths=None):
+    """
+    Load the persisted model or train a new one
+
+    Args:
+        data_paths (list of str, optional): Intent files or directories;
+            the built-in training data when omitted
+
+    Returns:
+        ChatbotMLModel: The trained model
+    """
+    from data import ChatbotDataRepository, FileIntentRepository
+    from models import NLPPreprocessor, ChatbotMLModel, ModelArtifactStore
+    from models.model_selection import load_model_config
+
+    start = time.perf_counter()
+    if data_paths:
+        repository = FileIntentRepository(data_paths, cache_dir=INTENT_CACHE_DIR)
+    else:
+        repository = ChatbotDataRepository()
+    model = ChatbotMLModel(repository, NLPPreprocessor(),
+                           ModelArtifactStore(MODEL_ARTIFACT_PATH))
+    saved = load_model_config(MODEL_CONFIG_PATH)
+    if saved is not None:
+        model.configure(saved["config"])
+    accuracy = model.load_or_train()
+    if data_paths:
+        for line in repository.load_summary():
+            print(line)
+    print(f"Model ready in {time.perf_counter() - start:.2f}s "
+          f"(training accuracy {accuracy:.2f}%)")
+    return model
+
+
+def parse_args(argv=None):
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Serve the chatbot over HTTP/JSON")
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="interface to listen on (default: localhost only)")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch-size", type=int, default=32,
+                        help="most requests classified in one model call")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0,
+                        help="longest a request waits for its batch to fill")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="inference worker processes (0: classify in this process)")
+    parser.add_argument("--max-waiting", type=int, default=None,
+                        help="requests allowed to wait for a batch before "
+                             "answering 503 (default: 64 full batches per batch slot)")
+    parser.add_argument("--keep-alive-timeout", type=float, default=15.0,
+                        help="seconds an idle keep-alive connection is kept open")
+    parser.add_argument("--data", nargs="+", default=None,
+                        help="JSON/JSONL/CSV intent files or directories to train on")
+    parser.add_argument("--metrics", action="store_true",
+                        help="collect per-stage latency metrics (see GET /stats)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Command line entry point"""
+    args = parse_args(argv)
+    if args.metrics:
+        metrics.enable()
+
+    model = load_model(args.data)
+    pool = None
+    if args.workers > 0:
+        try:
+            # One batch per worker runs at a time; the pool queues one more each
+            pool = InferenceWorkerPool(model, workers=args.workers)
+        except ValueError as e:
+            # The model cannot be compiled for the workers (e.g. hashing
+            # features or n-grams from model_config.json)
+            print(f"Warning: ignoring --workers, classifying in this process: {e}")
+    if pool is not None:
+        pool.warm_up()
+        print(f"Started {pool.workers} inference workers "
+              f"({pool.shared_bytes / 1024:.0f} KiB of shared model arrays)")
+        predict_batch = pool.predict_batch
+        concurrent_batches = pool.workers
+    else:
+        predict_batch = model.predict_batch
+        concurrent_batches = 1
+
+    max_waiting = args.max_waiting
+    if max_waiting is None:
+        max_waiting = 64 * args.max_batch_size * concurrent_batches
+
+    server = ChatbotHTTPServer(
+        predict_batch,
+        host=args.host,
+        port=args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        keep_alive_timeout=args.keep_alive_timeout,
+        max_concurrent_batches=concurrent_batches,
+        max_waiting=max_waiting,
+    )
+    print(f"Serving on http://{args.host}:{args.port} "
+          f"(batch size {args.max_batch_size}, wait {args.max_wait_ms} ms)")
+    try:
+        server.run()
+    finally:
+        if pool is not None:
+            pool.close()
+
+
+if __name__ == "__main__":
+    main()
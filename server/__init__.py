@@ -0,0 +1,12 @@
+"""
+Server Package
+Contains the headless HTTP/JSON serving mode: an asyncio HTTP server, the
+micro-batcher that groups concurrent requests into one model call, and the
+multi-process inference worker pool.
+"""
+
+from .http_server import ChatbotHTTPServer
+from .micro_batcher import MicroBatcher, OverloadedError
+from .worker_pool import InferenceWorkerPool
+
+__all__ = ['ChatbotHTTPServer', 'MicroBatcher', 'OverloadedError', 'InferenceWorkerPool']
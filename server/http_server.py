@@ -0,0 +1,275 @@
+"""
+Server: HTTP/JSON front end
+============================
+This module contains the ChatbotHTTPServer class, a small HTTP/1.1 server
+built on asyncio streams (standard library only). Requests are answered
+through a MicroBatcher so concurrent clients share vectorized model calls.
+
+Endpoints:
+    POST /predict        {"text": "..."}        -> one prediction
+    POST /predict_batch  {"texts": ["...", ...]} -> a list of predictions
+    GET  /health                                 -> {"status": "ok"}
+    GET  /stats                                  -> batching and metrics
+"""
+
+import asyncio
+import json
+import time
+from http import HTTPStatus
+
+from metrics import metrics
+from .micro_batcher import MicroBatcher, OverloadedError
+
+
+class _HTTPError(Exception):
+    """An error answered with the given status code"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ChatbotHTTPServer:
+    """
+    Server: Serves predictions over HTTP/JSON on one event loop.
+    Connections are kept alive (HTTP/1.1 default, or HTTP/1.0 with
+    "Connection: keep-alive") until the client closes them or stays idle
+    for keep_alive_timeout seconds. Every response carries its server-side
+    latency in an X-Response-Time-Ms header. When more than max_waiting
+    texts are waiting for a batch, requests are refused with 503.
+    """
+
+    def __init__(self, predict_batch, host="127.0.0.1", port=8000, max_batch_size=32,
+                 max_wait_ms=5.0, keep_alive_timeout=15.0, max_body_bytes=1 << 20,
+                 max_concurrent_batches=1, max_waiting=None):
+        """
+        Initialize the server
+
+        Args:
+            predict_batch (callable): Batch prediction function, e.g.
+                ChatbotMLModel.predict_batch
+            host (str): Interface to listen on (localhost by default)
+            port (int): TCP port; 0 picks a free one
+            max_batch_size (int): Most texts per model call
+            max_wait_ms (float): Longest a request waits for a batch to fill
+            keep_alive_timeout (float): Seconds an idle connection is kept
+            max_body_bytes (int): Largest accepted request body
+            max_concurrent_batches (int): Batches classified in parallel
+            max_waiting (int, optional): Texts allowed to wait for a batch
+                before requests are refused; None is unbounded
+        """
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_bytes = max_body_bytes
+        self.batcher = MicroBatcher(predict_batch, max_batch_size, max_wait_ms,
+                                    max_concurrent_batches, max_waiting)
+
+        self._server = None
+        self._started = None
+        self.requests = 0
+
+        self._routes = {
+            ("POST", "/predict"): self._handle_predict,
+            ("POST", "/predict_batch"): self._handle_predict_batch,
+            ("GET", "/health"): self._handle_health,
+            ("GET", "/stats"): self._handle_stats,
+        }
+
+    # ===== Lifecycle =====
+
+    async def start(self):
+        """Start listening (call from the running event loop)"""
+        self.batcher.start()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Report the real port when 0 was requested
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started = time.time()
+
+    async def serve_forever(self):
+        """Start if needed and serve until cancelled"""
+        if self._server is None:
+            await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def stop(self):
+        """Stop listening and fail requests still waiting for a batch"""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.stop()
+
+    def run(self):
+        """Serve on a new event loop until interrupted (Ctrl+C)"""
+        try:
+            asyncio.run(self.serve_forever())
+        except KeyboardInterrupt:
+            pass
+
+    # ===== Connections =====
+
+    async def _handle_connection(self, reader, writer):
+        """Answer requests on one connection until it closes"""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader),
+                                                     self.keep_alive_timeout)
+                except _HTTPError as e:
+                    self._write_response(writer, e.status, {"error": e.message}, 0.0, False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+
+                start = time.perf_counter()
+                method, path, version, headers, body = request
+                status, payload = await self._dispatch(method, path, body)
+                latency_ms = (time.perf_counter() - start) * 1000.0
+                metrics.record("http_request", int(latency_ms * 1000))
+                self.requests += 1
+
+                keep_alive = self._keep_alive(version, headers)
+                self._write_response(writer, status, payload, latency_ms, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            # Idle keep-alive timeout or client went away
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        """
+        Read one request
+
+        Returns:
+            tuple or None: (method, path, version, headers, body), or None
+                when the client closed the connection
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, version = line.decode("latin-1").split()
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n"):
+                break
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.max_body_bytes:
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Request body too large")
+        body = await reader.readexactly(length) if length else b""
+
+        path = target.split("?", 1)[0]
+        return method.upper(), path, version.upper(), headers, body
+
+    @staticmethod
+    def _keep_alive(version, headers):
+        """Whether the connection stays open after this response"""
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    @staticmethod
+    def _write_response(writer, status, payload, latency_ms, keep_alive):
+        """Write a JSON response"""
+        status = HTTPStatus(status)
+        body = json.dumps(payload).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"X-Response-Time-Ms: {latency_ms:.3f}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+
+    # ===== Routing =====
+
+    async def _dispatch(self, method, path, body):
+        """
+        Run the handler for a request
+
+        Returns:
+            tuple: (HTTP status, JSON-serializable payload)
+        """
+        handler = self._routes.get((method, path))
+        if handler is None:
+            if any(route_path == path for _, route_path in self._routes):
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": f"{method} not allowed"}
+            return HTTPStatus.NOT_FOUND, {"error": f"Unknown path: {path}"}
+
+        try:
+            return HTTPStatus.OK, await handler(body)
+        except _HTTPError as e:
+            return e.status, {"error": e.message}
+        except OverloadedError as e:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(e)}
+        except Exception as e:
+            print(f"Error handling {method} {path}: {e}")
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error"}
+
+    @staticmethod
+    def _parse_json(body):
+        """Decode a JSON object request body"""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Body must be valid JSON")
+        if not isinstance(payload, dict):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, "Body must be a JSON object")
+        return payload
+
+    @staticmethod
+    def _prediction(result):
+        """JSON form of a (intent, confidence, response) tuple"""
+        intent, confidence, response = result
+        return {"intent": intent, "confidence": confidence, "response": response}
+
+    async def _handle_predict(self, body):
+        text = self._parse_json(body).get("text")
+        if not isinstance(text, str):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, '"text" must be a string')
+        return self._prediction(await self.batcher.submit(text))
+
+    async def _handle_predict_batch(self, body):
+        texts = self._parse_json(body).get("texts")
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            raise _HTTPError(HTTPStatus.BAD_REQUEST, '"texts" must be a list of strings')
+        results = await asyncio.gather(*(self.batcher.submit(text) for text in texts))
+        return {"results": [self._prediction(result) for result in results]}
+
+    async def _handle_health(self, body):
+        return {"status": "ok", "uptime_seconds": time.time() - self._started}
+
+    async def _handle_stats(self, body):
+        return {
+            "requests": self.requests,
+            "batching": self.batcher.get_stats(),
+            "metrics": metrics.snapshot(),
+        }
@@ -0,0 +1,194 @@
+"""
+Server: Micro-batching
+=======================
+This module contains the MicroBatcher class which collects concurrent
+prediction requests on the asyncio event loop and classifies them together
+in one vectorized predict_batch() call.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+
+
+class OverloadedError(Exception):
+    """Raised when too many texts are already waiting for a batch"""
+
+
+class MicroBatcher:
+    """
+    Server: Groups single-text requests into batches.
+    A batch is closed when it holds max_batch_size texts or max_wait_ms
+    after its first text arrived, whichever comes first. Up to
+    max_concurrent_batches batches run at once on worker threads; texts
+    arriving meanwhile form the next batch.
+    """
+
+    def __init__(self, predict_batch, max_batch_size=32, max_wait_ms=5.0,
+                 max_concurrent_batches=1, max_waiting=None):
+        """
+        Initialize the batcher
+
+        Args:
+            predict_batch (callable): Takes a list of texts and returns
+                (intents, confidences, responses) sequences, like
+                ChatbotMLModel.predict_batch()
+            max_batch_size (int): Most texts classified per call
+            max_wait_ms (float): Longest a text waits for others to join
+            max_concurrent_batches (int): Batches classified in parallel
+                (more than one only helps with a thread-safe, GIL-free
+                predict_batch such as InferenceWorkerPool's)
+            max_waiting (int, optional): Texts allowed to wait for a batch;
+                submit() raises OverloadedError beyond this. None is unbounded
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait_ms < 0:
+            raise ValueError("max_wait_ms must not be negative")
+        if max_concurrent_batches < 1:
+            raise ValueError("max_concurrent_batches must be at least 1")
+
+        self.predict_batch = predict_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_concurrent_batches = max_concurrent_batches
+        self.max_waiting = max_waiting
+
+        self._queue = None
+        self._task = None
+        self._executor = None
+        self._slots = None
+        self._running = set()
+        self.batches = 0
+        self.texts = 0
+        self.rejected = 0
+
+    def start(self):
+        """Start the batching task (call from the running event loop)"""
+        if self._task is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_batches,
+                                            thread_name_prefix="micro-batch")
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the batching task; pending requests fail"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        for task in list(self._running):
+            task.cancel()
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Server is shutting down"))
+        self._executor.shutdown(wait=False)
+
+    async def submit(self, text):
+        """
+        Classify one text as part of the next batch
+
+        Args:
+            text (str): User input text
+
+        Returns:
+            tuple: (intent or None, confidence, response)
+
+        Raises:
+            OverloadedError: If max_waiting texts are already waiting
+        """
+        if self.max_waiting is not None and self._queue.qsize() >= self.max_waiting:
+            self.rejected += 1
+            raise OverloadedError("Too many requests waiting")
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((text, future))
+        return await future
+
+    async def _collect(self):
+        """Wait for a first text, then gather more until full or timed out"""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        """Batching loop: collect a batch whenever a batch slot is free"""
+        while True:
+            await self._slots.acquire()
+            try:
+                batch = await self._collect()
+            except BaseException:
+                self._slots.release()
+                raise
+            task = asyncio.get_running_loop().create_task(self._classify(batch))
+            self._running.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task):
+        """Free the batch slot of a finished batch"""
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _classify(self, batch):
+        """Classify one batch on a worker thread and resolve its futures"""
+        # Skip texts whose client already went away
+        batch = [(text, future) for text, future in batch if not future.done()]
+        if not batch:
+            return
+
+        texts = [text for text, _ in batch]
+        loop = asyncio.get_running_loop()
+        try:
+            with metrics.timer("micro_batch"):
+                intents, confidences, responses = await loop.run_in_executor(
+                    self._executor, self.predict_batch, texts
+                )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts += len(texts)
+        for i, (_, future) in enumerate(batch):
+            if not future.done():
+                future.set_result((intents[i], float(confidences[i]), responses[i]))
+
+    def get_stats(self):
+        """
+        Get batching counters
+
+        Returns:
+            dict: Batches run, texts classified, mean batch size, texts
+                waiting, batches running and texts rejected as overload
+        """
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch_size": self.texts / self.batches if self.batches else 0.0,
+            "waiting": self._queue.qsize() if self._queue is not None else 0,
+            "running": len(self._running),
+            "rejected": self.rejected,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+        }
@@ -0,0 +1,141 @@
+"""
+Server: Multi-process inference workers
+========================================
+This module contains the InferenceWorkerPool class which runs the compiled
+(NumPy only) model in several worker processes so inference is not limited
+to one core by the GIL. The engine's arrays are placed in shared memory
+once; workers map them read-only instead of holding their own copies, and
+never import scikit-learn.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from models.compiled_engine import CompiledInferenceEngine
+
+# Per-process state of a worker, set by _init_worker()
+_worker_engine = None
+_worker_exact_index = None
+_worker_blocks = None
+
+
+def _attach_block(name):
+    """Map an existing shared memory block without taking ownership of it"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block; spawned workers share
+        # the parent's resource tracker, so this repeats the parent's own
+        # registration and the parent still decides when it is unlinked
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(layout, exact_match_index):
+    """Build the worker's engine over the shared arrays"""
+    global _worker_engine, _worker_exact_index, _worker_blocks
+
+    _worker_blocks = []
+    arrays = {}
+    for name, (block_name, shape, dtype) in layout.items():
+        block = _attach_block(block_name)
+        _worker_blocks.append(block)
+        array = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+
+    _worker_engine = CompiledInferenceEngine.from_arrays(arrays)
+    _worker_exact_index = exact_match_index
+
+
+def _classify_in_worker(texts):
+    """Classify a batch of texts (runs in a worker process)"""
+    intents, confidences = _worker_engine.classify(texts, _worker_exact_index)
+    return intents.tolist(), confidences
+
+
+class InferenceWorkerPool:
+    """
+    Server: Dispatches prediction batches to worker processes.
+    At most max_pending batches are queued or running at once; further
+    callers block until a slot frees up, so a burst cannot queue unbounded
+    work. Responses are chosen in the calling process from the model's
+    data repository.
+    """
+
+    def __init__(self, model, workers=None, max_pending=None):
+        """
+        Compile the model, share its arrays and start the workers
+
+        Args:
+            model (ChatbotMLModel): Trained model (tfidf vectorizer with
+                the mlp backend, see CompiledInferenceEngine)
+            workers (int, optional): Worker processes; defaults to the
+                number of CPUs
+            max_pending (int, optional): Batches queued or running at
+                once; defaults to twice the number of workers
+        """
+        self.workers = workers or multiprocessing.cpu_count()
+        self.max_pending = max_pending or 2 * self.workers
+        self.data_repository = model.data_repository
+
+        engine = CompiledInferenceEngine.from_model(model)
+        self._blocks = []
+        layout = {}
+        for name, array in engine.to_arrays().items():
+            array = np.ascontiguousarray(array)
+            # Zero-size arrays still need a (1 byte) block
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            layout[name] = (block.name, array.shape, array.dtype.str)
+        self.shared_bytes = sum(block.size for block in self._blocks)
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        # spawn: workers start clean (no inherited threads or scikit-learn)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(layout, model.exact_match_index),
+        )
+
+    def predict_batch(self, texts):
+        """
+        Predict intents and generate responses on a worker process.
+        Blocks while max_pending batches are already outstanding.
+
+        Args:
+            texts (list of str): User input texts
+
+        Returns:
+            tuple: (intents, confidences, responses), like
+                ChatbotMLModel.predict_batch()
+        """
+        with self._slots:
+            intents, confidences = self._executor.submit(_classify_in_worker, list(texts)).result()
+
+        responses = [
+            self.data_repository.get_fallback_response() if intent is None
+            else self.data_repository.get_response_for_intent(intent)
+            for intent in intents
+        ]
+        return intents, confidences, responses
+
+    def warm_up(self):
+        """Start every worker now instead of on the first batches"""
+        futures = [self._executor.submit(_classify_in_worker, [""])
+                   for _ in range(self.workers)]
+        for future in futures:
+            future.result()
+
+    def close(self):
+        """Stop the workers and release the shared memory"""
+        self._executor.shutdown(wait=True)
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
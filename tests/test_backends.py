@@ -0,0 +1,37 @@
+"""
+Tests: Classifier backends
+"""
+
+import unittest
+
+import numpy as np
+
+from benchmarks.synthetic_data import SyntheticDataRepository
+from models import ChatbotMLModel, NLPPreprocessor
+
+
+class NearestNeighbourBackendTest(unittest.TestCase):
+
+    def setUp(self):
+        repository = SyntheticDataRepository(n_intents=5, n_patterns=500)
+        self.model = ChatbotMLModel(repository, NLPPreprocessor())
+        self.model.backend = "nearest_neighbour"
+        self.model.train()
+        queries = repository.sample_queries(300)
+        self.X = self.model.vectorizer.transform(
+            list(self.model.preprocessor.preprocess_batch(queries)))
+
+    def test_query_blocks_do_not_change_scores(self):
+        classifier = self.model.classifier
+        expected = classifier.predict_proba(self.X)
+
+        # At most 7 queries x 500 patterns per block
+        classifier.MAX_BLOCK_SIMILARITIES = 3500
+        np.testing.assert_array_equal(classifier.predict_proba(self.X), expected)
+
+        classifier.use_inverted_index = False
+        np.testing.assert_array_equal(classifier.predict_proba(self.X), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
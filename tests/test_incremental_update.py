@@ -0,0 +1,99 @@
+"""
+Tests: Incremental model updates (ChatbotMLModel.update)
+"""
+
+import os
+import tempfile
+import unittest
+import warnings
+
+from sklearn.exceptions import ConvergenceWarning
+
+from data import ChatbotDataRepository
+from models import ChatbotMLModel, ModelArtifactStore, NLPPreprocessor
+
+
+def trained_model(backend, repository=None):
+    """A model trained with the given backend (on the built-in intents by default)"""
+    model = ChatbotMLModel(repository or ChatbotDataRepository(), NLPPreprocessor())
+    model.backend = backend
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.train()
+    return model
+
+
+class UpdateTest(unittest.TestCase):
+
+    def test_nearest_neighbour_stores_each_pattern_once(self):
+        model = trained_model("nearest_neighbour")
+        n_patterns = len(model.data_repository.training_texts)
+        self.assertEqual(model.classifier.n_patterns, n_patterns)
+
+        model.data_repository.add_patterns("grades", ["show my transcript"])
+        report = model.update()
+        self.assertFalse(report["rolled_back"])
+        self.assertEqual(model.classifier.n_patterns, n_patterns + 1)
+
+        model.data_repository.add_patterns("bye", ["catch you tomorrow"])
+        model.update()
+        self.assertEqual(model.classifier.n_patterns, n_patterns + 2)
+
+    def test_new_terms_extend_the_vocabulary(self):
+        model = trained_model("mlp")
+        n_terms = len(model.vectorizer.vocabulary_)
+
+        model.data_repository.add_patterns("grades", ["show my transcript"])
+        report = model.update()
+        self.assertEqual(report["new_terms"], 2)
+        self.assertEqual(len(model.vectorizer.vocabulary_), n_terms + 2)
+        self.assertEqual(len(model.vectorizer.idf_), n_terms + 2)
+
+        # Same IDF weights as a vectorizer fitted on all patterns
+        repository = ChatbotDataRepository()
+        repository.add_patterns("grades", ["show my transcript"])
+        retrained = trained_model("mlp", repository)
+        for term, index in retrained.vectorizer.vocabulary_.items():
+            self.assertAlmostEqual(model.vectorizer.idf_[model.vectorizer.vocabulary_[term]],
+                                   retrained.vectorizer.idf_[index])
+        self.assertEqual(model.predict_intent("show my transcript").intent, "grades")
+
+    def test_rollback_restores_the_model(self):
+        model = trained_model("mlp")
+        vocabulary = model.vectorizer.vocabulary_
+        classes = list(model.label_encoder.classes_)
+        weights = [w.copy() for w in model.classifier.estimator.coefs_]
+
+        model.data_repository.add_patterns("weather", ["is it raining outside"], ["No idea, sorry!"])
+        # Any drop in validation accuracy, or none at all, is rejected
+        report = model.update(max_regression=-1.0)
+        self.assertTrue(report["rolled_back"])
+        self.assertIs(model.vectorizer.vocabulary_, vocabulary)
+        self.assertEqual(list(model.label_encoder.classes_), classes)
+        for restored, original in zip(model.classifier.estimator.coefs_, weights):
+            self.assertTrue((restored == original).all())
+
+    def test_saved_update_matches_the_startup_key(self):
+        for backend in ("mlp", "nearest_neighbour"):
+            with tempfile.TemporaryDirectory() as directory:
+                store = ModelArtifactStore(os.path.join(directory, "model.pkl"))
+                repository = ChatbotDataRepository()
+                model = ChatbotMLModel(repository, NLPPreprocessor(), store)
+                model.backend = backend
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", ConvergenceWarning)
+                    model.load_or_train()
+                repository.add_patterns("grades", ["show my transcript"])
+                model.update()
+                model.wait_for_save()
+
+                # A restart on the updated data loads what update() saved
+                restarted = ChatbotMLModel(repository, NLPPreprocessor(), store)
+                restarted.backend = backend
+                restarted.train = None  # fails if load_or_train() retrains
+                restarted.load_or_train()
+                self.assertEqual(restarted.predict_intent("show my transcript").intent, "grades")
+
+
+if __name__ == "__main__":
+    unittest.main()
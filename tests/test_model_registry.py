@@ -0,0 +1,73 @@
+"""
+Tests: Model registry validation and rollback
+"""
+
+import unittest
+import warnings
+
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+
+from data import ChatbotDataRepository
+from models import ChatbotMLModel, ModelRegistry, ModelValidationError, NLPPreprocessor
+
+
+class UniformClassifier:
+    """Broken classifier giving every intent the same probability"""
+
+    def __init__(self, classes):
+        self.classes_ = classes
+
+    def predict_proba(self, X):
+        return np.full((X.shape[0], len(self.classes_)), 1.0 / len(self.classes_))
+
+
+def trained_model():
+    model = ChatbotMLModel(ChatbotDataRepository(), NLPPreprocessor())
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        model.train()
+    return model
+
+
+class ModelRegistryTest(unittest.TestCase):
+
+    def test_broken_classifier_is_rejected(self):
+        good = trained_model()
+        broken = trained_model()
+        broken.classifier = UniformClassifier(broken.classifier.classes_)
+        # Training patterns are still answered through the exact-match index
+        self.assertEqual(broken.predict_intent("hello").intent, "greet")
+
+        registry = ModelRegistry(lambda: broken)
+        registry.promote(good, "startup")
+        with self.assertRaises(ModelValidationError):
+            registry.build()
+        self.assertIs(registry.active_model, good)
+        self.assertEqual(len(registry.versions()), 1)
+
+    def test_first_model_can_be_activated_despite_smoke_test(self):
+        broken = trained_model()
+        broken.classifier = UniformClassifier(broken.classifier.classes_)
+
+        registry = ModelRegistry(lambda: broken)
+        with self.assertRaises(ModelValidationError):
+            registry.promote(broken, "startup")
+        self.assertIsNone(registry.active)
+
+        version = registry.promote(broken, "startup", strict=False)
+        self.assertIs(registry.active_model, broken)
+        self.assertIsNone(version.smoke_accuracy)
+
+    def test_rollback_restores_previous_version(self):
+        registry = ModelRegistry(trained_model)
+        first = registry.build("startup")
+        second = registry.build()
+        self.assertEqual(registry.active.version, second.version)
+        self.assertIs(registry.rollback().model, first.model)
+        with self.assertRaises(ValueError):
+            registry.rollback()
+
+
+if __name__ == "__main__":
+    unittest.main()
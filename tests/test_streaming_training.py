@@ -0,0 +1,78 @@
+"""
+Tests: Out-of-core streaming training (ChatbotMLModel.train_streaming)
+"""
+
+import os
+import tempfile
+import unittest
+import warnings
+
+import numpy as np
+from sklearn.exceptions import ConvergenceWarning
+
+from benchmarks.synthetic_data import SyntheticDataRepository
+from models import ChatbotMLModel, ModelArtifactStore, NLPPreprocessor
+
+
+def held_out_accuracy(model, repository):
+    """Classifier accuracy on unseen queries (no exact-match fast path)"""
+    queries, labels = repository.sample_labelled_queries(1000)
+    intents, _, _ = model.predict_batch(queries, use_exact_match=False)
+    return float(np.mean(intents == np.asarray(labels, dtype=object)))
+
+
+class StreamingTrainingTest(unittest.TestCase):
+
+    def test_held_out_accuracy_close_to_train(self):
+        repository = SyntheticDataRepository(n_intents=10, n_patterns=2000)
+
+        batch = ChatbotMLModel(repository, NLPPreprocessor())
+        batch.vectorizer_mode = "hashing"
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            batch.train()
+
+        streaming = ChatbotMLModel(repository, NLPPreprocessor())
+        streaming.vectorizer_mode = "hashing"
+        streaming.train_streaming(chunk_size=250, epochs=5)
+
+        self.assertGreaterEqual(held_out_accuracy(streaming, repository),
+                                held_out_accuracy(batch, repository) - 0.03)
+
+    def test_progress_reports_every_chunk(self):
+        repository = SyntheticDataRepository(n_intents=5, n_patterns=500)
+        model = ChatbotMLModel(repository, NLPPreprocessor())
+        model.vectorizer_mode = "hashing"
+        progress = []
+        model.train_streaming(chunk_size=100, epochs=2, progress_callback=progress.append)
+
+        # Five chunks and an end-of-epoch report per epoch
+        self.assertEqual(len(progress), 12)
+        self.assertEqual(progress[-1]["samples"], 500)
+        self.assertTrue(progress[-1]["epoch_complete"])
+
+    def test_artifact_key_covers_chunk_size_and_epochs(self):
+        repository = SyntheticDataRepository(n_intents=5, n_patterns=500)
+        with tempfile.TemporaryDirectory() as directory:
+            store = ModelArtifactStore(os.path.join(directory, "model.pkl"))
+            trainings = []
+
+            def load_or_train(**streaming):
+                model = ChatbotMLModel(repository, NLPPreprocessor(), store)
+                model.vectorizer_mode = "hashing"
+                train_streaming = model.train_streaming
+                model.train_streaming = lambda **options: (trainings.append(options),
+                                                           train_streaming(**options))[1]
+                model.load_or_train(streaming)
+
+            load_or_train(chunk_size=100)
+            load_or_train(chunk_size=100, epochs=5)  # the default: loaded
+            load_or_train(chunk_size=100, epochs=2)
+            load_or_train(chunk_size=250, epochs=2)
+            self.assertEqual(trainings, [{"chunk_size": 100},
+                                         {"chunk_size": 100, "epochs": 2},
+                                         {"chunk_size": 250, "epochs": 2}])
+
+
+if __name__ == "__main__":
+    unittest.main()
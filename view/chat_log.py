@@ -0,0 +1,186 @@
+"""
+View Layer: Chat history storage
+=================================
+This module contains the ChatLog class, a bounded in-memory chat history
+that spills older entries to an on-disk journal.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import weakref
+from array import array
+from collections import deque
+
+
+def _remove_journal(journal_file, journal_path):
+    """Close and delete a journal file (used as a finalizer)"""
+    journal_file.close()
+    if os.path.exists(journal_path):
+        os.remove(journal_path)
+
+
+class ChatLog:
+    """
+    View Layer: Chat history as a sequence of (sender, message) tuples.
+    The newest entries live in a bounded ring buffer; older entries are
+    appended to a JSON-lines journal and read back on demand, so memory use
+    stays flat however long the session runs.
+    """
+
+    def __init__(self, max_in_memory=1000, journal_dir=None):
+        """
+        Initialize the chat log
+
+        Args:
+            max_in_memory (int): Entries kept in memory before spilling
+            journal_dir (str, optional): Directory for the journal file;
+                defaults to the system temp directory
+        """
+        if max_in_memory < 1:
+            raise ValueError("max_in_memory must be at least 1")
+
+        self.max_in_memory = max_in_memory
+        self._buffer = deque()
+        self._lock = threading.RLock()
+
+        # Byte offset of each spilled entry in the journal
+        self._journal_offsets = array("q")
+        self._journal_end = 0
+
+        # Bumped by clear() so readers can detect a reset history
+        self.generation = 0
+
+        fd, self.journal_path = tempfile.mkstemp(
+            prefix="chat_log_", suffix=".jsonl", dir=journal_dir
+        )
+        self._journal = os.fdopen(fd, "w+b")
+        self._finalizer = weakref.finalize(
+            self, _remove_journal, self._journal, self.journal_path
+        )
+
+    # ===== Sequence Interface =====
+
+    def __len__(self):
+        with self._lock:
+            return len(self._journal_offsets) + len(self._buffer)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __getitem__(self, index):
+        with self._lock:
+            n_spilled = len(self._journal_offsets)
+            if index < 0:
+                index += n_spilled + len(self._buffer)
+            if not 0 <= index < n_spilled + len(self._buffer):
+                raise IndexError("chat log index out of range")
+            if index >= n_spilled:
+                return self._buffer[index - n_spilled]
+            return self._read_journal(index, index + 1)[0]
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def append(self, entry):
+        """
+        Append a (sender, message) entry, spilling the oldest if full
+
+        Args:
+            entry (tuple): (sender, message)
+        """
+        with self._lock:
+            self._buffer.append(entry)
+            if len(self._buffer) > self.max_in_memory:
+                self._spill(self._buffer.popleft())
+
+    def extend(self, entries):
+        """Append several (sender, message) entries"""
+        with self._lock:
+            for entry in entries:
+                self.append(entry)
+
+    def clear(self):
+        """Remove all entries from memory and the journal"""
+        with self._lock:
+            self._buffer.clear()
+            self._journal_offsets = array("q")
+            self._journal.seek(0)
+            self._journal.truncate()
+            self._journal_end = 0
+            self.generation += 1
+
+    def close(self):
+        """Delete the journal file; the log must not be used afterwards"""
+        self._finalizer()
+
+    # ===== Streaming =====
+
+    def iter_chunks(self, chunk_size=1000):
+        """
+        Stream the history in order as lists of entries.
+        Entries appended after iteration starts are not included.
+
+        Args:
+            chunk_size (int): Maximum entries per yielded list
+
+        Yields:
+            list: (sender, message) tuples
+        """
+        with self._lock:
+            total = len(self)
+            generation = self.generation
+
+        for start in range(0, total, chunk_size):
+            stop = min(start + chunk_size, total)
+            with self._lock:
+                if self.generation != generation:
+                    raise RuntimeError("chat log was cleared while being read")
+                chunk = self._read_range(start, stop)
+            # Yield outside the lock so appends are not blocked by the consumer
+            yield chunk
+
+    def get_stats(self):
+        """
+        Get storage counters for the history
+
+        Returns:
+            dict: Entry counts in memory and on disk, and journal size
+        """
+        with self._lock:
+            return {
+                "in_memory": len(self._buffer),
+                "spilled": len(self._journal_offsets),
+                "journal_bytes": self._journal_end,
+            }
+
+    # ===== Journal =====
+
+    def _spill(self, entry):
+        """Append an entry to the end of the journal"""
+        line = json.dumps(entry, ensure_ascii=False).encode("utf-8") + b"\n"
+        self._journal.seek(self._journal_end)
+        self._journal.write(line)
+        self._journal_offsets.append(self._journal_end)
+        self._journal_end += len(line)
+
+    def _read_range(self, start, stop):
+        """Return entries [start, stop) from journal and buffer (lock held)"""
+        n_spilled = len(self._journal_offsets)
+        entries = []
+        if start < n_spilled:
+            entries.extend(self._read_journal(start, min(stop, n_spilled)))
+        for index in range(max(start, n_spilled), stop):
+            entries.append(self._buffer[index - n_spilled])
+        return entries
+
+    def _read_journal(self, start, stop):
+        """Read spilled entries [start, stop) with one sequential read"""
+        begin = self._journal_offsets[start]
+        end = (self._journal_offsets[stop] if stop < len(self._journal_offsets)
+               else self._journal_end)
+        self._journal.seek(begin)
+        data = self._journal.read(end - begin)
+        return [tuple(json.loads(line)) for line in data.splitlines()]
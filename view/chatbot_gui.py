@@ -8,6 +8,11 @@ and visual presentation for the chatbot application.
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 
+from metrics import metrics
+
+from .chat_log import ChatLog
+from .virtual_transcript import VirtualTranscript
+
 
 class ChatbotView:
     """
@@ -15,13 +20,20 @@ class ChatbotView:
     Responsible for rendering the chat interface and handling user interactions.
     """
     
-    def __init__(self, root, model_accuracy):
+    # Default status bar text
+    STATUS_TEXT = "Model: MLPClassifier • Features: TF-IDF • Intents: lecture_time, grades, greet, bye"
+    
+    def __init__(self, root, model_accuracy=None, chat_log=None):
         """
         Initialize the chatbot GUI
         
         Args:
             root (tk.Tk): Root window
-            model_accuracy (float): Model training accuracy percentage
+            model_accuracy (float, optional): Model training accuracy
+                percentage; None starts in the loading state until
+                set_model_ready() is called
+            chat_log (ChatLog, optional): Chat history storage; a bounded
+                log that spills to a temp journal is created by default
         """
         self.root = root
         self.root.title("Deep Learning Chatbot")
@@ -37,15 +49,20 @@ class ChatbotView:
         self.text_color = "#ffffff"
         self.input_bg = "#0f3460"
 
-        # Chat history for export functionality
-        self.chat_log = []  # list of tuples: ("User"/"Bot", message)
+        # Chat history for export functionality: sequence of ("User"/"Bot", message)
+        self.chat_log = chat_log if chat_log is not None else ChatLog()
 
         self.model_accuracy = model_accuracy
+        # Active model version label shown in the status bar (if any)
+        self.model_version = None
         
         # UI Components (initialized in setup_ui)
         self.canvas = None
-        self.scrollable_frame = None
+        self.transcript = None
         self.input_field = None
+        self.send_button = None
+        self.rollback_button = None
+        self.status_bar = None
         
         # Event callbacks (to be set by controller)
         self.on_send_message = None
@@ -54,13 +71,17 @@ class ChatbotView:
         self.on_export_chat = None
         self.on_show_about = None
         self.on_example_selected = None
+        self.on_rollback_model = None
 
         # Build UI
         self.setup_ui()
         
         # Welcome messages
         self.add_bot_message("Hello! I'm a Deep Learning Chatbot. How can I help you today?")
-        self.add_bot_message(f"Model trained successfully with accuracy: {self.model_accuracy:.2f}%")
+        if self.model_accuracy is None:
+            self.set_loading("Loading model...")
+        else:
+            self.set_model_ready(self.model_accuracy)
 
 
     def setup_ui(self):
@@ -146,6 +167,22 @@ class ChatbotView:
             command=lambda: self.on_clear_chat() if self.on_clear_chat else None
         )
         clear_chat_btn.pack(side=tk.TOP, pady=2, padx=5)
+
+        # Model rollback (enabled while an earlier version is kept)
+        self.rollback_button = tk.Button(
+            header_frame,
+            text="↶ Previous Model",
+            font=("Helvetica", 9),
+            bg="#0f3460",
+            fg=self.text_color,
+            activebackground="#7b4397",
+            activeforeground=self.text_color,
+            relief=tk.FLAT,
+            cursor="hand2",
+            state=tk.DISABLED,
+            command=lambda: self.on_rollback_model() if self.on_rollback_model else None
+        )
+        self.rollback_button.pack(side=tk.RIGHT, padx=5)
     
     def _create_main_chat_area(self):
         """Create scrollable chat display area"""
@@ -159,19 +196,25 @@ class ChatbotView:
 
         # Canvas for custom scrolling
         self.canvas = tk.Canvas(chat_frame, bg=self.secondary_bg, highlightthickness=0)
-        scrollbar = ttk.Scrollbar(chat_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollable_frame = tk.Frame(self.canvas, bg=self.secondary_bg)
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
-
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar = ttk.Scrollbar(chat_frame, orient="vertical")
 
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        # Virtualized transcript: only bubbles near the viewport exist as
+        # widgets; the full history stays in chat_log
+        self.transcript = VirtualTranscript(
+            self.canvas,
+            scrollbar,
+            self._get_transcript_row,
+            theme={
+                "bg": self.secondary_bg,
+                "fg": self.text_color,
+                "muted_fg": "#888888",
+                "user_bg": self.user_msg_color,
+                "bot_bg": self.bot_msg_color,
+            }
+        )
         
         # Store main_frame for later use in input and examples
         self.main_frame = main_frame
@@ -213,7 +256,7 @@ class ChatbotView:
         clear_input_button.pack(side=tk.RIGHT, padx=(10, 0))
 
         # Send button
-        send_button = tk.Button(
+        self.send_button = tk.Button(
             input_frame,
             text="Send ➤",
             font=("Helvetica", 12, "bold"),
@@ -227,7 +270,7 @@ class ChatbotView:
             cursor="hand2",
             command=lambda: self.on_send_message() if self.on_send_message else None
         )
-        send_button.pack(side=tk.RIGHT, padx=(10, 0))
+        self.send_button.pack(side=tk.RIGHT, padx=(10, 0))
     
     def _create_examples_frame(self):
         """Create example query buttons"""
@@ -264,9 +307,9 @@ class ChatbotView:
     def _create_status_bar(self):
         """Create status bar at bottom"""
         # ===== Status bar =====
-        status_bar = tk.Label(
+        self.status_bar = tk.Label(
             self.root,
-            text="Model: MLPClassifier • Features: TF-IDF • Intents: lecture_time, grades, greet, bye",
+            text=self.STATUS_TEXT,
             bd=1,
             relief=tk.SUNKEN,
             anchor="w",
@@ -274,112 +317,108 @@ class ChatbotView:
             fg="#888888",
             font=("Helvetica", 9)
         )
-        status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+    
+    def set_status(self, text):
+        """Show a message in the status bar"""
+        self.status_bar.configure(text=text)
+    
+    def reset_status(self):
+        """Restore the default status bar text"""
+        text = self.STATUS_TEXT
+        if self.model_version is not None:
+            text = f"{text} • Version: {self.model_version}"
+        self.status_bar.configure(text=text)
+    
+    def set_model_version(self, version):
+        """
+        Show the active model version in the status bar
+        
+        Args:
+            version (str): Version label, e.g. "v2"
+        """
+        self.model_version = version
+        self.reset_status()
+    
+    def set_rollback_available(self, available):
+        """
+        Enable or disable the rollback button
+        
+        Args:
+            available (bool): Whether an earlier model version is kept
+        """
+        self.rollback_button.configure(state=tk.NORMAL if available else tk.DISABLED)
+    
+    def set_loading(self, text):
+        """Show the loading state: sending is disabled until the model is ready"""
+        self.send_button.configure(state=tk.DISABLED)
+        self.set_status(text)
+    
+    def set_model_ready(self, model_accuracy):
+        """
+        Leave the loading state once the model can answer
+        
+        Args:
+            model_accuracy (float): Model training accuracy percentage
+        """
+        self.model_accuracy = model_accuracy
+        self.send_button.configure(state=tk.NORMAL)
+        self.reset_status()
+        self.add_bot_message(f"Model trained successfully with accuracy: {model_accuracy:.2f}%")
     
     # ===== Message Display Methods =====
     
     def add_message(self, message, is_user=False):
         """
-        Add a message bubble to the chat display
+        Add a message to the chat log and the transcript display
         
         Args:
             message (str): Message text
             is_user (bool): True for user messages, False for bot messages
         """
-        msg_frame = tk.Frame(self.scrollable_frame, bg=self.secondary_bg)
-        msg_frame.pack(fill=tk.X, padx=10, pady=5)
-
-        if is_user:
-            # User message (right aligned)
-            container = tk.Frame(msg_frame, bg=self.secondary_bg)
-            container.pack(anchor="e")
-
-            msg_label = tk.Label(
-                container,
-                text=message,
-                font=("Helvetica", 11),
-                bg=self.user_msg_color,
-                fg=self.text_color,
-                wraplength=500,
-                justify=tk.LEFT,
-                padx=15,
-                pady=10
-            )
-            msg_label.pack(side=tk.RIGHT)
-
-            user_icon = tk.Label(
-                container,
-                text="👤",
-                font=("Helvetica", 16),
-                bg=self.secondary_bg,
-                fg=self.text_color
-            )
-            user_icon.pack(side=tk.RIGHT, padx=(0, 5))
-        else:
-            # Bot message (left aligned)
-            container = tk.Frame(msg_frame, bg=self.secondary_bg)
-            container.pack(anchor="w")
+        with metrics.timer("render"):
+            self.chat_log.append(("User" if is_user else "Bot", message))
+            self.transcript.add_row(message)
 
-            bot_icon = tk.Label(
-                container,
-                text="🤖",
-                font=("Helvetica", 16),
-                bg=self.secondary_bg,
-                fg=self.text_color
-            )
-            bot_icon.pack(side=tk.LEFT, padx=(0, 5))
-
-            msg_label = tk.Label(
-                container,
-                text=message,
-                font=("Helvetica", 11),
-                bg=self.bot_msg_color,
-                fg=self.text_color,
-                wraplength=500,
-                justify=tk.LEFT,
-                padx=15,
-                pady=10
-            )
-            msg_label.pack(side=tk.LEFT)
-
-        # Scroll to bottom
-        self.root.update_idletasks()
-        self.canvas.yview_moveto(1.0)
+    def add_messages(self, messages):
+        """
+        Add many messages at once with a single layout and scroll update.
+        The whole batch is one "render" timing.
+        
+        Args:
+            messages (iterable): (message, is_user) pairs in display order
+        """
+        with metrics.timer("render"):
+            messages = list(messages)
+            self.chat_log.extend(("User" if is_user else "Bot", message)
+                                 for message, is_user in messages)
+            self.transcript.add_rows(message for message, _ in messages)
 
     def add_bot_message(self, message):
         """Add bot message and log it"""
-        self.chat_log.append(("Bot", message))
         self.add_message(message, is_user=False)
 
     def add_user_message(self, message):
         """Add user message and log it"""
-        self.chat_log.append(("User", message))
         self.add_message(message, is_user=True)
     
+    def _get_transcript_row(self, index):
+        """Return (message, is_user) for a transcript row"""
+        sender, message = self.chat_log[index]
+        return message, sender == "User"
+    
     def show_thinking_indicator(self):
         """
         Show 'thinking' indicator while processing
         
         Returns:
-            tk.Frame: The thinking indicator frame (to be removed later)
+            tk.Label: The thinking indicator (to be removed later)
         """
-        thinking_frame = tk.Frame(self.scrollable_frame, bg=self.secondary_bg)
-        thinking_frame.pack(fill=tk.X, padx=10, pady=5)
-
-        thinking_label = tk.Label(
-            thinking_frame,
-            text="🤖 Thinking...",
-            font=("Helvetica", 10, "italic"),
-            bg=self.secondary_bg,
-            fg="#888888"
-        )
-        thinking_label.pack(anchor="w", padx=(30, 0))
-        
-        return thinking_frame
+        return self.transcript.show_thinking()
     
     def remove_thinking_indicator(self, thinking_frame):
         """Remove the thinking indicator"""
-        thinking_frame.destroy()
+        self.transcript.remove_thinking(thinking_frame)
     
     # ===== Input Field Methods =====
     
@@ -402,9 +441,8 @@ class ChatbotView:
     
     def clear_all_messages(self):
         """Clear all chat messages from display"""
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
         self.chat_log.clear()
+        self.transcript.clear()
     
     def get_chat_log(self):
         """Get the full chat history"""
@@ -446,7 +484,11 @@ class ChatbotView:
         """Open save file dialog"""
         return filedialog.asksaveasfilename(
             defaultextension=".txt",
-            filetypes=[("Text Files", "*.txt")],
+            filetypes=[
+                ("Text Files", "*.txt"),
+                ("JSON Lines", "*.jsonl"),
+                ("Compressed JSON Lines", "*.jsonl.gz"),
+            ],
             title="Save Chat History"
         )
     
@@ -0,0 +1,315 @@
+"""
+View Layer: Virtualized chat transcript
+========================================
+This module contains the VirtualTranscript class which displays a chat
+history of any length while only materializing the message bubbles that
+are in or near the viewport, using a recycled pool of Tk widgets.
+"""
+
+import bisect
+import tkinter as tk
+from array import array
+
+from metrics import metrics
+
+
+class _MessageBubble:
+    """
+    View Layer: A reusable message bubble (icon + text label) placed on
+    the transcript canvas. Reconfigured in place when recycled.
+    """
+
+    def __init__(self, canvas, theme):
+        """
+        Create the bubble widgets and their (hidden) canvas window
+
+        Args:
+            canvas (tk.Canvas): Transcript canvas
+            theme (dict): Colors used by the transcript
+        """
+        self.theme = theme
+        self.frame = tk.Frame(canvas, bg=theme["bg"])
+        self.icon = tk.Label(
+            self.frame,
+            font=("Helvetica", 16),
+            bg=theme["bg"],
+            fg=theme["fg"]
+        )
+        self.label = tk.Label(
+            self.frame,
+            font=("Helvetica", 11),
+            fg=theme["fg"],
+            wraplength=500,
+            justify=tk.LEFT,
+            padx=15,
+            pady=10
+        )
+        self.item = canvas.create_window(0, 0, window=self.frame, anchor="nw",
+                                         state="hidden")
+        self.is_user = None
+
+    def show(self, message, is_user):
+        """Display a message, repacking only when the sender side changes"""
+        if is_user != self.is_user:
+            self.icon.pack_forget()
+            self.label.pack_forget()
+            if is_user:
+                # User message (right aligned, icon on the right)
+                self.icon.configure(text="👤")
+                self.label.configure(bg=self.theme["user_bg"])
+                self.label.pack(side=tk.RIGHT)
+                self.icon.pack(side=tk.RIGHT, padx=(0, 5))
+            else:
+                # Bot message (left aligned, icon on the left)
+                self.icon.configure(text="🤖")
+                self.label.configure(bg=self.theme["bot_bg"])
+                self.icon.pack(side=tk.LEFT, padx=(0, 5))
+                self.label.pack(side=tk.LEFT)
+            self.is_user = is_user
+        self.label.configure(text=message)
+
+
+class VirtualTranscript:
+    """
+    View Layer: Virtualized transcript drawn on a canvas.
+    Keeps only a prefix sum of row heights per message; message text is
+    fetched from the row source when a row scrolls into view, so appending
+    and scrolling cost the same however long the conversation gets.
+    """
+
+    ROW_PADX = 10
+    ROW_PADY = 5
+    THINKING_HEIGHT = 30
+
+    # Extra pixels above and below the viewport that are kept materialized
+    OVERSCAN_PX = 300
+
+    def __init__(self, canvas, scrollbar, row_getter, theme):
+        """
+        Initialize the transcript
+
+        Args:
+            canvas (tk.Canvas): Canvas the bubbles are drawn on
+            scrollbar (ttk.Scrollbar): Vertical scrollbar for the canvas
+            row_getter (callable): Maps a row index to (message, is_user)
+            theme (dict): Colors with keys bg, fg, muted_fg, user_bg, bot_bg
+        """
+        self.canvas = canvas
+        self.scrollbar = scrollbar
+        self.row_getter = row_getter
+        self.theme = theme
+
+        # offsets[i] is the y position of row i; offsets[-1] is the total
+        self._offsets = array("q", [0])
+
+        # Widget pool: bubbles currently showing a row, and spare bubbles
+        self._row_bubbles = {}
+        self._free_bubbles = []
+        self._pool_size = 0
+
+        # Thinking indicators, drawn below the last message
+        self._thinking = []  # list of (label, canvas item)
+
+        # Off-screen label used to measure message heights
+        self._measure_label = tk.Label(
+            canvas,
+            font=("Helvetica", 11),
+            wraplength=500,
+            justify=tk.LEFT,
+            padx=15,
+            pady=10
+        )
+        icon_probe = tk.Label(canvas, text="🤖", font=("Helvetica", 16))
+        self._icon_height = icon_probe.winfo_reqheight()
+        icon_probe.destroy()
+
+        # Frame-coalesced layout: requests made during one idle cycle are
+        # applied together by a single _flush_layout()
+        self._flush_scheduled = False
+        self._scrollregion_dirty = False
+        self._scroll_to_end_pending = False
+        self._scrollregion = None
+
+        self.canvas.configure(yscrollcommand=self._on_canvas_scroll)
+        self.scrollbar.configure(command=self.canvas.yview)
+        self.canvas.bind("<Configure>", lambda e: self._on_canvas_resize())
+
+    # ===== Rows =====
+
+    def add_row(self, message):
+        """
+        Account for a row just appended to the row source and scroll to it
+
+        Args:
+            message (str): Message text (used to measure the row height)
+        """
+        self._offsets.append(self._offsets[-1] + self._measure_row(message))
+        self.request_layout(scroll_to_end=True)
+
+    def add_rows(self, messages):
+        """
+        Account for several rows appended to the row source at once.
+        Layout and scrolling happen once for the whole batch.
+
+        Args:
+            messages (iterable of str): Message texts, in row order
+        """
+        total = self._offsets[-1]
+        for message in messages:
+            total += self._measure_row(message)
+            self._offsets.append(total)
+        self.request_layout(scroll_to_end=True)
+
+    def clear(self):
+        """Forget all rows and recycle their bubbles"""
+        for bubble in self._row_bubbles.values():
+            self.canvas.itemconfigure(bubble.item, state="hidden")
+            self._free_bubbles.append(bubble)
+        self._row_bubbles.clear()
+        self._offsets = array("q", [0])
+        self.request_layout(scroll_to_end=True)
+
+    def get_pool_size(self):
+        """Return how many bubble widgets have been created"""
+        return self._pool_size
+
+    def _measure_row(self, message):
+        """Return the pixel height a message row will occupy"""
+        self._measure_label.configure(text=message)
+        bubble_height = max(self._measure_label.winfo_reqheight(), self._icon_height)
+        return bubble_height + 2 * self.ROW_PADY
+
+    # ===== Thinking Indicators =====
+
+    def show_thinking(self):
+        """
+        Show a 'thinking' indicator below the last message
+
+        Returns:
+            tk.Label: Token to pass to remove_thinking()
+        """
+        label = tk.Label(
+            self.canvas,
+            text="🤖 Thinking...",
+            font=("Helvetica", 10, "italic"),
+            bg=self.theme["bg"],
+            fg=self.theme["muted_fg"]
+        )
+        item = self.canvas.create_window(0, 0, window=label, anchor="nw")
+        self._thinking.append((label, item))
+        self.request_layout(scroll_to_end=True)
+        return label
+
+    def remove_thinking(self, label):
+        """Remove a thinking indicator returned by show_thinking()"""
+        for index, (thinking_label, item) in enumerate(self._thinking):
+            if thinking_label is label:
+                del self._thinking[index]
+                self.canvas.delete(item)
+                label.destroy()
+                break
+        self.request_layout()
+
+    # ===== Scrolling and Rendering =====
+
+    def request_layout(self, scroll_to_end=False):
+        """
+        Schedule one scroll region, scroll and render update for the next
+        idle cycle. Repeated requests before then are merged.
+
+        Args:
+            scroll_to_end (bool): Also scroll to the bottom
+        """
+        self._scrollregion_dirty = True
+        self._scroll_to_end_pending |= scroll_to_end
+        self._schedule_flush()
+
+    def scroll_to_end(self):
+        """Scroll to the bottom on the next layout pass"""
+        self._scroll_to_end_pending = True
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Arrange for _flush_layout() to run once when Tk is idle"""
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.canvas.after_idle(self._flush_layout)
+
+    def _flush_layout(self):
+        """Apply all pending layout work in a single pass"""
+        self._flush_scheduled = False
+        with metrics.timer("layout"):
+            if self._scrollregion_dirty:
+                self._scrollregion_dirty = False
+                self._update_scrollregion()
+            if self._scroll_to_end_pending:
+                self._scroll_to_end_pending = False
+                self.canvas.yview_moveto(1.0)
+            self.render()
+
+    def _total_height(self):
+        """Height of all rows plus the thinking indicators"""
+        return self._offsets[-1] + len(self._thinking) * self.THINKING_HEIGHT
+
+    def _update_scrollregion(self):
+        """Resize the scroll region and keep thinking indicators at the end"""
+        width = max(self.canvas.winfo_width(), 1)
+        scrollregion = (0, 0, width, self._total_height())
+        # Reconfiguring an unchanged region would still fire yscrollcommand
+        if scrollregion != self._scrollregion:
+            self._scrollregion = scrollregion
+            self.canvas.configure(scrollregion=scrollregion)
+
+        y = self._offsets[-1]
+        for _, item in self._thinking:
+            self.canvas.coords(item, self.ROW_PADX + 30, y + self.ROW_PADY)
+            y += self.THINKING_HEIGHT
+
+    def _on_canvas_resize(self):
+        """Re-place rows when the canvas size changes"""
+        self.request_layout()
+
+    def _on_canvas_scroll(self, first, last):
+        """Keep the scrollbar in sync and render the newly exposed rows"""
+        self.scrollbar.set(first, last)
+        self._schedule_flush()
+
+    def render(self):
+        """Materialize the rows in and near the viewport, recycling the rest"""
+        n_rows = len(self._offsets) - 1
+        width = self.canvas.winfo_width()
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+
+        # Binary search the prefix sums for the visible row range
+        first = max(bisect.bisect_right(self._offsets, top - self.OVERSCAN_PX) - 1, 0)
+        last = min(bisect.bisect_left(self._offsets, bottom + self.OVERSCAN_PX), n_rows)
+
+        # Recycle bubbles whose rows scrolled out of range
+        for row in [r for r in self._row_bubbles if r < first or r >= last]:
+            bubble = self._row_bubbles.pop(row)
+            self.canvas.itemconfigure(bubble.item, state="hidden")
+            self._free_bubbles.append(bubble)
+
+        for row in range(first, last):
+            bubble = self._row_bubbles.get(row)
+            if bubble is None:
+                bubble = self._acquire_bubble()
+                message, is_user = self.row_getter(row)
+                bubble.show(message, is_user)
+                self._row_bubbles[row] = bubble
+
+            y = self._offsets[row] + self.ROW_PADY
+            if bubble.is_user:
+                self.canvas.coords(bubble.item, width - self.ROW_PADX, y)
+                self.canvas.itemconfigure(bubble.item, anchor="ne", state="normal")
+            else:
+                self.canvas.coords(bubble.item, self.ROW_PADX, y)
+                self.canvas.itemconfigure(bubble.item, anchor="nw", state="normal")
+
+    def _acquire_bubble(self):
+        """Take a spare bubble from the pool, creating one if none is free"""
+        if self._free_bubbles:
+            return self._free_bubbles.pop()
+        self._pool_size += 1
+        return _MessageBubble(self.canvas, self.theme)